@@ -0,0 +1,54 @@
+import time
+import quizgenerator
+
+# Benchmark settings: one (major, criterion) cell is filled once per batch size
+BENCHMARK_MAJOR = "Economics"
+BENCHMARK_INSTITUTION = "NUS"
+BENCHMARK_CRITERION = "Interests"
+QUESTIONS_PER_MODE = 30
+BATCH_SIZES = [1, 5, 10]
+MAX_REQUESTS_PER_MODE = 200
+
+def benchmark_batch_size(prompt, batch_size, target):
+    """Generate `target` valid questions with the given batch size and count the cost.
+
+    Only generation is measured: candidates go through clean_text, fix_question_mark
+    and is_valid_question exactly as in a real run, but nothing is scored or saved.
+    """
+    quizgenerator.llm_usage.clear()
+    started = time.time()
+    candidates = 0
+    accepted = 0
+    while accepted < target and quizgenerator.llm_usage['requests'] < MAX_REQUESTS_PER_MODE:
+        for candidate in quizgenerator.generate_candidates(prompt, min(batch_size, target - accepted)):
+            candidates += 1
+            if quizgenerator.is_valid_question(quizgenerator.fix_question_mark(candidate)):
+                accepted += 1
+
+    requests = quizgenerator.llm_usage['requests']
+    prompt_tokens = quizgenerator.llm_usage['prompt_tokens']
+    return {
+        "batch_size": batch_size,
+        "requests": requests,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": quizgenerator.llm_usage['completion_tokens'],
+        "candidates": candidates,
+        "accepted": accepted,
+        "questions_per_request": accepted / requests if requests else 0.0,
+        "questions_per_1k_prompt_tokens": 1000 * accepted / prompt_tokens if prompt_tokens else 0.0,
+        "seconds": time.time() - started
+    }
+
+def run_benchmark():
+    prompt = quizgenerator.build_prompt(BENCHMARK_MAJOR, BENCHMARK_INSTITUTION, BENCHMARK_CRITERION)
+    results = [benchmark_batch_size(prompt, batch_size, QUESTIONS_PER_MODE) for batch_size in BATCH_SIZES]
+
+    print(f"\nBatched generation benchmark: {QUESTIONS_PER_MODE} questions for {BENCHMARK_MAJOR} ({BENCHMARK_INSTITUTION}, {BENCHMARK_CRITERION})")
+    print(f"{'batch':>5} {'requests':>8} {'prompt tok':>10} {'accepted':>8} {'q/request':>9} {'q/1k prompt tok':>15} {'seconds':>8}")
+    for r in results:
+        print(f"{r['batch_size']:>5} {r['requests']:>8} {r['prompt_tokens']:>10} {r['accepted']:>8} "
+              f"{r['questions_per_request']:>9.2f} {r['questions_per_1k_prompt_tokens']:>15.2f} {r['seconds']:>8.1f}")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
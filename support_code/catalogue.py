@@ -0,0 +1,160 @@
+import json
+import os
+import pickle
+import re
+import sys
+from typing import NamedTuple
+
+# Bump when the classes below change so older snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+
+class CatalogueError(ValueError):
+    """Raised when a standardized majors file does not have the expected layout."""
+
+# NamedTuples rather than dataclasses: they have no per-instance __dict__ either, but
+# build and unpickle several times faster, which is most of the load time here
+class Eligibility(NamedTuple):
+    qualification_type: str | None
+    description: str
+
+class Criterion(NamedTuple):
+    name: str
+    description: str
+    weight: float
+
+class Program(NamedTuple):
+    institution: str
+    college: str
+    major: str
+    degree: str
+    eligibility: tuple
+    suitability: tuple
+
+    def criteria_descriptions(self):
+        return {criterion.name: criterion.description for criterion in self.suitability}
+
+    def to_dict(self):
+        """The program in the standardized_*_majors.json layout."""
+        return {
+            "college": self.college,
+            "major": self.major,
+            "degree": self.degree,
+            "criteria": {
+                "eligibility": [{"qualificationType": e.qualification_type, "description": e.description}
+                                for e in self.eligibility],
+                "suitability": [{"criterion": c.name, "description": c.description, "weight": c.weight}
+                                for c in self.suitability]
+            }
+        }
+
+def institution_from_filename(path):
+    """'standardized_ntu_majors.json' -> 'NTU'."""
+    match = re.search(r'standardized_([^_]+)_majors\.json', os.path.basename(path))
+    return match.group(1).upper() if match else "Unknown"
+
+def require(entry, field, kind):
+    value = entry.get(field) if isinstance(entry, dict) else None
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise CatalogueError(f"'{field}' must be {getattr(kind, '__name__', 'a number')}, got {value!r}")
+    return value
+
+def optional_name(entry, field):
+    """An interned string field that may also be null, as qualificationType is for some NTU entries."""
+    value = entry.get(field) if isinstance(entry, dict) else None
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise CatalogueError(f"'{field}' must be str or null, got {value!r}")
+    return sys.intern(value)
+
+def parse_entries(entries, parse, where):
+    parsed = []
+    for index, entry in enumerate(entries):
+        try:
+            parsed.append(parse(entry))
+        except CatalogueError as e:
+            raise CatalogueError(f"{where}[{index}] {e}") from None
+    return tuple(parsed)
+
+def parse_eligibility(entry):
+    return Eligibility(optional_name(entry, "qualificationType"), require(entry, "description", str))
+
+def parse_criterion(entry):
+    return Criterion(sys.intern(require(entry, "criterion", str)), require(entry, "description", str),
+                     float(require(entry, "weight", (int, float))))
+
+def parse_program(entry, institution):
+    """Validate one program dict and build its Program, interning the repeated names."""
+    criteria = require(entry, "criteria", dict)
+    return Program(
+        institution=sys.intern(institution),
+        college=sys.intern(require(entry, "college", str)),
+        major=sys.intern(require(entry, "major", str)),
+        degree=sys.intern(require(entry, "degree", str)),
+        eligibility=parse_entries(require(criteria, "eligibility", list), parse_eligibility, "eligibility"),
+        suitability=parse_entries(require(criteria, "suitability", list), parse_criterion, "suitability")
+    )
+
+def parse_programs(data, institution, source="<data>", skip_invalid=False):
+    """Programs of a parsed majors file. An invalid program raises CatalogueError, or with
+    skip_invalid is reported and left out; a file without a programs array always raises."""
+    if not isinstance(data, dict) or not isinstance(data.get("programs"), list):
+        raise CatalogueError(f"{source}: expected an object with a 'programs' array")
+    programs = []
+    for index, entry in enumerate(data["programs"]):
+        try:
+            programs.append(parse_program(entry, institution))
+        except CatalogueError as e:
+            if not skip_invalid:
+                raise CatalogueError(f"{source} programs[{index}]: {e}") from None
+            print(f"Warning: Skipping invalid program entry {index} in '{source}': {e}")
+    return programs
+
+def load_programs(path, institution=None, skip_invalid=False):
+    """Parse and validate one standardized majors file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return parse_programs(data, institution or institution_from_filename(path), path, skip_invalid)
+
+def source_stamp(paths):
+    stamp = []
+    for institution, path in paths.items():
+        info = os.stat(path)
+        stamp.append((institution, os.path.abspath(path), info.st_size, info.st_mtime_ns))
+    return (SNAPSHOT_VERSION, tuple(stamp))
+
+def read_snapshot(snapshot_path, stamp):
+    try:
+        with open(snapshot_path, 'rb') as f:
+            cached_stamp, programs = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    return programs if cached_stamp == stamp else None
+
+def write_snapshot(snapshot_path, stamp, programs):
+    # Per-process temporary file, so concurrent writers never interleave in one file
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((stamp, programs), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+
+def load_catalogue(paths, snapshot_path=None):
+    """Load {institution: path} majors files into Program objects, in the order given.
+
+    With snapshot_path, the validated programs are pickled there and reused as long
+    as every source file keeps its size and modification time.
+    """
+    stamp = source_stamp(paths)
+    if snapshot_path:
+        programs = read_snapshot(snapshot_path, stamp)
+        if programs is not None:
+            return programs
+    programs = []
+    for institution, path in paths.items():
+        programs.extend(load_programs(path, institution))
+    if snapshot_path:
+        try:
+            write_snapshot(snapshot_path, stamp, programs)
+        except OSError as e:
+            print(f"Warning: Could not write catalogue snapshot '{snapshot_path}': {e}")
+    return programs
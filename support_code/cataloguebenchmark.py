@@ -0,0 +1,56 @@
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from catalogue import load_catalogue
+
+# Benchmark settings: the loaders are timed over the shipped standardized majors files
+STANDARDIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "school-data",
+                                "Standardized-weights")
+MAJORS_FILES = {name: os.path.join(STANDARDIZED_DIR, f"standardized_{name.lower()}_majors.json")
+                for name in ("NUS", "NTU", "SMU")}
+REPEATS = 50
+
+def load_json_dicts(paths):
+    """The previous approach: json.load each file and keep the program dicts."""
+    programs = []
+    for institution, path in paths.items():
+        with open(path, 'r') as f:
+            for p in json.load(f)["programs"]:
+                programs.append(dict(p, institution=institution))
+    return programs
+
+def measure(name, load, repeats=REPEATS):
+    """Best-of-N load time, plus the memory still held by one loaded result."""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"loader": name, "programs": len(result), "best_ms": min(timings) * 1000,
+            "retained_kb": retained / 1024, "peak_kb": peak / 1024}
+
+def run_benchmark(paths=MAJORS_FILES):
+    snapshot_path = os.path.join(tempfile.mkdtemp(), "majors_catalogue.pickle")
+    load_catalogue(paths, snapshot_path)
+    results = [
+        measure("json dicts", lambda: load_json_dicts(paths)),
+        measure("catalogue (json)", lambda: load_catalogue(paths)),
+        measure("catalogue (snapshot)", lambda: load_catalogue(paths, snapshot_path))
+    ]
+
+    print(f"\nCatalogue loader benchmark, best of {REPEATS} loads")
+    print(f"{'loader':>22} {'programs':>8} {'best ms':>8} {'retained KB':>11} {'peak KB':>8}")
+    for r in results:
+        print(f"{r['loader']:>22} {r['programs']:>8} {r['best_ms']:>8.2f} {r['retained_kb']:>11.0f} {r['peak_kb']:>8.0f}")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
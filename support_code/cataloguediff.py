@@ -0,0 +1,191 @@
+import json
+import os
+import re
+import time
+from typing import NamedTuple
+from codestitleinstitutiondescriptionextractor import ADAPTERS, DEDUPLICATE, iter_json_array, module_key, write_modules
+from modulesearch import INDEX_DIR, SHARD_NAME, build_shard, read_shard, update_shard, write_shard
+from prefixindex import MAPPINGS_PATH, MODULES_PATH, TRIE_PATH, ModuleIndex, normalize_code
+
+# File paths: the new academic year's detailed catalogues, diffed against the
+# Module_code_and_description files extracted from the previous year
+DATA_PATH = r"C:\Users\Josh\Downloads"
+ACADEMIC_YEAR = "AY 2025-2026"
+CATALOGUES = {
+    "SMU": os.path.join(DATA_PATH, f"SMU Mods {ACADEMIC_YEAR} detailed.json"),
+    "NUS": os.path.join(DATA_PATH, f"NUS Mods {ACADEMIC_YEAR} detailed.json"),
+    "NTU": os.path.join(DATA_PATH, f"NTU Mods {ACADEMIC_YEAR} detailed.json")
+}
+
+LETTERS = re.compile(r"[A-Z]+")
+
+class CatalogueDiff(NamedTuple):
+    """Module codes added, removed or changed between two catalogue versions, plus the
+    records behind them: new (key, module) records and (key, module) records that are gone."""
+    added: list
+    removed: list
+    changed: list
+    new_records: list
+    gone_records: list
+
+    def __bool__(self):
+        return bool(self.new_records or self.gone_records)
+
+def read_catalogue(path, adapter=None, deduplicate=False):
+    """(content key, module) for every record of a catalogue, in file order."""
+    records = []
+    seen = set()
+    for record in iter_json_array(path):
+        module = adapter(record) if adapter else record
+        key = module_key(module)
+        if deduplicate:
+            if key in seen:
+                continue
+            seen.add(key)
+        records.append((key, module))
+    return records
+
+def diff_catalogues(old, new):
+    """Compare two catalogue versions by the content hashes of their records.
+
+    A module code is changed when the set of distinct records listed under it differs.
+    """
+    def by_code(records):
+        codes = {}
+        for key, module in records:
+            codes.setdefault(module["modulecode"], set()).add(key)
+        return codes
+
+    old_codes, new_codes = by_code(old), by_code(new)
+    old_keys = dict(old)
+    new_keys = dict(new)
+    return CatalogueDiff(
+        added=[code for code in new_codes if code not in old_codes],
+        removed=[code for code in old_codes if code not in new_codes],
+        changed=[code for code in new_codes if code in old_codes and new_codes[code] != old_codes[code]],
+        new_records=[(key, module) for key, module in new_keys.items() if key not in old_keys],
+        gone_records=[(key, module) for key, module in old_keys.items() if key not in new_keys]
+    )
+
+def top_level_object(text, name):
+    """(start, end) offsets of the braces of a top-level object member of JSON text, or None."""
+    depth = 0
+    key = None
+    start = None
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c == '"':
+            value, i = json.decoder.scanstring(text, i + 1)
+            if depth == 1 and text[i:].lstrip().startswith(":"):
+                key = value
+            continue
+        if c in "{[":
+            depth += 1
+            if depth == 2 and c == "{" and key == name:
+                start = i
+        elif c in "}]":
+            if depth == 2 and start is not None:
+                return start, i
+            depth -= 1
+        i += 1
+    return None
+
+def append_members(text, start, end, members, step="    "):
+    """Insert "key": value lines before the closing brace at end, in the object's own indentation."""
+    body = text[start + 1:end]
+    if "\n" in body:
+        closing_indent = body[body.rfind("\n") + 1:]
+    else:
+        opening_line = text[text.rfind("\n", 0, start) + 1:start]
+        closing_indent = opening_line[:len(opening_line) - len(opening_line.lstrip())]
+    last = start + 1 + len(body.rstrip())
+    if body.strip():
+        line = text[text.rfind("\n", 0, last) + 1:last]
+        indent = line[:len(line) - len(line.lstrip())]
+        prefix = ","
+    else:
+        indent = closing_indent + step
+        prefix = ""
+    lines = [indent + json.dumps(key) + ": " + json.dumps(value, indent=len(step)).replace("\n", "\n" + indent)
+             for key, value in members]
+    return text[:last] + prefix + "\n" + ",\n".join(lines) + "\n" + closing_indent + text[end:]
+
+def update_mappings(school, modules, mappings_path=MAPPINGS_PATH, trie_path=TRIE_PATH):
+    """Add the prefixes of modules that no mapped prefix covers as "Unknown"; returns them.
+
+    Existing entries are left alone, and prefixes of removed modules are kept since the
+    table is shared across academic years. The new entries are spliced into the file text,
+    so its layout and any hand-edited duplicate keys survive. The saved prefix tries are
+    refreshed if present.
+    """
+    with open(mappings_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    mappings = json.loads(text)
+    table_name = f"{school.lower()}_prefix_to_major"
+    table = mappings.setdefault(table_name, {})
+    trie = ModuleIndex.from_tables(mappings).tries[school]
+    new_prefixes = []
+    for module in modules:
+        code = normalize_code(module["modulecode"])
+        match = LETTERS.match(code)
+        if match and trie.resolve(code) is None and match.group(0) not in table:
+            table[match.group(0)] = "Unknown"
+            new_prefixes.append(match.group(0))
+    if new_prefixes:
+        span = top_level_object(text, table_name)
+        if span is None:
+            text = append_members(text, text.index("{"), text.rindex("}"), [(table_name, table)])
+        else:
+            text = append_members(text, *span, [(prefix, "Unknown") for prefix in new_prefixes])
+        tmp_path = mappings_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, mappings_path)
+        if os.path.exists(trie_path):
+            ModuleIndex.from_tables(mappings).save(trie_path)
+    return new_prefixes
+
+def update_index(school, diff, modules, index_dir=INDEX_DIR):
+    """Patch the school's search shard with the diff, or build it if there is none yet."""
+    path = os.path.join(index_dir, SHARD_NAME.format(school=school))
+    if os.path.exists(path):
+        header, blob = update_shard(*read_shard(path), diff.gone_records,
+                                    [module for _, module in diff.new_records])
+    else:
+        os.makedirs(index_dir, exist_ok=True)
+        header, blob = build_shard(modules)
+    write_shard(path, header, blob)
+    return path
+
+def rollover(school, catalogue_path, modules_path=None, index_dir=INDEX_DIR, mappings_path=MAPPINGS_PATH):
+    """Bring one school's module file, prefix mappings and search shard up to a new catalogue.
+
+    The module file is rewritten exactly as a fresh extraction of the catalogue would
+    write it; only records whose content hash changed go into the mappings and the shard.
+    """
+    modules_path = modules_path or MODULES_PATH.format(school=school)
+    started = time.perf_counter()
+    old = read_catalogue(modules_path) if os.path.exists(modules_path) else []
+    new = read_catalogue(catalogue_path, ADAPTERS[school], school in DEDUPLICATE)
+    diff = diff_catalogues(old, new)
+    read = time.perf_counter()
+    if diff:
+        write_modules(modules_path, (module for _, module in new))
+        new_prefixes = update_mappings(school, [module for _, module in diff.new_records], mappings_path)
+        update_index(school, diff, [module for _, module in new], index_dir)
+    else:
+        new_prefixes = []
+    finished = time.perf_counter()
+    print(f"{school}: {len(diff.added)} modules added, {len(diff.removed)} removed, {len(diff.changed)} changed "
+          f"({len(diff.new_records)} records in, {len(diff.gone_records)} out); "
+          f"diff {read - started:.2f} s, update {finished - read:.2f} s")
+    if new_prefixes:
+        print(f"  unmapped prefixes added to mappings as Unknown: {', '.join(new_prefixes)}")
+    return diff
+
+def rollover_all(catalogues=CATALOGUES):
+    return {school: rollover(school, path) for school, path in catalogues.items() if os.path.exists(path)}
+
+if __name__ == "__main__":
+    rollover_all()
@@ -1,82 +1,133 @@
 #im using the latest instance of the modules. from each
+import hashlib
 import json
-school="NTU" #FIll in school name here
-extracted_data = []
-
-if school=="SMU":
-
-
-    # Input file path (replace with your file path)
-    file_path = r"C:\Users\Josh\Downloads\SMU Mods AY 2024-2025 detailed.json"  # Update this path
-
-    # Load the JSON data with UTF-8 encoding
-    with open(file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-
-    # Extract college, major, and degree from modules
-    extracted_data = [
-        {
-            "modulecode": module["Field"],
-            "title": module["Field2"],
-            "institution": "SMU",
-            "description": module["Text"]
-        }
-        for module in data
-    ]
-
-    # Save to a new JSON file named 'colleges_majors_degrees.json' with UTF-8 encoding
-    with open('codestitleinstitutiondescriptionextractorSMU.json', 'w', encoding='utf-8') as outfile:
-        json.dump(extracted_data, outfile, indent=4, ensure_ascii=False)
-
-elif school=="NUS":
-        # Input file path (replace with your file path)
-    file_path = r"C:\Users\Josh\Downloads\NUS Mods AY 2024-2025 detailed.json"  # Update this path
-
-    # Load the JSON data with UTF-8 encoding
-    with open(file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-
-    # Extract college, major, and degree from modules
-    extracted_data = [
-        {
-            "modulecode": module["moduleCode"],
-            "title": module["title"],
-            "institution": "NUS",
-            "description": module["description"]
-        }
-        for module in data
-    ]
-
-    # Save to a new JSON file named 'colleges_majors_degrees.json' with UTF-8 encoding
-    with open('codestitleinstitutiondescriptionextractorNUS.json', 'w', encoding='utf-8') as outfile:
-        json.dump(extracted_data, outfile, indent=4, ensure_ascii=False)
-
-elif school=="NTU":
-            # Input file path (replace with your file path)
-    file_path = r"C:\Users\Josh\Downloads\NTU Mods AY 2024-2025 detailed.json"  # Update this path
-
-    # Load the JSON data with UTF-8 encoding
-    with open(file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# File paths: the detailed catalogue exported for each school, and where the extracted
+# Module_code_and_description_<school>.json files go
+DATA_PATH = r"C:\Users\Josh\Downloads"
+CATALOGUES = {
+    "SMU": os.path.join(DATA_PATH, "SMU Mods AY 2024-2025 detailed.json"),
+    "NUS": os.path.join(DATA_PATH, "NUS Mods AY 2024-2025 detailed.json"),
+    "NTU": os.path.join(DATA_PATH, "NTU Mods AY 2024-2025 detailed.json")
+}
+OUTPUT_DIR = DATA_PATH
+OUTPUT_NAME = "Module_code_and_description_{school}.json"
+# Extract the schools in separate processes
+PARALLEL = True
+# Bytes read from a catalogue at a time; memory use stays around this plus one module
+CHUNK_SIZE = 1 << 16
+
+def smu_module(module):
+    return {"modulecode": module["Field"], "title": module["Field2"], "institution": "SMU", "description": module["Text"]}
+
+def nus_module(module):
+    # The plain NUS export (Raw/NUS MODs ...) has no descriptions
+    return {"modulecode": module["moduleCode"], "title": module["title"], "institution": "NUS",
+            "description": module.get("description")}
+
+def ntu_module(module):
+    # Field3 holds "CODE Title"; the NTU export repeats modules once per programme
+    code, title = module["Field3"].split(' ', 1)
+    return {"modulecode": code, "title": title, "institution": "NTU", "description": module["Field4"]}
+
+ADAPTERS = {"SMU": smu_module, "NUS": nus_module, "NTU": ntu_module}
+# Schools whose catalogue lists the same module more than once
+DEDUPLICATE = {"NTU"}
+
+def iter_json_array(path, chunk_size=CHUNK_SIZE, with_text=False):
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Reads the file in chunks and decodes each element with JSONDecoder.raw_decode, so
+    only the current element and one chunk are held in memory. With with_text, yields
+    (element, source text of the element) pairs instead.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip('\ufeff').lstrip()
+        # Leading whitespace can run past the first chunk
+        while not buffer:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buffer = chunk.lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{path} does not contain a JSON array")
+        position = 1
+        eof = False
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) and buffer[position] == ']':
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+                # A number cut off at the chunk boundary ("2." of "2.5") still decodes, so
+                # it only counts once the character after it is in the buffer
+                number = isinstance(element, (int, float)) and not isinstance(element, bool)
+                complete = eof or end < len(buffer) and (not number or buffer[end] in ' \t\r\n,]')
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if complete:
+                yield (element, buffer[position:end]) if with_text else element
+                position = end
+                continue
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            if eof and position >= len(buffer):
+                raise ValueError(f"{path} ended before the closing ']'")
+            buffer = buffer[position:] + chunk
+            position = 0
+
+def module_key(module):
+    payload = "\x1f".join([module["modulecode"], module["title"], module["description"] or ""])
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest()
+
+def write_modules(path, modules):
+    """Write modules as a JSON array with one module per line, atomically; returns the count."""
+    tmp_path = path + ".tmp"
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("[")
+        for module in modules:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(module, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    os.replace(tmp_path, path)
+    return count
+
+def extract_school(school, catalogue_path, output_dir=OUTPUT_DIR):
+    """Stream one school's detailed catalogue through its adapter into the output file."""
+    adapter = ADAPTERS[school]
     seen = set()
-    # Extract college, major, and degree from modules
-    for module in data: 
-            code, title = module["Field3"].split(' ', 1)
-            description = module["Field4"]
-            key = (code, title, description)
-            if key not in seen:
+    def modules():
+        for record in iter_json_array(catalogue_path):
+            module = adapter(record)
+            if school in DEDUPLICATE:
+                key = module_key(module)
+                if key in seen:
+                    continue
                 seen.add(key)
-                extracted_data.append({
-                    "modulecode": code,
-                    "title": title,
-                    "institution": "NTU",
-                    "description": description
-                })
-
-    # Save to a new JSON file named 'colleges_majors_degrees.json' with UTF-8 encoding
-    with open('codestitleinstitutiondescriptionextractorNTU.json', 'w', encoding='utf-8') as outfile:
-        json.dump(extracted_data, outfile, indent=4, ensure_ascii=False)
-
-
-
+            yield module
+    output_path = os.path.join(output_dir, OUTPUT_NAME.format(school=school))
+    count = write_modules(output_path, modules())
+    return school, count, output_path
+
+def extract_all(catalogues=CATALOGUES, output_dir=OUTPUT_DIR, parallel=PARALLEL):
+    """Extract every school's modules, one process per school when parallel is set."""
+    jobs = [(school, path, output_dir) for school, path in catalogues.items()]
+    if parallel and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            results = list(pool.map(extract_school, *zip(*jobs)))
+    else:
+        results = [extract_school(*job) for job in jobs]
+    for school, count, output_path in results:
+        print(f"{school}: extracted {count} modules to {output_path}")
+    return results
+
+if __name__ == "__main__":
+    extract_all()
@@ -0,0 +1,80 @@
+import time
+import numpy as np
+from catalogue import load_catalogue
+from cataloguebenchmark import MAJORS_FILES
+from eligibility import ALEVEL, EligibilityIndex
+from suitability import SuitabilityMatrix
+
+# Benchmark settings: a random cohort is scored against every program in the shipped files
+COHORT_SIZE = 10000
+TOP_K = 10
+LOOP_SAMPLE = 500  # the Python loop is timed on a sample and scaled up
+SEED = 0
+# Random A-Level applicants draw their H2 subjects from these
+ALEVEL_GRADES = "ABCDE"
+ALEVEL_SUBJECTS = ["H2 Mathematics", "H2 Physics", "H2 Chemistry", "H2 Biology", "H2 Computing", "H2 Economics",
+                   "H2 History", "H2 Literature", "H1 General Paper", "H1 Chinese", "O-Level Physics"]
+
+def best_of(fn, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def loop_rank(programs, profile, k=TOP_K):
+    """The per-student Python loop the matrix replaces."""
+    scores = []
+    for row, program in enumerate(programs):
+        total = sum(c.weight for c in program.suitability) or 1.0
+        scores.append((sum(profile.get(c.name, 0.0) * c.weight for c in program.suitability) / total, row))
+    return sorted(scores, key=lambda item: -item[0])[:k]
+
+def run_benchmark(cohort_size=COHORT_SIZE):
+    programs = load_catalogue(MAJORS_FILES)
+    matrix = SuitabilityMatrix.from_programs(programs)
+    cohort = np.random.default_rng(SEED).random((cohort_size, len(matrix.criteria)))
+
+    best, scores = matrix.rank_cohort(cohort, TOP_K)
+    profiles = [dict(zip(matrix.criteria, row)) for row in cohort[:LOOP_SAMPLE]]
+    agree = all(np.allclose([score for score, _ in loop_rank(programs, profile)], scores[i])
+                for i, profile in enumerate(profiles[:50]))
+
+    matrix_seconds = best_of(lambda: matrix.rank_cohort(cohort, TOP_K))
+    score_seconds = best_of(lambda: matrix.score(cohort))
+    loop_seconds = best_of(lambda: [loop_rank(programs, profile) for profile in profiles], 1) * cohort_size / len(profiles)
+
+    print(f"\nCohort scoring: {cohort_size} students x {len(programs)} programs x {len(matrix.criteria)} criteria")
+    print(f"  matrix product only   {score_seconds * 1000:9.2f} ms")
+    print(f"  matrix + top-{TOP_K}        {matrix_seconds * 1000:9.2f} ms")
+    print(f"  python loop (scaled)  {loop_seconds * 1000:9.2f} ms")
+    print(f"  speedup {loop_seconds / matrix_seconds:.0f}x; top-{TOP_K} matches the loop: {agree}")
+    return {"matrix_seconds": matrix_seconds, "score_seconds": score_seconds, "loop_seconds": loop_seconds, "agree": agree}
+
+def random_applicants(rng, count):
+    grades = ["".join(rng.choice(list(ALEVEL_GRADES), 3)) + "/" + str(rng.choice(list(ALEVEL_GRADES))) for _ in range(count)]
+    subjects = [[str(subject) for subject in rng.choice(ALEVEL_SUBJECTS, 4, replace=False)] for _ in range(count)]
+    return grades, subjects
+
+def run_eligibility_benchmark(cohort_size=COHORT_SIZE):
+    index = EligibilityIndex.from_programs(load_catalogue(MAJORS_FILES))
+    grades, subjects = random_applicants(np.random.default_rng(SEED), cohort_size)
+
+    eligible = index.eligible_cohort(ALEVEL, grades, subjects)
+    one_by_one = [index.routes[ALEVEL].eligible_bits(index.route_score(ALEVEL, g), s)
+                  for g, s in zip(grades[:LOOP_SAMPLE], subjects[:LOOP_SAMPLE])]
+    agree = all(sum(1 << int(row) for row in np.flatnonzero(eligible[i])) == bits for i, bits in enumerate(one_by_one))
+
+    batch_seconds = best_of(lambda: index.eligible_cohort(ALEVEL, grades, subjects))
+    query_seconds = best_of(lambda: [index.eligible(ALEVEL, g, s) for g, s in zip(grades[:LOOP_SAMPLE], subjects[:LOOP_SAMPLE])], 1)
+
+    print(f"\nEligibility: {cohort_size} A-Level applicants x {len(index.requirements)} programs")
+    print(f"  cohort batch          {batch_seconds * 1000:9.2f} ms ({eligible.sum(axis=1).mean():.1f} eligible programs on average)")
+    print(f"  single queries        {query_seconds / LOOP_SAMPLE * 1e6:9.1f} us per applicant")
+    print(f"  batch matches single queries: {agree}")
+    return {"batch_seconds": batch_seconds, "query_seconds": query_seconds, "agree": agree}
+
+if __name__ == "__main__":
+    run_benchmark()
+    run_eligibility_benchmark()
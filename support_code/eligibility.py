@@ -0,0 +1,329 @@
+import json
+import os
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import NamedTuple
+import numpy as np
+
+# Admission routes an applicant can take; each standardized qualificationType maps to one
+ALEVEL = "A-Level"
+IB = "IB"
+POLYTECHNIC = "Polytechnic"
+ROUTES = (ALEVEL, IB, POLYTECHNIC)
+QUALIFICATION_ROUTES = {
+    "GCE A-Level": ALEVEL,
+    "International Baccalaureate": IB,
+    "Polytechnic GPA": POLYTECHNIC,
+    "Polytechnic Diploma": POLYTECHNIC
+}
+# Markers that name a route in eligibility text without a recognised qualificationType
+ROUTE_MARKERS = (
+    (IB, re.compile(r'\b(?:IB|International Baccalaureate|HL|SL)\b')),
+    (POLYTECHNIC, re.compile(r'\b(?:[Dd]iploma|[Pp]olytechnic)\b|\d\.\d+\s*/\s*4\.0')),
+    (ALEVEL, re.compile(r'\b(?:A-Level|H1|H2|H3|General Paper|Knowledge & Inquiry)\b|\b[A-EU]{3}/[A-EU]\b'))
+)
+# A-Level grade points: H2 subjects at full weight, the H1 grade after the slash at half
+H2_POINTS = {"A": 20.0, "B": 17.5, "C": 15.0, "D": 12.5, "E": 10.0, "S": 5.0, "U": 0.0}
+# Subject levels, compared within their own family (A-Level or IB)
+LEVEL_RANK = {"O-Level": 1, "H1": 2, "H2": 3, "H3": 4, "SL": 1, "HL": 2}
+
+GRADE_RANGE = re.compile(r'\b([A-EU]{3}/[A-EU])(?:\s+to\s+([A-EU]{3}/[A-EU]))?')
+IB_POINTS = re.compile(r'(\d+)\s*(?:-\s*(\d+)\s*)?points|minimum score of (\d+)', re.IGNORECASE)
+DIPLOMA_GPA = re.compile(r'(\d\.\d+)\s*/\s*4\.0')
+PARENTHESES = re.compile(r'\([^)]*\)')
+CLAUSE_SEPARATOR = re.compile(r'[,;]')
+# Clauses that state a preference or an escape hatch rather than a hard requirement
+NOT_REQUIRED = re.compile(r'preferred|equivalent|no specific|passes', re.IGNORECASE)
+LEVEL_MARKER = re.compile(r'\b(H1|H2|H3|HL|SL|O-Level)\b')
+# A level written before a subject name; text ahead of it ("Excellent grades in") is dropped
+LEADING_LEVEL = re.compile(r'\b(H1|H2|H3|HL|SL|O-Level)\s+(?!or\b|and\b)\w')
+PREFIX_LEVEL = re.compile(r'^(H1|H2|H3|HL|SL|O-Level)\s+(.+)$')
+SUFFIX_LEVEL = re.compile(r'^(.+?)\s+(HL|SL)$')
+ALTERNATIVE_SEPARATOR = re.compile(r'\s+(or|and)\s+')
+# NTU phrasing ("H2 Level pass in Physics/Chemistry", "H1/O-Level Chinese") rewritten into
+# the "H2 Physics or Chemistry" form parse_clause reads; of two levels the lower is kept
+LEVEL_CHOICE = re.compile(r'\b(H1|H2|H3|O-Level)/(H1|H2|H3|O-Level)\b')
+SUBJECT_REWRITES = (
+    (re.compile(r'(?<!H1 )\bGeneral Paper or Knowledge & Inquiry\b'), 'H1 General Paper or H1 Knowledge & Inquiry'),
+    (re.compile(r'\b(H1|H2|H3)\s+Level\b'), r'\1'),
+    (re.compile(r'\b(?:good\s+|at\s+least\s+an?\s+[A-E]\s+)?(?:pass|grade)\s+in\s+', re.IGNORECASE), ''),
+    (re.compile(r'\s+subjects?\b'), ''),
+    (re.compile(r'(?<=[a-z])/(?=[A-Z])'), ' or ')
+)
+
+class Route(NamedTuple):
+    """One admission route into a program.
+
+    minimum/maximum are the score range from the text (A-Level grade points, IB points
+    or diploma GPA); the range is indicative, so only the minimum gates eligibility.
+    subjects is a tuple of groups, each a tuple of (subject, level) alternatives; every
+    group needs one alternative. level is None where the text gives none.
+    """
+    minimum: float | None
+    maximum: float | None
+    subjects: tuple
+
+class Requirements(NamedTuple):
+    institution: str
+    college: str
+    major: str
+    degree: str
+    routes: dict
+
+    @property
+    def parsed(self):
+        """False when no route could be read from the eligibility text (not the same as ineligible)."""
+        return bool(self.routes)
+
+@lru_cache(maxsize=None)
+def alevel_points(grades):
+    """'AAB/B' -> 66.25."""
+    match = re.fullmatch(r'([A-EU]{3})/([A-EU])', grades.strip().upper())
+    if match is None:
+        raise ValueError(f"A-Level grades must look like 'AAB/B', got {grades!r}")
+    return sum(H2_POINTS[grade] for grade in match.group(1)) + H2_POINTS[match.group(2)] / 2
+
+def parse_subject(text):
+    """'H2 Mathematics' / 'Mathematics HL' -> ('mathematics', level); a bare name has no level."""
+    return subject_with_position(text)[:2]
+
+def subject_with_position(text):
+    text = text.strip()
+    prefix = PREFIX_LEVEL.match(text)
+    if prefix:
+        return prefix.group(2).strip().lower(), prefix.group(1), "prefix"
+    suffix = SUFFIX_LEVEL.match(text)
+    if suffix:
+        return suffix.group(1).strip().lower(), suffix.group(2), "suffix"
+    return text.lower(), None, None
+
+def parse_clause(clause):
+    """Subject groups in one clause, e.g. 'H2 Physics or Chemistry' or 'Physics or Biology HL'.
+
+    A leading level carries forward to bare names after it and a trailing HL/SL carries
+    back to bare names before it; 'and' starts a new group.
+    """
+    parts = ALTERNATIVE_SEPARATOR.split(clause)
+    subjects = [subject_with_position(text) for text in parts[::2]]
+    levels = [level for _, level, _ in subjects]
+    for order, carrier in ((range(len(subjects) - 1, -1, -1), "suffix"), (range(len(subjects)), "prefix")):
+        carried = None
+        for index in order:
+            _, level, position = subjects[index]
+            if position is None:
+                levels[index] = levels[index] or carried
+            else:
+                carried = level if position == carrier else None
+
+    groups = [[]]
+    for index, ((name, _, _), level) in enumerate(zip(subjects, levels)):
+        if index and parts[2 * index - 1] == "and":
+            groups.append([])
+        if name:
+            groups[-1].append((name, level))
+    return [tuple(group) for group in groups if group]
+
+def rewrite_subjects(text):
+    text = LEVEL_CHOICE.sub(lambda m: min(m.groups(), key=LEVEL_RANK.get), text)
+    for pattern, replacement in SUBJECT_REWRITES:
+        text = pattern.sub(replacement, text)
+    return text
+
+def parse_subject_groups(text):
+    groups = []
+    for clause in CLAUSE_SEPARATOR.split(rewrite_subjects(PARENTHESES.sub('', text))):
+        marker = LEVEL_MARKER.search(clause)
+        if marker is None or NOT_REQUIRED.search(clause):
+            continue
+        leading = LEADING_LEVEL.search(clause)
+        if leading and leading.start() == marker.start():
+            clause = clause[leading.start():]
+        groups.extend(parse_clause(clause.strip()))
+    return tuple(groups)
+
+def parse_route(route, text):
+    minimum = maximum = None
+    if route == ALEVEL:
+        match = GRADE_RANGE.search(text)
+        if match:
+            # Ranges are usually written low to high ("ABB/B to AAA/A"), but not always
+            minimum, maximum = sorted((alevel_points(match.group(1)), alevel_points(match.group(2) or match.group(1))))
+    elif route == IB:
+        match = IB_POINTS.search(text)
+        if match:
+            minimum = float(match.group(1) or match.group(3))
+            maximum = float(match.group(2) or minimum)
+    elif route == POLYTECHNIC:
+        match = DIPLOMA_GPA.search(text)
+        if match:
+            minimum = maximum = float(match.group(1))
+    return Route(minimum, maximum, parse_subject_groups(text))
+
+def inferred_routes(text):
+    return [route for route, marker in ROUTE_MARKERS if marker.search(text)]
+
+def parse_requirements(program):
+    """Requirements for a catalogue Program.
+
+    Entries whose qualificationType is null or not one of the three routes (most NTU
+    programs) are assigned to the routes their text mentions (H2 subjects, HL, diploma,
+    ...); all such text for one route is parsed together. A route given explicitly by
+    qualificationType takes precedence.
+    """
+    routes = {}
+    inferred = {}
+    for entry in program.eligibility:
+        route = QUALIFICATION_ROUTES.get(entry.qualification_type)
+        if route is None:
+            for route in inferred_routes(entry.description):
+                inferred.setdefault(route, []).append(entry.description)
+        elif route not in routes:
+            routes[route] = parse_route(route, entry.description)
+    for route, texts in inferred.items():
+        if route not in routes:
+            routes[route] = parse_route(route, "; ".join(texts))
+    return Requirements(program.institution, program.college, program.major, program.degree, routes)
+
+def requirements_entry(program):
+    """Parse a program's requirements into the JSON entry write_requirements saves."""
+    r = parse_requirements(program)
+    return {"institution": r.institution, "college": r.college, "major": r.major, "degree": r.degree,
+            "parsed": r.parsed, "routes": {name: route._asdict() for name, route in r.routes.items()}}
+
+def write_requirements(programs, path):
+    """Save parsed requirements as JSON so consumers do not re-parse the eligibility text."""
+    return save_requirement_entries([requirements_entry(program) for program in programs], path)
+
+def save_requirement_entries(data, path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return len(data)
+
+def read_requirements(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [Requirements(entry["institution"], entry["college"], entry["major"], entry["degree"], {
+        name: Route(route["minimum"], route["maximum"],
+                    tuple(tuple((subject, level) for subject, level in group) for group in route["subjects"]))
+        for name, route in entry["routes"].items()
+    }) for entry in data]
+
+def satisfies(subjects, alternative):
+    """subjects is a set of (subject, level) the applicant holds."""
+    name, level = alternative
+    for held_name, held_level in subjects:
+        if held_name == name and (level is None or held_level in LEVEL_RANK and LEVEL_RANK[held_level] >= LEVEL_RANK[level]):
+            return True
+    return False
+
+class RouteIndex:
+    """Eligibility for one route over all programs, with programs as bits of an int.
+
+    Minimum scores are kept sorted with a running OR of program bits, so the programs
+    whose minimum an applicant meets are one bisect away. Subject groups are stored
+    once each with the bits of the programs that need them.
+    """
+
+    def __init__(self, requirements, route):
+        self.accepts = 0
+        minimums = []
+        groups = {}
+        for row, requirement in enumerate(requirements):
+            spec = requirement.routes.get(route)
+            if spec is None:
+                continue
+            self.accepts |= 1 << row
+            minimums.append((float("-inf") if spec.minimum is None else spec.minimum, row))
+            for group in spec.subjects:
+                groups[group] = groups.get(group, 0) | 1 << row
+        minimums.sort()
+        self.thresholds = [minimum for minimum, _ in minimums]
+        self.prefix = []
+        bits = 0
+        for _, row in minimums:
+            bits |= 1 << row
+            self.prefix.append(bits)
+        self.groups = list(groups.items())
+
+        # Dense form of the same index for scoring a cohort at once
+        count = len(requirements)
+        self.minimum_array = np.full(count, np.inf)
+        for minimum, row in minimums:
+            self.minimum_array[row] = minimum
+        self.hits = {}
+        self.vocabulary = sorted({alternative for group, _ in self.groups for alternative in group}, key=str)
+        self.alternative_groups = np.zeros((len(self.vocabulary), len(self.groups)), dtype=np.float32)
+        self.group_programs = np.zeros((len(self.groups), count), dtype=np.float32)
+        column = {alternative: index for index, alternative in enumerate(self.vocabulary)}
+        for index, (group, bits) in enumerate(self.groups):
+            for alternative in group:
+                self.alternative_groups[column[alternative], index] = 1
+            self.group_programs[index] = [(bits >> row) & 1 for row in range(count)]
+
+    def eligible_bits(self, score, subjects=()):
+        position = bisect_right(self.thresholds, score)
+        bits = self.prefix[position - 1] if position else 0
+        held = {parse_subject(subject) if isinstance(subject, str) else subject for subject in subjects}
+        for group, programs in self.groups:
+            if bits & programs and not any(satisfies(held, alternative) for alternative in group):
+                bits &= ~programs
+        return bits
+
+    def vocabulary_hits(self, subject):
+        """Columns of the vocabulary that one held subject satisfies, cached per subject."""
+        if subject not in self.hits:
+            held = (parse_subject(subject) if isinstance(subject, str) else tuple(subject),)
+            self.hits[subject] = [index for index, alternative in enumerate(self.vocabulary)
+                                  if satisfies(held, alternative)]
+        return self.hits[subject]
+
+    def eligible_matrix(self, scores, subject_lists):
+        """N x P boolean eligibility for N applicants' scores and subject lists."""
+        scores = np.asarray(scores, dtype=float)
+        rows, columns = [], []
+        for row, subjects in enumerate(subject_lists):
+            for subject in subjects:
+                hits = self.vocabulary_hits(subject)
+                rows.extend([row] * len(hits))
+                columns.extend(hits)
+        held = np.zeros((len(scores), len(self.vocabulary)), dtype=np.float32)
+        held[rows, columns] = 1
+        unmet = (held @ self.alternative_groups) == 0
+        failed = (unmet.astype(np.float32) @ self.group_programs) > 0
+        return (scores[:, None] >= self.minimum_array[None, :]) & ~failed
+
+class EligibilityIndex:
+    """Which programs an applicant can enter, answered from per-route bitset indexes.
+
+    score is A-Level grades ('AAB/B') or points, IB points, or diploma GPA; subjects are
+    strings such as 'H2 Mathematics' or 'Mathematics HL'.
+
+    Programs whose eligibility text yields no route at all are never in an eligible
+    set; they are listed in self.unparsed so callers can show them as "requirements
+    unknown" rather than as programs the applicant cannot enter.
+    """
+
+    def __init__(self, requirements):
+        self.requirements = list(requirements)
+        self.unparsed = [requirement for requirement in self.requirements if not requirement.parsed]
+        self.routes = {route: RouteIndex(self.requirements, route) for route in ROUTES}
+
+    @classmethod
+    def from_programs(cls, programs):
+        return cls([parse_requirements(program) for program in programs])
+
+    def route_score(self, route, score):
+        return alevel_points(score) if route == ALEVEL and isinstance(score, str) else float(score)
+
+    def eligible(self, route, score, subjects=()):
+        """Requirements of every program the applicant meets, in catalogue order (see unparsed)."""
+        bits = self.routes[route].eligible_bits(self.route_score(route, score), subjects)
+        return [requirement for row, requirement in enumerate(self.requirements) if bits >> row & 1]
+
+    def eligible_cohort(self, route, scores, subject_lists):
+        """Batch mode: an N x P boolean array, one row per applicant, columns in catalogue order."""
+        scores = [self.route_score(route, score) for score in scores]
+        return self.routes[route].eligible_matrix(scores, subject_lists)
@@ -1,14 +1,10 @@
 import json
 import os
-import re
+from catalogue import CatalogueError, institution_from_filename, load_programs
 
 def get_school_from_filename(filename):
     """Extract school name from filename (e.g., 'standardized_ntu_majors.json' -> 'NTU')."""
-    # Extract the part after 'standardized_' and before '_majors.json'
-    match = re.search(r'standardized_([^_]+)_majors\.json', os.path.basename(filename))
-    if match:
-        return match.group(1).upper()  # e.g., 'ntu' -> 'NTU'
-    return "Unknown"
+    return institution_from_filename(filename)
 
 def extract_unique_major_schools(file_paths, output_dir):
     """Extract unique major-school pairs from multiple JSON files and save as JSON.
@@ -28,30 +24,24 @@ def extract_unique_major_schools(file_paths, output_dir):
     for file_path in file_paths:
         school = get_school_from_filename(file_path)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            programs = load_programs(file_path, school, skip_invalid=True)
         except FileNotFoundError:
             print(f"Error: File '{file_path}' not found.")
             continue
         except json.JSONDecodeError:
             print(f"Error: Invalid JSON format in '{file_path}'.")
             continue
-        
-        # Validate JSON structure
-        if not isinstance(data, dict) or "programs" not in data or not isinstance(data["programs"], list):
-            print(f"Error: File '{file_path}' does not contain a valid 'programs' array.")
+        except CatalogueError as e:
+            print(f"Error: File '{file_path}' is not a valid majors file: {e}")
             continue
         
         # Extract majors and associate with school
-        for program in data["programs"]:
-            if not isinstance(program, dict) or "major" not in program:
-                print(f"Warning: Skipping invalid program entry in '{file_path}': {program}")
-                continue
-            major = program["major"].strip()
+        for program in programs:
+            major = program.major.strip()
             if major:
                 unique_major_schools.add((major, school))  # Pair ensures major can repeat with different schools
             else:
-                print(f"Warning: Skipping empty major in '{file_path}': {program}")
+                print(f"Warning: Skipping empty major in '{file_path}': {program.to_dict()}")
     
     # Convert set to sorted list of dictionaries
     unique_major_schools_list = [
@@ -0,0 +1,89 @@
+import asyncio
+import contextlib
+import os
+import tempfile
+import time
+import quizgenerator
+from mocknim import MockNimConfig, start_mock_server
+
+# Benchmark settings: the generator runs end to end against the local mock endpoint
+BENCHMARK_PROGRAMS = 10
+QUESTIONS_PER_CRITERION = 5
+MODES = [("serial", 1), ("async", 16)]
+MOCK_CONFIG = MockNimConfig(
+    llm_latency={"distribution": "lognormal", "median": 0.2, "sigma": 0.4},
+    reward_latency={"distribution": "lognormal", "median": 0.05, "sigma": 0.3},
+    error_rates={429: 0.02, 500: 0.01},
+    seed=1
+)
+STANDARDIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "school-data",
+                                "Standardized-weights")
+
+def use_scratch_outputs(directory):
+    for name in dir(quizgenerator):
+        if name.endswith("_PATH") and name != "DATA_PATH":
+            setattr(quizgenerator, name, os.path.join(directory, os.path.basename(getattr(quizgenerator, name).replace('\\', '/'))))
+    for name in ("NUS_MAJORS_JSON", "NTU_MAJORS_JSON", "SMU_MAJORS_JSON"):
+        filename = os.path.basename(getattr(quizgenerator, name).replace('\\', '/'))
+        setattr(quizgenerator, name, os.path.join(STANDARDIZED_DIR, filename))
+
+def run_mode(server, mode, concurrency, programs):
+    """Run one generation mode from an empty work queue and collect its numbers."""
+    scratch = tempfile.mkdtemp()
+    use_scratch_outputs(scratch)
+    quizgenerator.REQUIRED_QUESTIONS_PER_CRITERION = QUESTIONS_PER_CRITERION
+    quizgenerator.CACHE_MODE = "off"
+    quizgenerator.RATE_LIMIT_PER_MINUTE = 600000
+    quizgenerator.MAX_CONCURRENCY = concurrency
+    quizgenerator.configure_client(server.base_url, "mock")
+    selected = quizgenerator.load_majors()[:programs]
+    quizgenerator.load_majors = lambda: selected
+
+    started = time.time()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if mode == "async":
+            data = asyncio.run(quizgenerator.generate_quiz_questions_async(concurrency))
+        else:
+            data = quizgenerator.generate_quiz_questions()
+    wall = time.time() - started
+
+    metrics = quizgenerator.run_metrics
+    llm = metrics.latency[quizgenerator.LLM_MODEL]
+    reward = metrics.latency[quizgenerator.REWARD_MODEL]
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "programs": len(selected),
+        "accepted": len(data),
+        "wall_seconds": wall,
+        "questions_per_second": len(data) / wall if wall > 0 else 0.0,
+        "llm_p50": llm.quantile(0.5), "llm_p99": llm.quantile(0.99),
+        "reward_p50": reward.quantile(0.5), "reward_p99": reward.quantile(0.99),
+        "requests": quizgenerator.nim.metrics['requests'],
+        "retries": quizgenerator.nim.metrics['retries']
+    }
+
+def run_benchmark(programs=BENCHMARK_PROGRAMS):
+    server = start_mock_server(MOCK_CONFIG)
+    load_majors = quizgenerator.load_majors
+    results = []
+    try:
+        for mode, concurrency in MODES:
+            quizgenerator.load_majors = load_majors
+            results.append(run_mode(server, mode, concurrency, programs))
+    finally:
+        quizgenerator.load_majors = load_majors
+        server.shutdown()
+
+    print(f"\nEnd-to-end benchmark against the mock endpoint: {programs} programs, "
+          f"{QUESTIONS_PER_CRITERION} questions per criterion")
+    print(f"{'mode':>6} {'conc':>4} {'accepted':>8} {'wall s':>7} {'q/s':>6} {'llm p50':>8} {'llm p99':>8} "
+          f"{'rwd p50':>8} {'rwd p99':>8} {'requests':>8} {'retries':>7}")
+    for r in results:
+        print(f"{r['mode']:>6} {r['concurrency']:>4} {r['accepted']:>8} {r['wall_seconds']:>7.1f} "
+              f"{r['questions_per_second']:>6.2f} {r['llm_p50']:>8.3f} {r['llm_p99']:>8.3f} "
+              f"{r['reward_p50']:>8.3f} {r['reward_p99']:>8.3f} {r['requests']:>8} {r['retries']:>7}")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,104 @@
+import json
+import os
+
+class JsonlSink:
+    """Append-only JSON Lines writer.
+
+    Every record is written as one line, so the cost of saving a record does not
+    depend on how many records the file already holds. Writes are flushed and
+    fsynced to disk once every `fsync_every` records (and on flush/close).
+    """
+
+    def __init__(self, path, fsync_every=50):
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.pending = 0
+        self.file = None
+
+    def append(self, record):
+        if self.file is None:
+            self.file = open(self.path, 'a', encoding='utf-8')
+            if ends_mid_line(self.path):
+                # Start on a fresh line after a record torn by a crash
+                self.file.write("\n")
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.pending += 1
+        if self.pending >= self.fsync_every:
+            self.flush()
+
+    def flush(self):
+        if self.file is None:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def close(self):
+        if self.file is None:
+            return
+        self.flush()
+        self.file.close()
+        self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def ends_mid_line(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+def read_jsonl(path):
+    """Yield records from a JSON Lines file, skipping a torn final line left by a crash."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Warning: Skipping unreadable line {line_number} in '{path}'")
+
+def seed_jsonl_from_json(json_path, jsonl_path):
+    """Convert a legacy JSON array file into a JSON Lines file if none exists yet."""
+    if os.path.exists(jsonl_path) or not os.path.exists(json_path):
+        return 0
+    with open(json_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    with JsonlSink(jsonl_path, fsync_every=len(records) or 1) as sink:
+        for record in records:
+            sink.append(record)
+    print(f"Seeded {jsonl_path} with {len(records)} records from {json_path}")
+    return len(records)
+
+def write_jsonl(path, records):
+    """Replace a JSON Lines file with records, atomically."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def export_json(jsonl_path, json_path, indent=2):
+    """Compact a JSON Lines file into the JSON array layout consumers expect.
+
+    The array is written to a temporary file and renamed over the target, so readers
+    never see a half-written export.
+    """
+    records = list(read_jsonl(jsonl_path))
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=indent)
+    os.replace(tmp_path, json_path)
+    print(f"Exported {len(records)} records from {jsonl_path} to {json_path}")
+    return len(records)
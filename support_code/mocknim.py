@@ -0,0 +1,162 @@
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Question templates for the mock LLM; {topic} and {activity} are filled at random
+QUESTION_TEMPLATES = [
+    "How would you approach {activity} if you had never tried it before?",
+    "What everyday situation made you curious about {topic}, and what did you do about it?",
+    "Can you describe a time you worked with others on {activity} and what you learned?",
+    "Imagine you had a free month to explore {topic}; how would you spend it?",
+    "Which part of {topic} do you think will matter most to your future, and why?",
+    "If you could change one thing about how people approach {activity}, what would it be?",
+    "What is the most interesting problem about {topic} you have tried to solve on your own?"
+]
+TOPICS = ["how cities grow", "the way people make decisions", "how machines learn", "climate and energy",
+          "stories and language", "money and markets", "the human body", "how laws shape society",
+          "designing useful things", "data and patterns", "art and culture", "how ideas spread"]
+ACTIVITIES = ["planning a group project", "fixing something that broke", "explaining a hard idea",
+              "organising an event", "building a small prototype", "leading a discussion",
+              "collecting and comparing information", "teaching a younger student"]
+# Outputs that quizgenerator.is_valid_question should reject
+INVALID_OUTPUTS = ["def question(): pass", "Too short?", "import this"]
+BATCH_REQUEST = re.compile(r'numbered list from 1 to (\d+)')
+
+def sample_latency(rng, spec):
+    """Draw a latency in seconds from {"distribution": ..., ...}.
+
+    fixed: seconds; uniform: low, high; exponential: mean; lognormal: median, sigma.
+    """
+    kind = spec.get("distribution", "fixed")
+    if kind == "fixed":
+        return spec.get("seconds", 0.0)
+    if kind == "uniform":
+        return rng.uniform(spec.get("low", 0.0), spec.get("high", 0.1))
+    if kind == "exponential":
+        return rng.expovariate(1.0 / spec["mean"]) if spec.get("mean") else 0.0
+    if kind == "lognormal":
+        return rng.lognormvariate(math.log(spec.get("median", 0.05)), spec.get("sigma", 0.5))
+    raise ValueError(f"Unknown latency distribution '{kind}'")
+
+class MockNimConfig:
+    """Behaviour of the mock endpoint.
+
+    Latency specs are per model kind ("llm" and "reward"). error_rates maps an HTTP
+    status to the probability of answering with it; 429s carry retry_after seconds.
+    invalid_rate is the share of LLM outputs that should fail validation, and reward
+    scores are drawn uniformly from score_range.
+    """
+
+    def __init__(self, llm_latency=None, reward_latency=None, error_rates=None, retry_after=0.1,
+                 invalid_rate=0.1, score_range=(0.0, 1.0), seed=None):
+        self.llm_latency = llm_latency or {"distribution": "lognormal", "median": 0.05, "sigma": 0.5}
+        self.reward_latency = reward_latency or {"distribution": "lognormal", "median": 0.02, "sigma": 0.3}
+        self.error_rates = error_rates or {}
+        self.retry_after = retry_after
+        self.invalid_rate = invalid_rate
+        self.score_range = score_range
+        self.seed = seed
+
+class MockNimServer(ThreadingHTTPServer):
+    """OpenAI-compatible /v1/chat/completions stand-in for the NIM endpoints."""
+
+    daemon_threads = True
+
+    def __init__(self, address, config=None):
+        super().__init__(address, MockNimHandler)
+        self.config = config or MockNimConfig()
+        self.rng = random.Random(self.config.seed)
+        self.rng_lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def draw(self, fn, *args):
+        with self.rng_lock:
+            return fn(self.rng, *args)
+
+    def pick_error(self, rng):
+        roll = rng.random()
+        for status, rate in self.config.error_rates.items():
+            if roll < rate:
+                return int(status)
+            roll -= rate
+        return None
+
+    def question(self, rng):
+        if rng.random() < self.config.invalid_rate:
+            return rng.choice(INVALID_OUTPUTS)
+        return rng.choice(QUESTION_TEMPLATES).format(topic=rng.choice(TOPICS), activity=rng.choice(ACTIVITIES))
+
+    def completion_text(self, rng, request):
+        if "reward" in request.get("model", ""):
+            return f"{rng.uniform(*self.config.score_range):.3f}"
+        prompt = request["messages"][-1]["content"]
+        batch = BATCH_REQUEST.search(prompt)
+        if batch is None:
+            return self.question(rng)
+        return "\n".join(f"{i}. {self.question(rng)}" for i in range(1, int(batch.group(1)) + 1))
+
+class MockNimHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": f"No route for {self.path}"}})
+            return
+        server.requests += 1
+        is_reward = "reward" in request.get("model", "")
+        spec = server.config.reward_latency if is_reward else server.config.llm_latency
+        time.sleep(server.draw(sample_latency, spec))
+
+        status = server.draw(server.pick_error)
+        if status is not None:
+            headers = {"Retry-After": str(server.config.retry_after)} if status == 429 else None
+            self.send_json(status, {"error": {"message": f"Mock error {status}", "code": status}}, headers)
+            return
+
+        content = server.draw(server.completion_text, request)
+        prompt_tokens = sum(len(m.get("content", "").split()) for m in request.get("messages", []))
+        self.send_json(200, {
+            "id": f"mock-{server.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", ""),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content.split()),
+                      "total_tokens": prompt_tokens + len(content.split())}
+        })
+
+def start_mock_server(config=None, host="127.0.0.1", port=0):
+    """Start the mock server on a background thread; port 0 picks a free port."""
+    server = MockNimServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    server = MockNimServer(("127.0.0.1", 8000), MockNimConfig(error_rates={429: 0.02, 500: 0.01}))
+    print(f"Mock NIM endpoint listening on {server.base_url}")
+    server.serve_forever()
@@ -0,0 +1,216 @@
+import json
+import os
+import re
+import time
+import numpy as np
+from codestitleinstitutiondescriptionextractor import iter_json_array
+from prefixclassifier import load_index
+from prefixindex import INSTITUTIONS, MODULES_PATH, RAW_MODULES_PATH, SCHOOL_DATA_DIR, normalize_code
+
+# File paths: NUS semesters and NTU credits only appear in the plain exports under Raw/
+SOURCES = {
+    "NUS": RAW_MODULES_PATH.format(school="NUS"),
+    "NTU": RAW_MODULES_PATH.format(school="NTU"),
+    "SMU": MODULES_PATH.format(school="SMU")
+}
+ATTRIBUTES_PATH = os.path.join(SCHOOL_DATA_DIR, "module_attributes.npz")
+
+# NUS numbers special terms 3 and 4; semester s is bit s - 1 of the mask
+SEMESTERS = (1, 2, 3, 4)
+DIGITS = re.compile(r"\d+")
+CREDITS = re.compile(r"\s*\((\d+(?:\.\d+)?)\s*AU\)\s*$", re.IGNORECASE)
+
+def module_level(code):
+    """Level implied by the code's number: ABM5001 -> 5000, ACCT 101 -> 100.
+
+    0 when there is no level: no number, a leading 0, or fewer than three digits (the
+    NTU general electives such as AAA18C).
+    """
+    match = DIGITS.search(code)
+    digits = match.group(0) if match else ""
+    if len(digits) < 3 or digits[0] == "0":
+        return 0
+    return int(digits[0]) * 10 ** (len(digits) - 1)
+
+def semester_mask(semesters):
+    mask = 0
+    for semester in semesters or ():
+        if semester in SEMESTERS:
+            mask |= 1 << (semester - 1)
+    return mask
+
+def split_credits(title):
+    """(title without the "(3 AU)" suffix, credits or None)."""
+    match = CREDITS.search(title or "")
+    if not match:
+        return title, None
+    return title[:match.start()], float(match.group(1))
+
+def nus_record(module):
+    return module["moduleCode"], module["title"], semester_mask(module.get("semesters")), None
+
+def ntu_record(module):
+    title, credits = split_credits(module["Title"])
+    return module["scrollm20"], title, 0, credits
+
+def smu_record(module):
+    return module["modulecode"], module["title"], 0, None
+
+RECORDS = {"NUS": nus_record, "NTU": ntu_record, "SMU": smu_record}
+
+def words(mask):
+    """Pack a boolean array into little-endian uint64 words."""
+    padded = np.zeros(-(-mask.size // 64) * 64, dtype=bool)
+    padded[:mask.size] = mask
+    return np.packbits(padded, bitorder='little').view(np.uint64)
+
+class ModuleAttributes:
+    """Typed module columns with a packed bitset per attribute value.
+
+    One row per module code per institution. Columns are numpy arrays; every value of
+    institution, level, semester bit, credits and major has a bitset of the rows that
+    have it, so a query is an AND of a few word arrays.
+    """
+
+    def __init__(self, codes, titles, institution, level, semesters, credits, major, majors):
+        self.codes = list(codes)
+        self.titles = list(titles)
+        self.institution = np.asarray(institution, dtype=np.uint8)
+        self.level = np.asarray(level, dtype=np.int32)
+        self.semesters = np.asarray(semesters, dtype=np.uint8)
+        self.credits = np.asarray(credits, dtype=np.float32)
+        self.major = np.asarray(major, dtype=np.int32)
+        self.majors = list(majors)
+        self.bitsets = {}
+        for index, name in enumerate(INSTITUTIONS):
+            self.bitsets[("institution", name)] = words(self.institution == index)
+        for value in np.unique(self.level):
+            self.bitsets[("level", int(value))] = words(self.level == value)
+        for semester in SEMESTERS:
+            self.bitsets[("semester", semester)] = words((self.semesters & (1 << (semester - 1))) > 0)
+        for value in np.unique(self.credits[~np.isnan(self.credits)]):
+            self.bitsets[("credits", float(value))] = words(self.credits == value)
+        # The same major name at several institutions shares one bitset
+        by_name = {}
+        for index, name in enumerate(self.majors):
+            by_name.setdefault(name, []).append(index)
+        for name, indexes in by_name.items():
+            self.bitsets[("major", name)] = words(np.isin(self.major, indexes))
+        self.everything = words(np.ones(len(self.codes), dtype=bool))
+
+    @classmethod
+    def from_sources(cls, sources=SOURCES, index=None):
+        index = index or load_index()
+        codes, titles, institution, level, semesters, credits, major = [], [], [], [], [], [], []
+        majors = {}
+        for position, name in enumerate(INSTITUTIONS):
+            if not os.path.exists(sources.get(name, "")):
+                print(f"Skipping {name}: {sources.get(name)} not found")
+                continue
+            seen = set()
+            for module in iter_json_array(sources[name]):
+                code, title, mask, units = RECORDS[name](module)
+                code = normalize_code(code)
+                if code in seen:
+                    continue
+                seen.add(code)
+                resolved = index.resolve(name, code) if name in index.tries else None
+                codes.append(code)
+                titles.append(title)
+                institution.append(position)
+                level.append(module_level(code))
+                semesters.append(mask)
+                credits.append(np.nan if units is None else units)
+                major.append(-1 if resolved in (None, "Unknown") else majors.setdefault((name, resolved), len(majors)))
+        return cls(codes, titles, institution, level, semesters, credits, major, [m for _, m in majors])
+
+    def save(self, path=ATTRIBUTES_PATH):
+        """Write the columns as .npz (atomically); bitsets are rebuilt on load."""
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, codes=np.array(self.codes, dtype=str), titles=np.array(self.titles, dtype=str),
+                 institution=self.institution, level=self.level, semesters=self.semesters, credits=self.credits,
+                 major=self.major, majors=np.array(self.majors, dtype=str))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=ATTRIBUTES_PATH):
+        with np.load(path) as data:
+            return cls(data["codes"].tolist(), data["titles"].tolist(), data["institution"], data["level"],
+                       data["semesters"], data["credits"], data["major"], data["majors"].tolist())
+
+    def select(self, institution=None, level=None, semester=None, credits=None, major=None):
+        """Row indexes of the modules matching every given attribute."""
+        result = self.everything
+        for column, value in (("institution", institution), ("level", level), ("semester", semester),
+                              ("credits", credits), ("major", major)):
+            if value is None:
+                continue
+            bits = self.bitsets.get((column, float(value) if column == "credits" else value))
+            if bits is None:
+                return np.zeros(0, dtype=np.intp)
+            result = result & bits
+        return np.flatnonzero(np.unpackbits(result.view(np.uint8), bitorder='little')[:len(self.codes)])
+
+    def query(self, **attributes):
+        """Matching modules as (modulecode, title)."""
+        return [(self.codes[row], self.titles[row]) for row in self.select(**attributes)]
+
+def scan_modules(raw, index, institution=None, level=None, semester=None, credits=None, major=None):
+    """The string-scan equivalent of ModuleAttributes.select over loaded source records
+    ({institution: [records]}), parsing codes, titles and semesters on every query.
+    As in the index, a prefix mapped to "Unknown" gives a module no major."""
+    matches = []
+    for name, modules in raw.items():
+        if institution not in (None, name):
+            continue
+        seen = set()
+        for module in modules:
+            code, title, mask, units = RECORDS[name](module)
+            code = normalize_code(code)
+            if code in seen:
+                continue
+            seen.add(code)
+            if level is not None and module_level(code) != level:
+                continue
+            if semester is not None and not mask & (1 << (semester - 1)):
+                continue
+            if credits is not None and units != credits:
+                continue
+            if major is not None and (major == "Unknown" or name not in index.tries
+                                      or index.resolve(name, code) != major):
+                continue
+            matches.append(code)
+    return matches
+
+def report_queries(attributes, sources=SOURCES, index=None, repeats=20):
+    """Time a few attribute queries against the bitset index and a scan of the source files."""
+    index = index or load_index()
+    raw = {}
+    for name in INSTITUTIONS:
+        if os.path.exists(sources.get(name, "")):
+            with open(sources[name], 'r', encoding='utf-8') as f:
+                raw[name] = json.load(f)
+    queries = [
+        {"institution": "NUS", "level": 1000, "semester": 2, "major": "Computer Science"},
+        {"institution": "NTU", "credits": 4},
+        {"level": 3000, "semester": 1},
+        {"institution": "SMU", "major": "Economics", "level": 100}
+    ]
+    print(f"\n{'query':<70} {'hits':>5} {'bitset us':>10} {'scan ms':>8}")
+    for query in queries:
+        started = time.perf_counter()
+        for _ in range(repeats):
+            rows = attributes.select(**query)
+        bitset_time = (time.perf_counter() - started) / repeats
+        started = time.perf_counter()
+        scanned = scan_modules(raw, index, **query)
+        scan_time = time.perf_counter() - started
+        if sorted(attributes.codes[row] for row in rows) != sorted(scanned):
+            raise AssertionError(f"Bitset index and scan disagree on {query}")
+        print(f"{str(query):<70} {len(rows):>5} {bitset_time * 1e6:>10.1f} {scan_time * 1000:>8.1f}")
+
+if __name__ == "__main__":
+    attributes = ModuleAttributes.from_sources()
+    attributes.save()
+    print(f"Saved attributes of {len(attributes.codes)} modules to {ATTRIBUTES_PATH}")
+    report_queries(attributes)
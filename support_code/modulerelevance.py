@@ -0,0 +1,147 @@
+import json
+import os
+import time
+from collections import Counter
+import numpy as np
+from catalogue import load_catalogue
+from modulesearch import tokenize
+from prefixindex import INSTITUTIONS, SCHOOL_DATA_DIR, ModuleIndex, load_modules
+
+# File paths: modules come from prefixindex.load_modules, so NUS majors are matched
+# against the titles in its plain export
+MAJORS_PATH = os.path.join(SCHOOL_DATA_DIR, "Standardized-weights", "standardized_{school}_majors.json")
+RELEVANCE_PATH = os.path.join(SCHOOL_DATA_DIR, "module_relevance.json")
+
+# Modules kept per major, and whether a major only draws on its own institution's modules
+TOP_K = 50
+SAME_INSTITUTION = True
+# Rows of the module matrix densified at a time during the product
+BLOCK_ROWS = 1024
+
+class CsrMatrix:
+    """Compressed sparse rows over numpy arrays (scipy is not a dependency here)."""
+
+    def __init__(self, indptr, indices, data, columns):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (len(indptr) - 1, columns)
+
+    @classmethod
+    def from_rows(cls, rows, columns):
+        """rows is a list of {column: value} dicts."""
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = np.fromiter((column for row in rows for column in row), dtype=np.int64, count=indptr[-1])
+        data = np.fromiter((value for row in rows for value in row.values()), dtype=np.float32, count=indptr[-1])
+        return cls(indptr, indices, data, columns)
+
+    def dense_rows(self, start, stop):
+        block = np.zeros((stop - start, self.shape[1]), dtype=self.data.dtype)
+        low, high = self.indptr[start], self.indptr[stop]
+        rows = np.repeat(np.arange(stop - start), np.diff(self.indptr[start:stop + 1]))
+        block[rows, self.indices[low:high]] = self.data[low:high]
+        return block
+
+    def dot_dense(self, dense, block_rows=BLOCK_ROWS):
+        """self @ dense, densifying BLOCK_ROWS rows at a time so memory stays bounded."""
+        result = np.empty((self.shape[0], dense.shape[1]), dtype=np.float32)
+        for start in range(0, self.shape[0], block_rows):
+            stop = min(start + block_rows, self.shape[0])
+            result[start:stop] = self.dense_rows(start, stop) @ dense
+        return result
+
+    def to_dense(self):
+        return self.dense_rows(0, self.shape[0])
+
+def count_matrix(documents, vocabulary):
+    """Term counts of token lists as a CsrMatrix over the vocabulary."""
+    return CsrMatrix.from_rows([{vocabulary[t]: c for t, c in Counter(tokens).items() if t in vocabulary}
+                                for tokens in documents], len(vocabulary))
+
+def apply_tfidf(matrix, idf):
+    """Turn counts into L2-normalised sublinear TF-IDF weights, in place."""
+    matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    norms = np.sqrt(np.bincount(rows, weights=matrix.data.astype(np.float64) ** 2, minlength=matrix.shape[0]))
+    matrix.data = (matrix.data / np.where(norms > 0, norms, 1)[rows]).astype(np.float32)
+    return matrix
+
+def idf_weights(documents):
+    """Vocabulary {term: column} and smoothed IDF weights over token lists."""
+    document_frequency = Counter()
+    for tokens in documents:
+        document_frequency.update(set(tokens))
+    vocabulary = {term: column for column, term in enumerate(sorted(document_frequency))}
+    frequencies = np.fromiter((document_frequency[term] for term in vocabulary), dtype=np.float64, count=len(vocabulary))
+    return vocabulary, (np.log((1 + len(documents)) / (1 + frequencies)) + 1).astype(np.float32)
+
+def module_tokens(modules):
+    return [tokenize(f"{m.get('title', '')} {m.get('description') or ''}") for m in modules]
+
+def major_text(program):
+    return " ".join([program.major] + [criterion.description for criterion in program.suitability])
+
+def build_relevance(modules, programs, top_k=TOP_K, same_institution=SAME_INSTITUTION):
+    """Top-k modules per major by cosine similarity of TF-IDF vectors.
+
+    Both sides share one vocabulary and IDF. Majors are few, so they are held dense
+    and the product is modules (sparse) x majors.T in one pass. Returns the top module
+    indexes and scores, one row per program.
+    """
+    modules_tokens = module_tokens(modules)
+    major_tokens = [tokenize(major_text(program)) for program in programs]
+    vocabulary, idf = idf_weights(modules_tokens + major_tokens)
+
+    module_matrix = apply_tfidf(count_matrix(modules_tokens, vocabulary), idf)
+    major_matrix = apply_tfidf(count_matrix(major_tokens, vocabulary), idf)
+    similarity = module_matrix.dot_dense(major_matrix.to_dense().T).T
+
+    if same_institution:
+        module_institutions = np.array([m["institution"] for m in modules])
+        for row, program in enumerate(programs):
+            similarity[row, module_institutions != program.institution] = -1
+    k = min(top_k, similarity.shape[1])
+    best = np.argpartition(-similarity, k - 1, axis=1)[:, :k] if k else np.zeros((len(programs), 0), dtype=np.intp)
+    order = np.argsort(-np.take_along_axis(similarity, best, axis=1), axis=1)
+    best = np.take_along_axis(best, order, axis=1)
+    return best, np.take_along_axis(similarity, best, axis=1)
+
+def write_relevance(path, modules, programs, best, scores):
+    """One entry per major with its [modulecode, score] list; modules scoring 0 are left out."""
+    majors = []
+    for program, rows, row_scores in zip(programs, best, scores):
+        majors.append({
+            "institution": program.institution,
+            "major": program.major,
+            "degree": program.degree,
+            "modules": [[modules[i]["modulecode"], round(float(s), 4)] for i, s in zip(rows, row_scores) if s > 0]
+        })
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"top_k": int(best.shape[1]), "majors": majors}, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def unmapped_share(modules, best, scores):
+    """Share of recommended modules whose prefix mappings.json does not resolve to a major."""
+    index = ModuleIndex.from_mappings()
+    recommended = {int(i) for rows, row_scores in zip(best, scores) for i, s in zip(rows, row_scores) if s > 0}
+    unmapped = sum(1 for i in recommended if index.resolve(modules[i]["institution"], modules[i]["modulecode"]) in (None, "Unknown"))
+    return unmapped, len(recommended)
+
+def build(path=RELEVANCE_PATH, top_k=TOP_K):
+    started = time.perf_counter()
+    modules = load_modules()
+    programs = load_catalogue({name: MAJORS_PATH.format(school=name.lower()) for name in INSTITUTIONS})
+    loaded = time.perf_counter()
+    best, scores = build_relevance(modules, programs, top_k)
+    computed = time.perf_counter()
+    write_relevance(path, modules, programs, best, scores)
+    unmapped, recommended = unmapped_share(modules, best, scores)
+    print(f"Top {best.shape[1]} modules for {len(programs)} majors from {len(modules)} modules -> {path}")
+    print(f"  load {loaded - started:.2f} s, vectorize + product {computed - loaded:.2f} s")
+    print(f"  {unmapped} of {recommended} recommended modules have no prefix mapping or map to Unknown")
+    return best, scores
+
+if __name__ == "__main__":
+    build()
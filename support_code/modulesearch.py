@@ -0,0 +1,347 @@
+import json
+import math
+import os
+import re
+import struct
+import time
+from collections import Counter, OrderedDict
+import numpy as np
+from codestitleinstitutiondescriptionextractor import iter_json_array, module_key
+from prefixindex import INSTITUTIONS, MODULES_PATH, SCHOOL_DATA_DIR
+
+# File paths: one index shard per institution is written to INDEX_DIR
+INDEX_DIR = os.path.join(SCHOOL_DATA_DIR, "module_index")
+SHARD_NAME = "{school}.bm25"
+
+# BM25 parameters; title terms count TITLE_WEIGHT times towards term frequency
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3
+# Decoded posting lists kept in memory per shard
+POSTINGS_CACHE_SIZE = 512
+
+SHARD_MAGIC = b"BM25IDX2"
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the their this to was were will
+with you your students student course module modules also such these which how can through they who
+""".split())
+
+def tokenize(text):
+    return [token for token in TOKEN.findall((text or "").lower()) if token not in STOPWORDS and len(token) > 1]
+
+def encode_varints(values, out):
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+def varint_lengths(values):
+    lengths = np.ones(values.size, dtype=np.int64)
+    for shift in range(7, 63, 7):
+        lengths += values >= (1 << shift)
+    return lengths
+
+def encode_varint_array(values, lengths=None):
+    """Encode a non-negative int64 array as LEB128 varints with numpy; returns bytes."""
+    values = np.asarray(values, dtype=np.int64)
+    lengths = varint_lengths(values) if lengths is None else lengths
+    starts = np.cumsum(lengths) - lengths
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for byte in range(int(lengths.max()) if values.size else 0):
+        selected = lengths > byte
+        continuation = np.where(lengths[selected] > byte + 1, 0x80, 0)
+        out[starts[selected] + byte] = ((values[selected] >> (7 * byte)) & 0x7F) | continuation
+    return out.tobytes()
+
+def decode_varints(data):
+    """Decode a run of LEB128 varints with numpy; returns an int64 array."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if raw.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = (raw & 0x80) == 0
+    group = np.concatenate(([0], np.cumsum(ends)[:-1]))
+    starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    shift = 7 * (np.arange(raw.size) - starts[group])
+    # Summed in int64: bincount weights are float64 and would round values above 2**53
+    return np.add.reduceat((raw & 0x7F).astype(np.int64) << shift, starts)
+
+def document_counts(module):
+    counts = Counter(tokenize(module.get("description")))
+    for token in tokenize(module.get("title")):
+        counts[token] += TITLE_WEIGHT
+    return counts
+
+def encode_postings(postings, blob):
+    """Append (doc id delta, term frequency) varint pairs for sorted (doc id, count) postings."""
+    previous = 0
+    pairs = []
+    for doc_id, count in postings:
+        pairs.extend((doc_id - previous, count))
+        previous = doc_id
+    encode_varints(pairs, blob)
+
+def build_shard(modules):
+    """Build one institution's shard from {"modulecode", "title", "description"} records.
+
+    Postings are (doc id delta, term frequency) varint pairs, one contiguous run per
+    term, in doc id order. Modules repeated verbatim (the SMU file lists some once per
+    offering) are indexed once.
+    """
+    documents = []
+    keys = []
+    postings = {}
+    lengths = []
+    seen = set()
+    for module in modules:
+        key = module_key(module)
+        if key in seen:
+            continue
+        seen.add(key)
+        doc_id = len(documents)
+        counts = document_counts(module)
+        for token, count in counts.items():
+            postings.setdefault(token, []).append((doc_id, count))
+        lengths.append(sum(counts.values()))
+        documents.append([module["modulecode"], module.get("title", "")])
+        keys.append(key.hex())
+
+    blob = bytearray()
+    terms = {}
+    for term in sorted(postings):
+        start = len(blob)
+        encode_postings(postings[term], blob)
+        terms[term] = [len(postings[term]), start, len(blob) - start]
+    return {"documents": documents, "keys": keys, "lengths": lengths, "terms": terms}, bytes(blob)
+
+def update_shard(header, blob, removed, added):
+    """Apply a catalogue diff to a built shard without re-indexing unchanged modules.
+
+    removed is a list of (module key, module) for modules that are gone, added a list
+    of new modules. Removed documents become tombstones (a None document) so other doc
+    ids stay put; added ones get new doc ids at the end. Only the posting lists of terms
+    the removed and added modules use are decoded and re-encoded, all of them in one
+    batch; the rest of the postings are copied as they are. build_shard compacts the
+    tombstones away.
+    """
+    documents, keys, lengths = list(header["documents"]), list(header["keys"]), list(header["lengths"])
+    doc_ids = {key: doc_id for doc_id, key in enumerate(keys) if key is not None}
+    dropped = []
+    inserted = []
+    for key, module in removed:
+        doc_id = doc_ids.pop(key.hex(), None)
+        if doc_id is None:
+            continue
+        dropped.extend((term, doc_id) for term in document_counts(module))
+        documents[doc_id], keys[doc_id], lengths[doc_id] = None, None, 0
+    for module in added:
+        key = module_key(module).hex()
+        if key in doc_ids:
+            continue
+        doc_id = doc_ids[key] = len(documents)
+        counts = document_counts(module)
+        inserted.extend((term, doc_id, count) for term, count in counts.items())
+        documents.append([module["modulecode"], module.get("title", "")])
+        keys.append(key)
+        lengths.append(sum(counts.values()))
+
+    # Decode every touched posting list at once: term_of says which touched term each
+    # posting belongs to, and doc ids are a cumulative sum restarted at each list
+    touched = sorted({term for term, _ in dropped} | {term for term, _, _ in inserted})
+    touched_index = {term: i for i, term in enumerate(touched)}
+    existing = [term for term in touched if term in header["terms"]]
+    sizes = np.array([header["terms"][term][0] for term in existing], dtype=np.int64)
+    values = decode_varints(b"".join(blob[start:start + size] for _, start, size in
+                                     (header["terms"][term] for term in existing)))
+    term_of = np.repeat(np.array([touched_index[term] for term in existing], dtype=np.int64), sizes)
+    running = np.cumsum(values[0::2])
+    first = np.cumsum(sizes) - sizes
+    posting_ids = running - np.repeat(running[first] - values[0::2][first], sizes) if sizes.size else running
+    frequencies = values[1::2]
+
+    stride = len(documents) + 1
+    if dropped:
+        gone = np.array([touched_index[term] * stride + doc_id for term, doc_id in dropped], dtype=np.int64)
+        keep = ~np.isin(term_of * stride + posting_ids, gone)
+        term_of, posting_ids, frequencies = term_of[keep], posting_ids[keep], frequencies[keep]
+    if inserted:
+        term_of = np.concatenate((term_of, [touched_index[term] for term, _, _ in inserted]))
+        posting_ids = np.concatenate((posting_ids, [doc_id for _, doc_id, _ in inserted]))
+        frequencies = np.concatenate((frequencies, [count for _, _, count in inserted]))
+    order = np.lexsort((posting_ids, term_of))
+    term_of, posting_ids, frequencies = term_of[order], posting_ids[order], frequencies[order]
+
+    previous = np.concatenate(([0], posting_ids[:-1]))
+    previous[np.concatenate(([True], term_of[1:] != term_of[:-1]))[:previous.size]] = 0
+    pairs = np.empty(2 * posting_ids.size, dtype=np.int64)
+    pairs[0::2] = posting_ids - previous
+    pairs[1::2] = frequencies
+    pair_lengths = varint_lengths(pairs)
+    touched_blob = encode_varint_array(pairs, pair_lengths)
+    touched_counts = np.bincount(term_of, minlength=len(touched))
+    touched_sizes = np.bincount(np.repeat(term_of, 2), weights=pair_lengths, minlength=len(touched)).astype(np.int64)
+    touched_starts = np.cumsum(touched_sizes) - touched_sizes
+
+    new_blob = bytearray()
+    terms = {}
+    for term in sorted(set(header["terms"]) | set(touched)):
+        start = len(new_blob)
+        if term in touched_index:
+            i = touched_index[term]
+            if not touched_counts[i]:
+                continue
+            new_blob += touched_blob[touched_starts[i]:touched_starts[i] + touched_sizes[i]]
+            terms[term] = [int(touched_counts[i]), start, int(touched_sizes[i])]
+        else:
+            count, old_start, size = header["terms"][term]
+            new_blob += blob[old_start:old_start + size]
+            terms[term] = [count, start, size]
+    return {"documents": documents, "keys": keys, "lengths": lengths, "terms": terms}, bytes(new_blob)
+
+def write_shard(path, header, blob):
+    """Shard layout: magic, header length, JSON header (terms, documents, keys, lengths), postings."""
+    payload = json.dumps(header, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(SHARD_MAGIC)
+        f.write(struct.pack("<Q", len(payload)))
+        f.write(payload)
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+def read_shard(path):
+    with open(path, 'rb') as f:
+        if f.read(len(SHARD_MAGIC)) != SHARD_MAGIC:
+            raise ValueError(f"{path} is not a module index shard (or was built by an older version)")
+        (size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(size).decode('utf-8'))
+        return header, f.read()
+
+class Shard:
+    """One institution's BM25 index, loaded for querying."""
+
+    def __init__(self, institution, header, blob):
+        self.institution = institution
+        self.documents = header["documents"]
+        self.terms = header["terms"]
+        self.blob = blob
+        self.lengths = np.asarray(header["lengths"], dtype=np.float64)
+        # Documents removed by update_shard are None and are left out of the statistics
+        live = np.array([document is not None for document in self.documents], dtype=bool)
+        self.count = int(live.sum())
+        self.average_length = float(self.lengths[live].mean()) if self.count else 0.0
+        # Per-document part of the BM25 denominator, computed once
+        self.length_norm = K1 * (1 - B + B * self.lengths / self.average_length) if self.count else self.lengths
+        self.cache = OrderedDict()
+
+    @classmethod
+    def load(cls, institution, path):
+        return cls(institution, *read_shard(path))
+
+    def postings(self, term):
+        """(doc ids, term frequencies) for a term, decoded on first use."""
+        if term in self.cache:
+            self.cache.move_to_end(term)
+            return self.cache[term]
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        _, start, size = entry
+        values = decode_varints(self.blob[start:start + size])
+        decoded = (np.cumsum(values[0::2]), values[1::2].astype(np.float64))
+        self.cache[term] = decoded
+        if len(self.cache) > POSTINGS_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return decoded
+
+    def scores(self, tokens):
+        scores = np.zeros(len(self.documents))
+        count = self.count
+        for token, query_count in Counter(tokens).items():
+            posting = self.postings(token)
+            if posting is None:
+                continue
+            doc_ids, frequencies = posting
+            idf = math.log(1 + (count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            scores[doc_ids] += query_count * idf * frequencies * (K1 + 1) / (frequencies + self.length_norm[doc_ids])
+        return scores
+
+class ModuleSearch:
+    """BM25 search over module titles and descriptions, one shard per institution."""
+
+    def __init__(self, shards):
+        self.shards = shards
+
+    @classmethod
+    def load(cls, index_dir=INDEX_DIR, institutions=INSTITUTIONS):
+        shards = {}
+        for institution in institutions:
+            path = os.path.join(index_dir, SHARD_NAME.format(school=institution))
+            if os.path.exists(path):
+                shards[institution] = Shard.load(institution, path)
+        return cls(shards)
+
+    def search(self, query, k=10, institutions=None):
+        """Best k modules for a free-text query as (score, institution, modulecode, title)."""
+        tokens = tokenize(query)
+        results = []
+        for institution, shard in self.shards.items():
+            if institutions and institution not in institutions:
+                continue
+            scores = shard.scores(tokens)
+            if not scores.size:
+                continue
+            top = min(k, scores.size)
+            best = np.argpartition(-scores, top - 1)[:top]
+            results.extend((float(scores[i]), institution, *shard.documents[i]) for i in best if scores[i] > 0)
+        results.sort(key=lambda result: -result[0])
+        return results[:k]
+
+def build_index(institutions=INSTITUTIONS, index_dir=INDEX_DIR):
+    """Build and write a shard for every institution that has a module file."""
+    os.makedirs(index_dir, exist_ok=True)
+    built = {}
+    for institution in institutions:
+        modules_path = MODULES_PATH.format(school=institution)
+        if not os.path.exists(modules_path):
+            print(f"Skipping {institution}: {modules_path} not found")
+            continue
+        header, blob = build_shard(iter_json_array(modules_path))
+        shard_path = os.path.join(index_dir, SHARD_NAME.format(school=institution))
+        write_shard(shard_path, header, blob)
+        built[institution] = shard_path
+        print(f"{institution}: indexed {len(header['documents'])} modules, {len(header['terms'])} terms, "
+              f"{len(blob) / 1024:.0f} KB of postings -> {shard_path}")
+    return built
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+def report_latency(search, queries, k=10, repeats=3):
+    """Print p50/p99 query latency, first with empty postings caches and then warm."""
+    for shard in search.shards.values():
+        shard.cache.clear()
+    results = {}
+    for name, passes in (("cold", 1), ("warm", repeats)):
+        timings = []
+        for _ in range(passes):
+            for query in queries:
+                started = time.perf_counter()
+                search.search(query, k)
+                timings.append(time.perf_counter() - started)
+        results[name] = percentiles(timings)
+    print(f"\n{len(queries)} queries over {', '.join(search.shards)}")
+    for name, (p50, p99) in results.items():
+        print(f"  {name}: p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms")
+    return results
+
+if __name__ == "__main__":
+    build_index()
+    search = ModuleSearch.load()
+    from catalogue import load_catalogue
+    standardized_dir = os.path.join(SCHOOL_DATA_DIR, "Standardized-weights")
+    majors = load_catalogue({name: os.path.join(standardized_dir, f"standardized_{name.lower()}_majors.json")
+                             for name in INSTITUTIONS})
+    report_latency(search, sorted({program.major for program in majors}))
@@ -0,0 +1,123 @@
+import random
+import re
+import zlib
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+MAX_HASH = (1 << 32) - 1
+# Signatures of recently checked questions, so adding an accepted one does not hash it again
+SIGNATURE_CACHE_SIZE = 1024
+
+def shingles(text, size=2):
+    """Word n-grams of a lower-cased question, used as the set for Jaccard similarity."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def estimated_jaccard(signature_a, signature_b):
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
+
+class MinHasher:
+    """MinHash signatures from a fixed, seeded family of hash functions.
+
+    Each permutation is (a * h + b) mod 2**32 with odd a, applied to the CRC32 of
+    every shingle, which keeps signatures stable across processes and runs.
+    """
+
+    def __init__(self, num_perm=64, shingle_size=2, seed=1):
+        rng = random.Random(seed)
+        self.shingle_size = shingle_size
+        self.params = [(rng.randrange(1, MAX_HASH + 1) | 1, rng.randrange(0, MAX_HASH + 1)) for _ in range(num_perm)]
+
+    def signature(self, text):
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles(text, self.shingle_size)]
+        if not hashes:
+            return None
+        return tuple(min([(a * h + b) & MAX_HASH for h in hashes]) for a, b in self.params)
+
+class LSHIndex:
+    """Banded locality-sensitive hashing index over MinHash signatures.
+
+    A lookup only compares against signatures that share at least one band bucket,
+    so its cost depends on the number of near neighbours rather than the bank size.
+    """
+
+    def __init__(self, bands=16, rows=4):
+        self.bands = bands
+        self.rows = rows
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+        self.signatures = []
+
+    def band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def candidates(self, signature):
+        found = set()
+        for band, key in self.band_keys(signature):
+            found.update(self.buckets[band].get(key, ()))
+        return found
+
+    def add(self, signature):
+        item_id = len(self.signatures)
+        self.signatures.append(signature)
+        for band, key in self.band_keys(signature):
+            self.buckets[band][key].append(item_id)
+        return item_id
+
+class NearDuplicateFilter:
+    """Streaming near-duplicate detector with one LSH index per (major, criterion) cell.
+
+    With 16 bands of 4 rows, a pair at Jaccard s shares a band with probability
+    1 - (1 - s**4)**16: 0.9998 at the default 0.8 threshold (8 bands of 8 rows would only
+    reach 0.77). Candidates are then confirmed against the estimated similarity of their
+    full signatures. Checking and adding are separate so that only questions that are
+    actually accepted shadow later candidates.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=2):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.signature = lru_cache(maxsize=SIGNATURE_CACHE_SIZE)(self.hasher.signature)
+        self.indexes = {}
+        self.checked = Counter()
+        self.rejected = Counter()
+
+    def index_for(self, cell):
+        if cell not in self.indexes:
+            self.indexes[cell] = LSHIndex(self.bands, self.rows)
+        return self.indexes[cell]
+
+    def add(self, cell, text):
+        signature = self.signature(text)
+        if signature is not None:
+            self.index_for(cell).add(signature)
+
+    def is_duplicate(self, cell, text):
+        """Return True if text is a near duplicate of a question already added to the cell."""
+        self.checked[cell] += 1
+        signature = self.signature(text)
+        if signature is None:
+            return False
+        index = self.index_for(cell)
+        for candidate in index.candidates(signature):
+            if estimated_jaccard(signature, index.signatures[candidate]) >= self.threshold:
+                self.rejected[cell] += 1
+                return True
+        return False
+
+    def report(self):
+        total_checked = sum(self.checked.values())
+        total_rejected = sum(self.rejected.values())
+        print(f"Near-duplicate filter rejected {total_rejected} of {total_checked} candidates "
+              f"(threshold {self.threshold})")
+        for cell, count in self.rejected.most_common(10):
+            print(f"  {' / '.join(cell)}: {count} rejected of {self.checked[cell]}")
+        return {"checked": total_checked, "rejected": total_rejected}
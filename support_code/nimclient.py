@@ -0,0 +1,310 @@
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+import openai
+
+class NimRequestError(Exception):
+    """Raised when a NIM request still fails after all retries."""
+
+def error_status(error):
+    """HTTP status of an OpenAI client error, or None for connection errors and timeouts."""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status
+
+def is_connection_error(error):
+    # APITimeoutError is a subclass of APIConnectionError
+    return isinstance(error, (openai.APIConnectionError, ConnectionError, TimeoutError))
+
+def is_retryable(error):
+    status = error_status(error)
+    if status is None:
+        return is_connection_error(error)
+    return status == 429 or status == 408 or status >= 500
+
+def retry_after_seconds(error):
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by blocking and asyncio callers."""
+
+    def __init__(self, rate_per_second, capacity):
+        self.rate = rate_per_second
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+class CircuitBreaker:
+    """Stops sending requests after repeated failures, then lets one probe through.
+
+    closed -> open after failure_threshold consecutive failures; open -> half-open once
+    reset_timeout has passed; a successful probe closes the circuit, a failed one
+    reopens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def wait_time(self):
+        """Seconds until this caller may send a request (0 if it may go now)."""
+        with self.lock:
+            if self.opened_at is None:
+                return 0.0
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                return remaining
+            if self.probing:
+                return min(1.0, self.reset_timeout)
+            self.probing = True
+            return 0.0
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                opened = self.opened_at is None or self.probing
+                self.opened_at = time.monotonic()
+                self.probing = False
+                return opened
+            return False
+
+class AIMDLimiter:
+    """Concurrency limit adjusted by additive increase / multiplicative decrease.
+
+    Each fast success raises the limit by 1/limit (about +1 per round trip of the
+    whole window); a throttle, server error or call slower than latency_target halves
+    it, at most once per cooldown so a burst of failures counts as one signal.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=None, latency_target=15.0, cooldown=5.0):
+        self.maximum = maximum or initial
+        self.minimum = minimum
+        self.limit = float(min(max(initial, minimum), self.maximum))
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.last_decrease = 0.0
+        self.in_flight = 0
+        self.condition = None
+        self.loop = None
+
+    def set_maximum(self, maximum):
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.limit, self.maximum)
+
+    def on_success(self, latency):
+        if latency > self.latency_target:
+            self.on_congestion()
+        else:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_congestion(self):
+        now = time.monotonic()
+        if now - self.last_decrease >= self.cooldown:
+            self.limit = max(self.minimum, self.limit / 2)
+            self.last_decrease = now
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # A new asyncio.run() needs a condition bound to its own loop
+            self.condition = asyncio.Condition()
+            self.loop = loop
+            self.in_flight = 0
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+class ResilientClient:
+    """Wraps the OpenAI clients used for NIM calls with rate limiting and retries.
+
+    Every request waits for a token-bucket slot and for the circuit breaker, and
+    asyncio requests also for an AIMD concurrency slot. Throttles (429), server
+    errors and connection failures are retried with exponential backoff and full
+    jitter, honouring Retry-After when the endpoint sends it. Client errors such as
+    400 are raised straight away. Throttle events are counted in `metrics`, and
+    retry_observer, if set, is called with the model of every retried attempt.
+    latency_observer, if set, is called with (model, seconds, outcome) for every
+    attempt, timing only the HTTP call and not the rate-limit, breaker or backoff waits.
+    """
+
+    def __init__(self, client, async_client, rate_per_second=1.0, burst=5, max_retries=6,
+                 base_delay=1.0, max_delay=60.0, breaker=None, limiter=None):
+        self.client = client
+        self.async_client = async_client
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter
+        self.metrics = Counter()
+        self.retry_observer = None
+        self.latency_observer = None
+
+    def backoff_delay(self, attempt, error):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        hinted = retry_after_seconds(error)
+        if hinted is not None:
+            delay = max(delay, min(hinted, self.max_delay))
+        return delay
+
+    def record_error(self, error):
+        status = error_status(error)
+        if status == 429:
+            self.metrics['throttled'] += 1
+        elif status is not None and status >= 500:
+            self.metrics['server_errors'] += 1
+        elif is_connection_error(error):
+            self.metrics['connection_errors'] += 1
+        else:
+            self.metrics['other_errors'] += 1
+        if is_retryable(error):
+            if self.breaker.record_failure():
+                self.metrics['circuit_opened'] += 1
+                print(f"Circuit breaker opened after repeated NIM failures; pausing {self.breaker.reset_timeout:.0f}s")
+            if self.limiter is not None and (status is None or status == 429 or status >= 500):
+                self.limiter.on_congestion()
+
+    def wait_for_breaker(self):
+        wait = self.breaker.wait_time()
+        if wait > 0:
+            self.metrics['circuit_wait_seconds'] += wait
+        return wait
+
+    def wait_for_token(self):
+        wait = self.bucket.reserve()
+        if wait > 0:
+            self.metrics['rate_limit_wait_seconds'] += wait
+        return wait
+
+    def observe_latency(self, model, latency, outcome):
+        if self.latency_observer is not None:
+            self.latency_observer(model, latency, outcome)
+
+    def handle_failure(self, attempt, error, model=None, latency=None):
+        """Record a failed attempt and return the backoff delay, or raise if it should not be retried."""
+        if latency is not None:
+            self.observe_latency(model, latency, "error")
+        self.record_error(error)
+        if not is_retryable(error):
+            # The endpoint answered, so it is reachable even though the request was rejected
+            self.breaker.record_success()
+            raise error
+        if attempt >= self.max_retries:
+            return 0.0
+        delay = self.backoff_delay(attempt, error)
+        self.metrics['retries'] += 1
+        self.metrics['backoff_seconds'] += delay
+        if self.retry_observer is not None:
+            self.retry_observer(model)
+        return delay
+
+    def handle_success(self, latency, model=None):
+        self.observe_latency(model, latency, "ok")
+        self.breaker.record_success()
+        if self.limiter is not None:
+            self.limiter.on_success(latency)
+
+    def create(self, **request):
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            while True:
+                wait = self.wait_for_breaker()
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+            time.sleep(self.wait_for_token())
+            self.metrics['requests'] += 1
+            started = time.monotonic()
+            try:
+                completion = self.client.chat.completions.create(**request)
+            except Exception as e:
+                last_error = e
+                time.sleep(self.handle_failure(attempt, e, request.get('model'), time.monotonic() - started))
+                continue
+            self.handle_success(time.monotonic() - started, request.get('model'))
+            return completion
+        raise NimRequestError(f"NIM request failed after {self.max_retries + 1} attempts: {last_error}") from last_error
+
+    async def acreate(self, **request):
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            while True:
+                wait = self.wait_for_breaker()
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            await asyncio.sleep(self.wait_for_token())
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            self.metrics['requests'] += 1
+            started = time.monotonic()
+            error = None
+            try:
+                completion = await self.async_client.chat.completions.create(**request)
+            except Exception as e:
+                error = e
+            finally:
+                # Time the request itself, not the wait for the concurrency condition on release
+                latency = time.monotonic() - started
+                if self.limiter is not None:
+                    await self.limiter.release()
+            if error is None:
+                self.handle_success(latency, request.get('model'))
+                return completion
+            last_error = error
+            # Back off after releasing the concurrency slot so other calls can proceed
+            await asyncio.sleep(self.handle_failure(attempt, error, request.get('model'), latency))
+        raise NimRequestError(f"NIM request failed after {self.max_retries + 1} attempts: {last_error}") from last_error
+
+    def report(self):
+        m = self.metrics
+        limit = f", concurrency limit {self.limiter.limit:.1f}" if self.limiter is not None else ""
+        print(f"NIM client: {m['requests']} requests, {m['retries']} retries, {m['throttled']} throttled (429), "
+              f"{m['server_errors']} server errors, {m['connection_errors']} connection errors, "
+              f"{m['circuit_opened']} circuit opens, {m['backoff_seconds']:.1f}s backoff, "
+              f"{m['rate_limit_wait_seconds']:.1f}s rate-limit wait{limit}")
+        return dict(m)
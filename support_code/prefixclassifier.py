@@ -0,0 +1,202 @@
+import json
+import os
+import re
+import time
+from collections import Counter
+import numpy as np
+from modulerelevance import apply_tfidf, count_matrix, idf_weights, module_tokens
+from prefixindex import INSTITUTIONS, MAPPINGS_PATH, SCHOOL_DATA_DIR, ModuleIndex, load_modules, normalize_code
+
+# File paths
+OVERLAY_PATH = os.path.join(SCHOOL_DATA_DIR, "mappings_overlay.json")
+OVERLAY_VERSION = 1
+
+# A suggestion is applied on top of mappings.json only if at least this share of the
+# prefix's modules individually pick the suggested major
+MIN_CONFIDENCE = 0.6
+# Mapped prefixes are split into this many folds for the held-out accuracy report
+FOLDS = 5
+
+LETTERS = re.compile(r"[A-Z]+")
+
+def prefix_groups(modules, index):
+    """(institution, prefix) and mapped major (None if unmapped or Unknown) for every module.
+
+    Mapped modules are grouped by the prefix that resolved them. Unknown ones keep the
+    Unknown prefix, and unmapped ones fall back to the letters before the first digit.
+    """
+    groups = []
+    for module in modules:
+        code = normalize_code(module["modulecode"])
+        prefix, major = index.tries[module["institution"]].longest_match(code)
+        if prefix is None:
+            match = LETTERS.match(code)
+            prefix = match.group(0) if match else code
+        groups.append(((module["institution"], prefix), None if major in (None, "Unknown") else major))
+    return groups
+
+def module_matrix(modules):
+    tokens = module_tokens(modules)
+    vocabulary, idf = idf_weights(tokens)
+    return apply_tfidf(count_matrix(tokens, vocabulary), idf)
+
+def centroids(matrix, labels, classes):
+    """L2-normalised mean TF-IDF vector per class; rows labelled -1 are ignored."""
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    keep = labels[rows] >= 0
+    result = np.zeros((classes, matrix.shape[1]), dtype=np.float32)
+    np.add.at(result, (labels[rows[keep]], matrix.indices[keep]), matrix.data[keep])
+    norms = np.linalg.norm(result, axis=1, keepdims=True)
+    return result / np.where(norms > 0, norms, 1)
+
+def classify_groups(similarity, group_of, group_count):
+    """Aggregate per-module similarities into one (class, confidence, mean similarity) per group.
+
+    Each module votes for its nearest class; a group takes the class with the highest
+    mean similarity and its confidence is the share of its modules voting for it.
+    """
+    sizes = np.bincount(group_of, minlength=group_count)
+    totals = np.zeros((group_count, similarity.shape[1]), dtype=np.float64)
+    np.add.at(totals, group_of, similarity)
+    votes = np.zeros_like(totals)
+    np.add.at(votes, (group_of, similarity.argmax(axis=1)), 1)
+    chosen = totals.argmax(axis=1)
+    picked = np.arange(group_count)
+    safe = np.maximum(sizes, 1)
+    return chosen, votes[picked, chosen] / safe, totals[picked, chosen] / safe
+
+class PrefixClassifier:
+    """Nearest-centroid classifier from module text to an institution's majors."""
+
+    def __init__(self, modules, groups):
+        self.modules = modules
+        self.group_keys = list(dict.fromkeys(key for key, _ in groups))
+        group_index = {key: i for i, key in enumerate(self.group_keys)}
+        self.group_of = np.array([group_index[key] for key, _ in groups], dtype=np.intp)
+        self.classes = sorted({(key[0], major) for key, major in groups if major is not None})
+        class_index = {label: i for i, label in enumerate(self.classes)}
+        self.labels = np.array([class_index[(key[0], major)] if major is not None else -1 for key, major in groups],
+                               dtype=np.intp)
+        self.matrix = module_matrix(modules)
+        # Majors from other institutions are never candidates; an institution with no
+        # mapped majors gets no suggestions at all
+        module_institutions = np.array([key[0] for key, _ in groups])
+        class_institutions = np.array([institution for institution, _ in self.classes])
+        self.other_institution = module_institutions[:, None] != class_institutions[None, :]
+        self.institutions_with_classes = {institution for institution, _ in self.classes}
+
+    @classmethod
+    def from_catalogue(cls, institutions=INSTITUTIONS, index=None):
+        modules = load_modules(institutions)
+        return cls(modules, prefix_groups(modules, index or ModuleIndex.from_mappings()))
+
+    def similarity(self, labels):
+        """Cosine similarity of every module to every class centroid built from `labels`."""
+        similarity = self.matrix.dot_dense(centroids(self.matrix, labels, len(self.classes)).T)
+        similarity[self.other_institution] = -1
+        return similarity
+
+    def suggest(self):
+        """Suggestions for every prefix whose modules are unmapped or Unknown.
+
+        Returns {institution: {prefix: {"major", "confidence", "similarity", "modules"}}};
+        prefixes of an institution without any mapped major are left out.
+        """
+        chosen, confidence, mean_similarity = classify_groups(self.similarity(self.labels), self.group_of,
+                                                              len(self.group_keys))
+        sizes = np.bincount(self.group_of, minlength=len(self.group_keys))
+        mapped = np.bincount(self.group_of, weights=self.labels >= 0, minlength=len(self.group_keys)) > 0
+        suggestions = {}
+        for group, (institution, prefix) in enumerate(self.group_keys):
+            if mapped[group] or institution not in self.institutions_with_classes:
+                continue
+            suggestions.setdefault(institution, {})[prefix] = {
+                "major": self.classes[chosen[group]][1],
+                "confidence": round(float(confidence[group]), 3),
+                "similarity": round(float(mean_similarity[group]), 4),
+                "modules": int(sizes[group])
+            }
+        return suggestions
+
+    def held_out_accuracy(self, folds=FOLDS):
+        """Hide whole mapped prefixes fold by fold and check the major they are classified as.
+
+        A hidden prefix is answerable when its major still has modules under other prefixes,
+        and only answerable prefixes count as correct. Returns counts of held-out, answerable
+        and correctly classified prefixes and modules.
+        """
+        mapped_groups = np.unique(self.group_of[self.labels >= 0])
+        truth = np.full(len(self.group_keys), -1, dtype=np.intp)
+        truth[self.group_of[self.labels >= 0]] = self.labels[self.labels >= 0]
+        sizes = np.bincount(self.group_of, minlength=len(self.group_keys))
+        counts = Counter()
+        for fold in range(folds):
+            hidden = mapped_groups[fold::folds]
+            labels = self.labels.copy()
+            labels[np.isin(self.group_of, hidden)] = -1
+            chosen, _, _ = classify_groups(self.similarity(labels), self.group_of, len(self.group_keys))
+            answerable = hidden[np.isin(truth[hidden], labels[labels >= 0])]
+            # A prefix whose major has no labelled modules left can only land on it by default
+            right = answerable[chosen[answerable] == truth[answerable]]
+            for name, groups in (("held_out", hidden), ("answerable", answerable), ("correct", right)):
+                counts[f"{name}_prefixes"] += len(groups)
+                counts[f"{name}_modules"] += int(sizes[groups].sum())
+        return counts
+
+def write_overlay(path, suggestions, min_confidence=MIN_CONFIDENCE):
+    """Suggestions keyed like mappings.json ("nus_prefix_to_major", ...)."""
+    data = {"version": OVERLAY_VERSION, "min_confidence": min_confidence}
+    for institution, prefixes in suggestions.items():
+        data[f"{institution.lower()}_prefix_to_major"] = dict(sorted(prefixes.items()))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def apply_overlay(mappings, overlay, min_confidence=None):
+    """A copy of mappings with the overlay's confident suggestions added or replacing Unknown."""
+    if overlay.get("version") != OVERLAY_VERSION:
+        raise ValueError(f"Overlay has version {overlay.get('version')}, expected {OVERLAY_VERSION}")
+    threshold = overlay["min_confidence"] if min_confidence is None else min_confidence
+    merged = {key: dict(value) for key, value in mappings.items()}
+    for key, prefixes in overlay.items():
+        if not key.endswith("_prefix_to_major"):
+            continue
+        table = merged.setdefault(key, {})
+        for prefix, suggestion in prefixes.items():
+            if suggestion["confidence"] >= threshold and table.get(prefix, "Unknown") == "Unknown":
+                table[prefix] = suggestion["major"]
+    return merged
+
+def load_index(mappings_path=MAPPINGS_PATH, overlay_path=OVERLAY_PATH, min_confidence=None):
+    """ModuleIndex over mappings.json plus the overlay, when one has been written."""
+    with open(mappings_path, 'r', encoding='utf-8') as f:
+        mappings = json.load(f)
+    if os.path.exists(overlay_path):
+        with open(overlay_path, 'r', encoding='utf-8') as f:
+            mappings = apply_overlay(mappings, json.load(f), min_confidence)
+    return ModuleIndex.from_tables(mappings)
+
+def build(path=OVERLAY_PATH, min_confidence=MIN_CONFIDENCE):
+    started = time.perf_counter()
+    classifier = PrefixClassifier.from_catalogue()
+    loaded = time.perf_counter()
+    suggestions = classifier.suggest()
+    classified = time.perf_counter()
+    write_overlay(path, suggestions, min_confidence)
+    prefixes = [s for table in suggestions.values() for s in table.values()]
+    confident = [s for s in prefixes if s["confidence"] >= min_confidence]
+    print(f"Classified {len(classifier.modules)} modules in {classified - loaded:.2f} s "
+          f"(load and vectorize {loaded - started:.2f} s) -> {path}")
+    print(f"  {len(prefixes)} unmapped or Unknown prefixes ({sum(s['modules'] for s in prefixes)} modules), "
+          f"{len(confident)} suggested with confidence >= {min_confidence} "
+          f"({sum(s['modules'] for s in confident)} modules)")
+    counts = classifier.held_out_accuracy()
+    for unit in ("prefixes", "modules"):
+        correct, held_out, answerable = (counts[f"{name}_{unit}"] for name in ("correct", "held_out", "answerable"))
+        print(f"  held-out mapped {unit}: {correct}/{held_out} ({correct / max(held_out, 1):.1%}) classified to "
+              f"their mapped major, {correct / max(answerable, 1):.1%} of the {answerable} whose major is still known")
+    return suggestions
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,203 @@
+import json
+import os
+import time
+from collections import Counter
+from codestitleinstitutiondescriptionextractor import iter_json_array, module_key, nus_module
+
+# File paths shared by the module scripts. NUS has no Module_code_and_description file
+# yet, so load_modules reads its plain export (titles only) under Raw/ instead.
+SCHOOL_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "school-data")
+MAPPINGS_PATH = os.path.join(SCHOOL_DATA_DIR, "mappings.json")
+MODULES_PATH = os.path.join(SCHOOL_DATA_DIR, "Module_code_and_description", "Module_code_and_description_{school}.json")
+RAW_MODULES_PATH = os.path.join(SCHOOL_DATA_DIR, "Raw", "{school} MODs AY 2024-2025.json")
+FALLBACK_MODULES = {"NUS": (RAW_MODULES_PATH.format(school="NUS"), nus_module)}
+TRIE_PATH = os.path.join(SCHOOL_DATA_DIR, "mappings_trie.json")
+INSTITUTIONS = ["NUS", "NTU", "SMU"]
+SERIALIZED_VERSION = 1
+
+def normalize_code(code):
+    return code.strip().upper()
+
+def load_modules(institutions=INSTITUTIONS):
+    """Unique modules per institution, tagged with the institution."""
+    modules = []
+    for institution in institutions:
+        path = MODULES_PATH.format(school=institution)
+        adapter = None
+        if not os.path.exists(path) and institution in FALLBACK_MODULES:
+            path, adapter = FALLBACK_MODULES[institution]
+        if not os.path.exists(path):
+            print(f"Skipping {institution} modules: {path} not found")
+            continue
+        seen = set()
+        for module in iter_json_array(path):
+            module = adapter(module) if adapter else module
+            key = module_key(module)
+            if key not in seen:
+                seen.add(key)
+                modules.append(dict(module, institution=institution))
+    return modules
+
+class PrefixTrie:
+    """Module-code prefix -> major, resolved by longest matching prefix.
+
+    Nodes are compiled into parallel lists: a dict of child nodes per character and the
+    index of the node's major in self.majors (-1 where no prefix ends). Longest-prefix
+    matching lets overlapping prefixes such as UT and UTOA map to different majors.
+    """
+
+    def __init__(self, children, values, majors):
+        self.children = children
+        self.values = values
+        self.majors = majors
+
+    @classmethod
+    def from_mapping(cls, prefix_to_major):
+        children, values = [{}], [-1]
+        major_index = {}
+        for prefix, major in prefix_to_major.items():
+            node = 0
+            for char in normalize_code(prefix):
+                if char not in children[node]:
+                    children[node][char] = len(children)
+                    children.append({})
+                    values.append(-1)
+                node = children[node][char]
+            values[node] = major_index.setdefault(major, len(major_index))
+        return cls(children, values, list(major_index))
+
+    def longest_match(self, code):
+        """(prefix, major) for the longest mapped prefix of code, or (None, None)."""
+        code = normalize_code(code)
+        children, values = self.children, self.values
+        node, best, length = 0, -1, 0
+        for depth, char in enumerate(code, 1):
+            node = children[node].get(char)
+            if node is None:
+                break
+            if values[node] >= 0:
+                best, length = values[node], depth
+        return (code[:length], self.majors[best]) if best >= 0 else (None, None)
+
+    def resolve(self, code):
+        return self.longest_match(code)[1]
+
+    def lookup(self, prefix):
+        """The major mapped to exactly this prefix, or None."""
+        node = 0
+        for char in normalize_code(prefix):
+            node = self.children[node].get(char)
+            if node is None:
+                return None
+        return self.majors[self.values[node]] if self.values[node] >= 0 else None
+
+    def __len__(self):
+        return sum(1 for value in self.values if value >= 0)
+
+    def serialize(self):
+        """Compact form: the major table plus one [major index, edge characters, child nodes] per node."""
+        return {
+            "majors": self.majors,
+            "nodes": [[value, "".join(edges), list(edges.values())] for value, edges in zip(self.values, self.children)]
+        }
+
+    @classmethod
+    def deserialize(cls, data):
+        children = [dict(zip(chars, nodes)) for _, chars, nodes in data["nodes"]]
+        return cls(children, [value for value, _, _ in data["nodes"]], list(data["majors"]))
+
+class ModuleIndex:
+    """One PrefixTrie per institution, built from mappings.json's *_prefix_to_major tables."""
+
+    def __init__(self, tries):
+        self.tries = tries
+
+    @classmethod
+    def from_mappings(cls, path=MAPPINGS_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_tables(json.load(f))
+
+    @classmethod
+    def from_tables(cls, mappings):
+        """Build from an already loaded mappings dict (e.g. mappings.json with an overlay applied)."""
+        return cls({institution: PrefixTrie.from_mapping(mappings[f"{institution.lower()}_prefix_to_major"])
+                    for institution in INSTITUTIONS if f"{institution.lower()}_prefix_to_major" in mappings})
+
+    def save(self, path=TRIE_PATH):
+        data = {"version": SERIALIZED_VERSION,
+                "institutions": {institution: trie.serialize() for institution, trie in self.tries.items()}}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=TRIE_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != SERIALIZED_VERSION:
+            raise ValueError(f"{path} has serialized version {data.get('version')}, expected {SERIALIZED_VERSION}")
+        return cls({institution: PrefixTrie.deserialize(trie) for institution, trie in data["institutions"].items()})
+
+    def resolve(self, institution, code):
+        return self.tries[institution].resolve(code)
+
+    def classify(self, institution, modules):
+        """Resolve a whole catalogue in one pass.
+
+        modules is any iterable of {"modulecode": ...} records (e.g. iter_json_array over
+        a Module_code_and_description file). Returns [(modulecode, major or None)] and the
+        number of modules per major.
+        """
+        longest_match = self.tries[institution].longest_match
+        resolved = [(module["modulecode"], longest_match(module["modulecode"])[1]) for module in modules]
+        return resolved, Counter(major for _, major in resolved)
+
+    def classify_file(self, institution, path=None):
+        return self.classify(institution, iter_json_array(path or MODULES_PATH.format(school=institution)))
+
+def scan_prefixes(prefix_to_major, code):
+    """The previous approach: try every prefix in turn, keeping the longest that matches."""
+    code = normalize_code(code)
+    best = None
+    for prefix in prefix_to_major:
+        if code.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return prefix_to_major.get(best)
+
+def report_throughput(index=None, institutions=("NTU", "SMU"), repeats=5):
+    """Resolve the shipped module catalogues with the trie and with a prefix scan and print codes/s."""
+    index = index or ModuleIndex.from_mappings()
+    with open(MAPPINGS_PATH, 'r', encoding='utf-8') as f:
+        mappings = json.load(f)
+    print(f"\n{'school':>6} {'modules':>8} {'resolved':>8} {'trie codes/s':>13} {'scan codes/s':>13}")
+    results = []
+    for institution in institutions:
+        with open(MODULES_PATH.format(school=institution), 'r', encoding='utf-8') as f:
+            codes = [module["modulecode"] for module in json.load(f)]
+        trie = index.tries[institution]
+        prefix_to_major = {normalize_code(p): m for p, m in mappings[f"{institution.lower()}_prefix_to_major"].items()}
+        timings = {}
+        for name, resolve in (("trie", trie.resolve), ("scan", lambda code: scan_prefixes(prefix_to_major, code))):
+            best = float("inf")
+            for _ in range(repeats):
+                started = time.perf_counter()
+                majors = [resolve(code) for code in codes]
+                best = min(best, time.perf_counter() - started)
+            timings[name] = (best, majors)
+        if timings["trie"][1] != timings["scan"][1]:
+            raise AssertionError(f"{institution}: trie and prefix scan disagree")
+        resolved = sum(1 for major in timings["trie"][1] if major is not None)
+        results.append({"institution": institution, "modules": len(codes), "resolved": resolved,
+                        "trie_per_second": len(codes) / timings["trie"][0],
+                        "scan_per_second": len(codes) / timings["scan"][0]})
+        r = results[-1]
+        print(f"{institution:>6} {r['modules']:>8} {r['resolved']:>8} {r['trie_per_second']:>13.0f} {r['scan_per_second']:>13.0f}")
+    return results
+
+if __name__ == "__main__":
+    index = ModuleIndex.from_mappings()
+    index.save()
+    print(f"Saved prefix tries for {', '.join(index.tries)} "
+          f"({sum(len(trie) for trie in index.tries.values())} prefixes) to {TRIE_PATH}")
+    report_throughput(index)
@@ -0,0 +1,204 @@
+import random
+import re
+from collections import Counter, defaultdict
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+QUESTION_OPENERS = {"how", "what", "why", "which", "when", "where", "who", "can", "could", "would",
+                    "do", "does", "did", "have", "has", "is", "are", "if", "imagine", "describe", "tell"}
+HYPOTHETICAL = re.compile(r"\b(imagine|suppose|picture|what if|if you (?:were|could|had))\b", re.IGNORECASE)
+PERSONAL = re.compile(r"\b(you|your|yourself)\b", re.IGNORECASE)
+INSTITUTION_NAMES = {
+    "NUS": ("nus", "national university of singapore"),
+    "NTU": ("ntu", "nanyang technological university", "nanyang"),
+    "SMU": ("smu", "singapore management university")
+}
+# Words too common in major names to count as a mention ("Business and Computer Science")
+MAJOR_STOPWORDS = {"and", "of", "the", "with", "in", "for", "a", "an", "double", "degree", "programme", "major"}
+
+FEATURE_NAMES = [
+    "bias", "words", "length_gap", "ends_with_question_mark", "question_opener",
+    "hypothetical", "personal", "bigram_novelty", "mentions_major", "mentions_institution"
+]
+
+def bigrams(words):
+    return {(words[i], words[i + 1]) for i in range(len(words) - 1)}
+
+def question_features(question, major, institution, seen_bigrams):
+    """Cheap features of a candidate; seen_bigrams holds the word bigrams of its cell so far."""
+    lowered = question.lower()
+    words = WORD_PATTERN.findall(lowered)
+    pairs = bigrams(words)
+    major_words = {w for w in WORD_PATTERN.findall(major.lower()) if w not in MAJOR_STOPWORDS}
+    return [
+        1.0,
+        len(words) / 25.0,
+        abs(len(words) - 15) / 15.0,
+        1.0 if question.rstrip().endswith('?') else 0.0,
+        1.0 if words and words[0] in QUESTION_OPENERS else 0.0,
+        1.0 if HYPOTHETICAL.search(question) else 0.0,
+        1.0 if PERSONAL.search(question) else 0.0,
+        len(pairs - seen_bigrams) / len(pairs) if pairs else 0.0,
+        len(major_words & set(words)) / len(major_words) if major_words else 0.0,
+        1.0 if any(name in lowered for name in INSTITUTION_NAMES.get(institution, ())) else 0.0
+    ]
+
+def solve(matrix, vector):
+    """Solve a small dense linear system by Gaussian elimination with partial pivoting."""
+    n = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        if abs(rows[col][col]) < 1e-12:
+            continue
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, n + 1):
+                rows[r][c] -= factor * rows[col][c]
+    solution = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        if abs(rows[r][r]) < 1e-12:
+            continue
+        solution[r] = (rows[r][n] - sum(rows[r][c] * solution[c] for c in range(r + 1, n))) / rows[r][r]
+    return solution
+
+def fit_ridge(features, targets, alpha=1.0):
+    """Least squares with an L2 penalty on every weight but the bias."""
+    size = len(features[0])
+    gram = [[0.0] * size for _ in range(size)]
+    moment = [0.0] * size
+    for row, target in zip(features, targets):
+        for i in range(size):
+            moment[i] += row[i] * target
+            for j in range(size):
+                gram[i][j] += row[i] * row[j]
+    for i in range(1, size):
+        gram[i][i] += alpha
+    return solve(gram, moment)
+
+def ranks(values):
+    """Ranks starting at 1, with ties given their average rank."""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    result = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            result[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return result
+
+def spearman(xs, ys):
+    if len(xs) < 2:
+        return None
+    rx, ry = ranks(xs), ranks(ys)
+    mean_x, mean_y = sum(rx) / len(rx), sum(ry) / len(ry)
+    cov = sum((a - mean_x) * (b - mean_y) for a, b in zip(rx, ry))
+    var_x = sum((a - mean_x) ** 2 for a in rx)
+    var_y = sum((b - mean_y) ** 2 for b in ry)
+    if var_x == 0 or var_y == 0:
+        return None
+    return cov / (var_x * var_y) ** 0.5
+
+class PreScorer:
+    """Local linear model that predicts the reward score before the remote call.
+
+    fit() trains a ridge regression on questions that already carry a reward_score,
+    holding out every fifth one to measure rank agreement (Spearman). Gating only
+    switches on when that agreement reaches min_agreement; otherwise the scorer runs
+    in shadow mode and just records predictions. Candidates predicted below the
+    threshold (or, if none is set, below the drop_quantile of training predictions)
+    skip the reward model, except for an audit_rate sample that is still scored so
+    the agreement keeps being measured on the whole range.
+    """
+
+    def __init__(self, threshold=None, drop_quantile=0.2, min_samples=200, min_agreement=0.2,
+                 audit_rate=0.05, alpha=1.0, seed=1):
+        self.threshold = threshold
+        self.drop_quantile = drop_quantile
+        self.min_samples = min_samples
+        self.min_agreement = min_agreement
+        self.audit_rate = audit_rate
+        self.alpha = alpha
+        self.rng = random.Random(seed)
+        self.weights = None
+        self.gating = False
+        self.holdout_agreement = None
+        self.history = defaultdict(set)
+        self.counts = Counter()
+        self.predicted = []
+        self.actual = []
+
+    def remember(self, cell, question):
+        self.history[cell].update(bigrams(WORD_PATTERN.findall(question.lower())))
+
+    def features(self, cell, question, major, institution):
+        return question_features(question, major, institution, self.history[cell])
+
+    def predict(self, row):
+        return sum(w * x for w, x in zip(self.weights, row))
+
+    def fit(self, records):
+        """Train on (cell, record) pairs in the order they were accepted."""
+        rows, targets = [], []
+        for cell, record in records:
+            score = record.get('reward_score')
+            if isinstance(score, (int, float)):
+                rows.append(self.features(cell, record['question'], record['major'], record['school']))
+                targets.append(float(score))
+            self.remember(cell, record['question'])
+        self.counts['training_samples'] = len(rows)
+        if len(rows) < self.min_samples:
+            print(f"Pre-scorer: {len(rows)} scored questions, need {self.min_samples}; running in shadow mode")
+            return False
+
+        train = [i for i in range(len(rows)) if i % 5]
+        held_out = [i for i in range(len(rows)) if i % 5 == 0]
+        self.weights = fit_ridge([rows[i] for i in train], [targets[i] for i in train], self.alpha)
+        self.holdout_agreement = spearman([self.predict(rows[i]) for i in held_out], [targets[i] for i in held_out])
+
+        self.weights = fit_ridge(rows, targets, self.alpha)
+        if self.threshold is None:
+            predictions = sorted(self.predict(row) for row in rows)
+            self.threshold = predictions[int(self.drop_quantile * (len(predictions) - 1))]
+        self.gating = self.holdout_agreement is not None and self.holdout_agreement >= self.min_agreement
+        agreement = "n/a" if self.holdout_agreement is None else f"{self.holdout_agreement:.3f}"
+        mode = f"gating below {self.threshold:.3f}" if self.gating else "shadow mode"
+        print(f"Pre-scorer trained on {len(rows)} questions, held-out Spearman {agreement}; {mode}")
+        return self.gating
+
+    def should_score(self, cell, question, major, institution):
+        """Return (send to the reward model?, predicted score or None)."""
+        self.counts['candidates'] += 1
+        if self.weights is None:
+            return True, None
+        predicted = self.predict(self.features(cell, question, major, institution))
+        if not self.gating or predicted >= self.threshold:
+            return True, predicted
+        if self.rng.random() < self.audit_rate:
+            self.counts['audited'] += 1
+            return True, predicted
+        self.counts['dropped'] += 1
+        return False, predicted
+
+    def observe(self, predicted, actual):
+        if predicted is not None:
+            self.predicted.append(predicted)
+            self.actual.append(actual)
+
+    def report(self):
+        agreement = spearman(self.predicted, self.actual)
+        shown = "n/a" if agreement is None else f"{agreement:.3f}"
+        print(f"Pre-scorer: {self.counts['dropped']} of {self.counts['candidates']} reward calls saved, "
+              f"{self.counts['audited']} audited, Spearman vs reward model {shown} over {len(self.predicted)} scored")
+        return {
+            "candidates": self.counts['candidates'],
+            "reward_calls_saved": self.counts['dropped'],
+            "audited": self.counts['audited'],
+            "training_samples": self.counts['training_samples'],
+            "holdout_spearman": self.holdout_agreement,
+            "run_spearman": agreement,
+            "weights": dict(zip(FEATURE_NAMES, self.weights)) if self.weights is not None else None
+        }
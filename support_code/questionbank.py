@@ -0,0 +1,53 @@
+import glob
+import json
+import os
+from jsonlsink import JsonlSink, read_jsonl
+from workqueue import record_cell
+
+MANIFEST_NAME = "manifest.json"
+
+def bank_files(bank_dir):
+    """Per-major question files in a directory written by splittingfiles.py.
+
+    The manifest lists them with absolute paths from the machine that split them, so
+    only the file names are used; without a manifest every JSON file is read.
+    """
+    manifest_path = os.path.join(bank_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            names = [entry['name'] for entry in json.load(f).get('files', [])]
+        return [os.path.join(bank_dir, name) for name in names if os.path.exists(os.path.join(bank_dir, name))]
+    return [path for path in sorted(glob.glob(os.path.join(bank_dir, "*.json")))
+            if os.path.basename(path) != MANIFEST_NAME]
+
+def read_bank(bank_dir):
+    """Yield every {major, school, question, criterion} record in the per-major files."""
+    for path in bank_files(bank_dir):
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            continue
+        for record in records:
+            if all(key in record for key in ('major', 'school', 'question', 'criterion')):
+                yield record
+
+def seed_from_question_bank(bank_dir, journal_path):
+    """Merge the per-major question files into a work queue journal.
+
+    A new journal is started from the bank; an existing one gets the bank questions it
+    does not already hold, so deficits are counted against both whenever the bank is
+    used and merging the same bank again adds nothing.
+    """
+    if not os.path.isdir(bank_dir):
+        return 0
+    seen = {(record_cell(record), record['question']) for record in read_jsonl(journal_path)}
+    count = 0
+    with JsonlSink(journal_path, fsync_every=1000) as sink:
+        for record in read_bank(bank_dir):
+            key = (record_cell(record), record['question'])
+            if key not in seen:
+                seen.add(key)
+                sink.append(record)
+                count += 1
+    print(f"Merged {count} questions from {bank_dir} into work queue {journal_path}")
+    return count
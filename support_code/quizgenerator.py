@@ -2,13 +2,24 @@ import os
 import json
 import time
 import re
+import asyncio
 from collections import Counter
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+from catalogue import load_catalogue
+from jsonlsink import JsonlSink, export_json, seed_jsonl_from_json
+from workqueue import WorkQueue, cell_key, record_cell, seed_from_legacy_checkpoint
+from neardedupe import NearDuplicateFilter
+from prescorer import PreScorer
+from questionbank import seed_from_question_bank
+from responsecache import CacheMiss, ResponseCache, cache_key
+from nimclient import AIMDLimiter, CircuitBreaker, NimRequestError, ResilientClient
+from quizpipeline import DemandTracker, Pipeline, Stage
+from runmetrics import RunMetrics
 
-client = OpenAI(
-    base_url="https://integrate.api.nvidia.com/v1",
-    api_key="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"  # Replace with your actual key or use os.getenv
-)
+# Point NIM_BASE_URL at a local OpenAI-compatible stand-in server to exercise the
+# generator without the real endpoint.
+NIM_BASE_URL = os.getenv("NIM_BASE_URL", "https://integrate.api.nvidia.com/v1")
+NIM_API_KEY = os.getenv("NVIDIA_API_KEY", "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")  # Replace with your actual key or use os.getenv
 
 # Set PyTorch memory management (optional, not needed for NIM API)
 # os.environ["PYTORCH_CUDA_ALLOC_CONF"] = "expandable_segments:True"
@@ -18,150 +29,464 @@ DATA_PATH = r"C:\Users\Josh\Downloads"
 NUS_MAJORS_JSON = os.path.join(DATA_PATH, "standardized_nus_majors.json")
 NTU_MAJORS_JSON = os.path.join(DATA_PATH, "standardized_ntu_majors.json")
 SMU_MAJORS_JSON = os.path.join(DATA_PATH, "standardized_smu_majors.json")
+# Validated programs from the three majors files, rebuilt when any of them changes
+CATALOGUE_SNAPSHOT_PATH = os.path.join(DATA_PATH, "majors_catalogue.pickle")
 OUTPUT_PATH = os.path.join(DATA_PATH, "quiz_questions.json")
 CHECKPOINT_PATH = os.path.join(DATA_PATH, "quiz_checkpoint.json")
+# Work queue journal: one line per accepted question, replayed on resume
+WORK_QUEUE_PATH = os.path.join(DATA_PATH, "quiz_checkpoint.jsonl")
+# Generation rounds started per cell; their indexes are the cache slots of sampled requests
+WORK_QUEUE_ROUNDS_PATH = os.path.join(DATA_PATH, "quiz_checkpoint.rounds.jsonl")
 INVALID_PATH = os.path.join(DATA_PATH, "invalid_questions.json")
 VALID_PATH = os.path.join(DATA_PATH, "valid_questions.json")
+# Valid/invalid questions are appended here during a run and exported to the JSON files above at the end
+INVALID_JSONL_PATH = os.path.join(DATA_PATH, "invalid_questions.jsonl")
+VALID_JSONL_PATH = os.path.join(DATA_PATH, "valid_questions.jsonl")
+SINK_FSYNC_EVERY = 50
+# Content-addressed cache of LLM and reward model responses.
+# CACHE_MODE: "readwrite" serves hits and stores new responses, "replay" serves
+# everything from the cache and fails on a miss (offline reruns), "off" disables it.
+CACHE_PATH = os.path.join(DATA_PATH, "nim_response_cache.sqlite")
+CACHE_MODE = "readwrite"
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Per-call latency, token, retry and rejection metrics written at the end of a run
+METRICS_PROM_PATH = os.path.join(DATA_PATH, "quiz_metrics.prom")
+METRICS_JSON_PATH = os.path.join(DATA_PATH, "quiz_metrics.json")
+
+# Generation settings
+LLM_MODEL = "nvidia/llama-3.1-nemotron-ultra-253b-v1"
+REWARD_MODEL = "nvidia/llama-3.1-nemotron-70b-reward"
+SYSTEM_PROMPT = "You are a school admissions interviewer, your purpose is to generate questions for every major across 3 universities, national university of singapore (NUS), nanyang technological university (NTU) and singapore management university (SMU). These questions serve to deteremine how suitable people are for each major"
+CRITERIA = ['Interests', 'Skills', 'Experiences']
+REQUIRED_QUESTIONS_PER_CRITERION = 100  # Generate 100 questions per criterion
+CHECKPOINT_EVERY = 50  # fsync the work queue journal every N accepted questions
+# "catalogue" fills cells in program order. "deficit" merges the per-major files
+# splittingfiles.py wrote to QUESTION_BANK_DIR into the work queue (new or existing)
+# and only tops up under-filled cells, most deficient first.
+SCHEDULE_MODE = "catalogue"
+QUESTION_BANK_DIR = os.path.join(DATA_PATH, "Open_ended_quiz_questions")
+# False when another process has already seeded the work queue (shardrun.py seeds the
+# main journal once before starting its shards)
+SEED_WORK_QUEUE = True
+
+# Set USE_ASYNC to overlap generation and reward calls across (major, criterion) cells.
+# MAX_CONCURRENCY bounds the number of requests in flight at once.
+USE_ASYNC = False
+MAX_CONCURRENCY = 16
+# Number of questions requested per LLM call; 1 keeps the original one-question prompt
+BATCH_SIZE = 1
+# Questions at least this similar (estimated word-bigram Jaccard) to one already in the
+# same (major, criterion) cell are dropped before reward scoring; None disables the filter
+DEDUPE_THRESHOLD = 0.8
+# Local pre-scorer trained on the reward scores already in the work queue. Candidates it
+# predicts below PRESCORE_THRESHOLD skip the reward model (None derives the threshold
+# from the PRESCORE_DROP_QUANTILE of training predictions); PRESCORE_AUDIT_RATE of them
+# are still scored to keep measuring agreement. Opt-in: set USE_PRESCORER = True to enable it.
+USE_PRESCORER = False
+PRESCORE_THRESHOLD = None
+PRESCORE_DROP_QUANTILE = 0.2
+PRESCORE_MIN_SAMPLES = 200
+PRESCORE_AUDIT_RATE = 0.05
+
+# NIM client resilience: token-bucket rate limit, exponential backoff with jitter on
+# 429/5xx/connection errors, a circuit breaker, and AIMD adjustment of the asyncio
+# concurrency limit (halved on throttles, errors or calls slower than the latency target)
+RATE_LIMIT_PER_MINUTE = 40
+RATE_LIMIT_BURST = 5
+NIM_MAX_RETRIES = 6
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 30.0
+LATENCY_TARGET_SECONDS = 20.0
+
+class RewardScoreError(Exception):
+    """Raised when the reward model output contains no score."""
+
+client = None
+async_client = None
+nim = None
+
+def configure_client(base_url=NIM_BASE_URL, api_key=NIM_API_KEY):
+    """(Re)create the blocking and asyncio clients against the given endpoint."""
+    global client, async_client, nim
+    # Retries are handled by ResilientClient, so the SDK's own retry loop is turned off
+    client = OpenAI(base_url=base_url, api_key=api_key, max_retries=0)
+    async_client = AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=0)
+    nim = ResilientClient(
+        client, async_client,
+        rate_per_second=RATE_LIMIT_PER_MINUTE / 60.0,
+        burst=RATE_LIMIT_BURST,
+        max_retries=NIM_MAX_RETRIES,
+        base_delay=BACKOFF_BASE_SECONDS,
+        max_delay=BACKOFF_MAX_SECONDS,
+        breaker=CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS),
+        limiter=AIMDLimiter(MAX_CONCURRENCY, latency_target=LATENCY_TARGET_SECONDS)
+    )
+
+configure_client()
+
+# Request and token counts for LLM generation calls
+llm_usage = Counter()
+near_duplicates = None
+prescorer = None
+response_cache = None
+work_queue = None
+run_metrics = RunMetrics()
+
+question_sinks = {}
+
+def question_sink(jsonl_path, json_path):
+    if jsonl_path not in question_sinks:
+        # Carry over questions saved by runs that wrote the JSON arrays directly
+        seed_jsonl_from_json(json_path, jsonl_path)
+        question_sinks[jsonl_path] = JsonlSink(jsonl_path, fsync_every=SINK_FSYNC_EVERY)
+    return question_sinks[jsonl_path]
+
+def export_question_logs():
+    """Flush the JSONL sinks and compact them into valid/invalid_questions.json."""
+    for sink in question_sinks.values():
+        sink.close()
+    question_sinks.clear()
+    for jsonl_path, json_path in [(VALID_JSONL_PATH, VALID_PATH), (INVALID_JSONL_PATH, INVALID_PATH)]:
+        if os.path.exists(jsonl_path):
+            export_json(jsonl_path, json_path)
 
 def save_valid_question(question_data):
-    existing = []
-    if os.path.exists(VALID_PATH):
-        with open(VALID_PATH, 'r') as f:
-            existing = json.load(f)
-    existing.append(question_data)
-    with open(VALID_PATH, 'w') as f:
-        json.dump(existing, f, indent=2)
-    print(f"Saved valid question to {VALID_PATH}")
+    question_sink(VALID_JSONL_PATH, VALID_PATH).append(question_data)
+    run_metrics.accept(question_data['school'])
+    if prescorer is not None:
+        prescorer.remember(cell_key(question_data['school'], question_data['major'], question_data['criterion']), question_data['question'])
+    print(f"Saved valid question to {VALID_JSONL_PATH}")
 
 def load_majors():
     print("Loading majors from JSON files...")
     try:
-        programs = []
-        # Load and tag NUS majors
-        with open(NUS_MAJORS_JSON, 'r') as f:
-            nus_majors = json.load(f)
-            for p in nus_majors["programs"]:
-                criteria_descriptions = {
-                    c["criterion"]: c.get("description", "No description available")
-                    for c in p["criteria"].get("suitability", [])
-                }
-                programs.append({
-                    "institution": "NUS",
-                    "major": p["major"],
-                    "college": p["college"],
-                    "degree": p["degree"],
-                    "criteria_descriptions": criteria_descriptions
-                })
-        # Load and tag NTU majors
-        with open(NTU_MAJORS_JSON, 'r') as f:
-            ntu_majors = json.load(f)
-            for p in ntu_majors["programs"]:
-                criteria_descriptions = {
-                    c["criterion"]: c.get("description", "No description available")
-                    for c in p["criteria"].get("suitability", [])
-                }
-                programs.append({
-                    "institution": "NTU",
-                    "major": p["major"],
-                    "college": p["college"],
-                    "degree": p["degree"],
-                    "criteria_descriptions": criteria_descriptions
-                })
-        # Load and tag SMU majors
-        with open(SMU_MAJORS_JSON, 'r') as f:
-            smu_majors = json.load(f)
-            for p in smu_majors["programs"]:
-                criteria_descriptions = {
-                    c["criterion"]: c.get("description", "No description available")
-                    for c in p["criteria"].get("suitability", [])
-                }
-                programs.append({
-                    "institution": "SMU",
-                    "major": p["major"],
-                    "college": p["college"],
-                    "degree": p["degree"],
-                    "criteria_descriptions": criteria_descriptions
-                })
+        catalogue = load_catalogue({"NUS": NUS_MAJORS_JSON, "NTU": NTU_MAJORS_JSON, "SMU": SMU_MAJORS_JSON},
+                                   CATALOGUE_SNAPSHOT_PATH)
+        programs = [{
+            "institution": p.institution,
+            "major": p.major,
+            "college": p.college,
+            "degree": p.degree,
+            "criteria_descriptions": p.criteria_descriptions()
+        } for p in catalogue]
         print(f"Loaded {len(programs)} programs from NUS, NTU, SMU")
         return programs
     except Exception as e:
         print(f"Error loading majors: {e}")
         raise
 
+# Patterns used on every candidate, compiled once
+ROLE_PREFIX = re.compile(r'^(Answer:|Human:|Assistant:|\s*-|\s*")', re.MULTILINE)
+META_SUFFIX = re.compile(r'\b(skipping|context|task|generate a|described as)\b.*$', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+TRAILING_COMMA = re.compile(r',\s*$')
+CODE_KEYWORDS = re.compile(r'\b(def|class|import|```)', re.IGNORECASE)
+SCORE_NUMBER = re.compile(r"([-+]?\d*\.?\d+)")
+
 def clean_text(text):
-    text = re.sub(r'^(Answer:|Human:|Assistant:|\s*-|\s*")', '', text, flags=re.MULTILINE)
-    text = re.sub(r'\b(skipping|context|task|generate a|described as)\b.*$', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\s+', ' ', text.strip())
-    text = re.sub(r',\s*$', '', text)
+    text = ROLE_PREFIX.sub('', text)
+    text = META_SUFFIX.sub('', text)
+    text = WHITESPACE.sub(' ', text.strip())
+    text = TRAILING_COMMA.sub('', text)
     return text.strip()
 
-def call_nim_llm(prompt, max_tokens=100, temperature=0.7, top_p=0.95):
-    completion = client.chat.completions.create(
-        model="nvidia/llama-3.1-nemotron-ultra-253b-v1",
-        messages=[
-            {"role": "system", "content": "You are a school admissions interviewer, your purpose is to generate questions for every major across 3 universities, national university of singapore (NUS), nanyang technological university (NTU) and singapore management university (SMU). These questions serve to deteremine how suitable people are for each major"},
+def llm_request(prompt, max_tokens=100, temperature=0.7, top_p=0.95):
+    """Build the chat completion arguments for a question generation call."""
+    return {
+        "model": LLM_MODEL,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
-        max_tokens=max_tokens,
-        temperature=temperature,
-        top_p=top_p,
-        stream=False
-    )
-    return completion.choices[0].message.content
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "top_p": top_p,
+        "stream": False
+    }
 
-def call_nim_reward_model(question, answer, max_tokens=32):
-    completion = client.chat.completions.create(
-        model="nvidia/llama-3.1-nemotron-70b-reward",
-        messages=[
+def reward_request(question, answer, max_tokens=32):
+    """Build the chat completion arguments for a reward model scoring call."""
+    return {
+        "model": REWARD_MODEL,
+        "messages": [
             {"role": "user", "content": f"Score the following question and answer for relevance and quality (0-1), where 1 is the best. Consider the question's clarity, relevance to the topic, and suitability for pre-university students. Provide only the score:\nQuestion: {question}\nAnswer: {answer}\nScore:"},
             {"role": "assistant", "content": ""}
         ],
-        max_tokens=max_tokens,
-        temperature=0.0,
-        top_p=1.0,
-        stream=False
-    )
-    score_text = completion.choices[0].message.content.strip()
+        "max_tokens": max_tokens,
+        "temperature": 0.0,
+        "top_p": 1.0,
+        "stream": False
+    }
+
+def parse_reward_score(score_text):
+    """Return the first number in the reward model output clamped to 0-1, or None if there is none."""
+    score_text = score_text.strip()
     print(f"Raw reward model output: '{score_text}'")
 
+    # Try to extract the first float from the response
+    match = SCORE_NUMBER.search(score_text)
+    if not match:
+        return None
+    # Clamp the score between 0 and 1
+    return max(0.0, min(1.0, float(match.group(1))))
+
+def get_response_cache():
+    global response_cache
+    if CACHE_MODE == "off":
+        return None
+    if response_cache is None:
+        response_cache = ResponseCache(CACHE_PATH, max_bytes=CACHE_MAX_BYTES, mode=CACHE_MODE)
+    return response_cache
+
+def cache_lookup(request, slot):
+    """Return (key, cached response) for a request; key is None when caching does not apply.
+
+    Sampled requests (temperature > 0) are only cached when they carry a slot, since
+    otherwise every repeat of the prompt would get back the same response.
+    """
+    cache = get_response_cache()
+    if cache is None or (slot is None and request["temperature"] > 0):
+        return None, None
+    key = cache_key(request, slot)
+    return key, cache.get(key)
+
+def completion_payload(completion):
+    usage = getattr(completion, 'usage', None)
+    return {
+        "content": completion.choices[0].message.content,
+        "usage": {
+            "prompt_tokens": (usage.prompt_tokens or 0) if usage is not None else 0,
+            "completion_tokens": (usage.completion_tokens or 0) if usage is not None else 0
+        }
+    }
+
+def store_response(key, payload):
+    if key is not None:
+        get_response_cache().put(key, payload)
+
+def track_llm_usage(payload):
+    llm_usage['requests'] += 1
+    llm_usage['prompt_tokens'] += payload['usage']['prompt_tokens']
+    llm_usage['completion_tokens'] += payload['usage']['completion_tokens']
+
+def start_run_metrics():
+    global run_metrics
+    run_metrics = RunMetrics()
+    nim.retry_observer = run_metrics.observe_retry
+    nim.latency_observer = run_metrics.observe_request
+    return run_metrics
+
+def timed_create(request):
+    started = time.perf_counter()
     try:
-        # Try to extract the first float from the response
-        import re
-        match = re.search(r"([-+]?\d*\.?\d+)", score_text)
-        if match:
-            score = float(match.group(1))
-            # Clamp the score between 0 and 1
-            score = max(0.0, min(1.0, score))
-        else:
-            score = 0.0
-    except Exception as e:
-        print(f"Error parsing score: {e}")
-        score = 0.0
+        completion = nim.create(**request)
+    except Exception:
+        run_metrics.observe_call(request['model'], time.perf_counter() - started, outcome="error")
+        raise
+    payload = completion_payload(completion)
+    run_metrics.observe_call(request['model'], time.perf_counter() - started, payload['usage'])
+    return payload
 
+async def async_timed_create(request):
+    started = time.perf_counter()
+    try:
+        completion = await nim.acreate(**request)
+    except Exception:
+        run_metrics.observe_call(request['model'], time.perf_counter() - started, outcome="error")
+        raise
+    payload = completion_payload(completion)
+    run_metrics.observe_call(request['model'], time.perf_counter() - started, payload['usage'])
+    return payload
+
+def attempt_slot(slot, attempt):
+    return None if slot is None else f"{slot}/{attempt}"
+
+def call_nim_llm(prompt, max_tokens=100, temperature=0.7, top_p=0.95, cache_slot=None):
+    request = llm_request(prompt, max_tokens=max_tokens, temperature=temperature, top_p=top_p)
+    key, payload = cache_lookup(request, cache_slot)
+    if payload is not None:
+        llm_usage['cache_hits'] += 1
+        run_metrics.observe_cache_hit(request['model'])
+        return payload['content']
+    payload = timed_create(request)
+    track_llm_usage(payload)
+    store_response(key, payload)
+    return payload['content']
+
+def call_nim_reward_model(question, answer, max_tokens=32):
+    request = reward_request(question, answer, max_tokens=max_tokens)
+    key, payload = cache_lookup(request, None)
+    if payload is None:
+        payload = timed_create(request)
+    else:
+        run_metrics.observe_cache_hit(request['model'])
+    score = parse_reward_score(payload['content'])
+    if score is None:
+        raise RewardScoreError(f"No score in reward model output: '{payload['content']}'")
+    store_response(key, payload)
+    return score
+
+async def async_call_nim_llm(prompt, max_tokens=100, temperature=0.7, top_p=0.95, cache_slot=None):
+    request = llm_request(prompt, max_tokens=max_tokens, temperature=temperature, top_p=top_p)
+    key, payload = cache_lookup(request, cache_slot)
+    if payload is not None:
+        llm_usage['cache_hits'] += 1
+        run_metrics.observe_cache_hit(request['model'])
+        return payload['content']
+    payload = await async_timed_create(request)
+    track_llm_usage(payload)
+    store_response(key, payload)
+    return payload['content']
+
+async def async_call_nim_reward_model(question, answer, max_tokens=32):
+    request = reward_request(question, answer, max_tokens=max_tokens)
+    key, payload = cache_lookup(request, None)
+    if payload is None:
+        payload = await async_timed_create(request)
+    else:
+        run_metrics.observe_cache_hit(request['model'])
+    score = parse_reward_score(payload['content'])
+    if score is None:
+        raise RewardScoreError(f"No score in reward model output: '{payload['content']}'")
+    store_response(key, payload)
     return score
 
-def generate_text(prompt, max_new_tokens=50, max_retries=5):
+def accept_generated_text(response):
+    question = clean_text(response)
+    print(f"Generated Question: {question}")  # Debug logging
+    print(f"Question Length: {len(question.strip().split())}")  # Debug logging
+    return question
+
+def generate_text(prompt, max_new_tokens=50, max_retries=5, cache_slot=None):
     for attempt in range(max_retries):
         try:
-            response = call_nim_llm(prompt, max_tokens=max_new_tokens)
-            question = clean_text(response)
-            print(f"Generated Question: {question}")  # Debug logging
-            print(f"Question Length: {len(question.strip().split())}")  # Debug logging
+            question = accept_generated_text(call_nim_llm(prompt, max_tokens=max_new_tokens, cache_slot=attempt_slot(cache_slot, attempt)))
             if question:
                 return question
             print(f"Attempt {attempt+1}/{max_retries}: Empty question after cleaning")
+            run_metrics.reject("empty")
+        except (CacheMiss, NimRequestError):
+            raise
         except Exception as e:
             print(f"Attempt {attempt+1}/{max_retries}: Error generating text: {e}")
     return ""
 
-def is_valid_question(text):
-    if re.search(r'\b(def|class|import|```)', text, re.IGNORECASE):
+async def async_generate_text(prompt, max_new_tokens=50, max_retries=5, cache_slot=None):
+    for attempt in range(max_retries):
+        try:
+            question = accept_generated_text(await async_call_nim_llm(prompt, max_tokens=max_new_tokens, cache_slot=attempt_slot(cache_slot, attempt)))
+            if question:
+                return question
+            print(f"Attempt {attempt+1}/{max_retries}: Empty question after cleaning")
+            run_metrics.reject("empty")
+        except (CacheMiss, NimRequestError):
+            raise
+        except Exception as e:
+            print(f"Attempt {attempt+1}/{max_retries}: Error generating text: {e}")
+    return ""
+
+NUMBERED_ITEM = re.compile(r'^\s*(?:\*\*)?(?:Q(?:uestion)?\s*)?\d{1,3}\s*[.):-]\s*(?:\*\*)?\s*(.*)$', re.IGNORECASE)
+
+def build_batch_prompt(prompt, count):
+    return (
+        f"{prompt} "
+        f"Generate {count} different questions that each follow these rules. "
+        f"Return them as a numbered list from 1 to {count}, one question per line in the form '1. <question>', with no other text."
+    )
+
+def parse_numbered_questions(text):
+    """Split a numbered-list completion into individual question candidates.
+
+    Preamble and commentary around the list are dropped, and a question wrapped onto
+    a following unnumbered line is joined back to its item. If the model ignored the
+    numbering entirely, every non-empty line is treated as a candidate.
+    """
+    items = []
+    numbered = False
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        match = NUMBERED_ITEM.match(line)
+        if match:
+            # Drop markdown emphasis and quotes wrapped around the whole item
+            items.append(match.group(1).strip().strip('*"\u201c\u201d').strip())
+            numbered = True
+        elif numbered and not items[-1].rstrip().endswith('?'):
+            items[-1] = f"{items[-1]} {line.strip()}"
+    if not numbered:
+        items = [line for line in text.splitlines() if line.strip()]
+    return items
+
+def generate_text_batch(prompt, count, max_new_tokens=50, max_retries=5, cache_slot=None):
+    for attempt in range(max_retries):
+        try:
+            response = call_nim_llm(build_batch_prompt(prompt, count), max_tokens=max_new_tokens * count, cache_slot=attempt_slot(cache_slot, attempt))
+            questions = [q for q in map(accept_generated_text, parse_numbered_questions(response)) if q]
+            if questions:
+                return questions
+            print(f"Attempt {attempt+1}/{max_retries}: No questions parsed from batch")
+            run_metrics.reject("empty")
+        except (CacheMiss, NimRequestError):
+            raise
+        except Exception as e:
+            print(f"Attempt {attempt+1}/{max_retries}: Error generating text: {e}")
+    return []
+
+async def async_generate_text_batch(prompt, count, max_new_tokens=50, max_retries=5, cache_slot=None):
+    for attempt in range(max_retries):
+        try:
+            response = await async_call_nim_llm(build_batch_prompt(prompt, count), max_tokens=max_new_tokens * count, cache_slot=attempt_slot(cache_slot, attempt))
+            questions = [q for q in map(accept_generated_text, parse_numbered_questions(response)) if q]
+            if questions:
+                return questions
+            print(f"Attempt {attempt+1}/{max_retries}: No questions parsed from batch")
+            run_metrics.reject("empty")
+        except (CacheMiss, NimRequestError):
+            raise
+        except Exception as e:
+            print(f"Attempt {attempt+1}/{max_retries}: Error generating text: {e}")
+    return []
+
+def generate_candidates(prompt, count, cache_slot=None):
+    if count == 1:
+        return [generate_text(prompt, cache_slot=cache_slot)]
+    return generate_text_batch(prompt, count, cache_slot=cache_slot)[:count]
+
+async def async_generate_candidates(prompt, count, cache_slot=None):
+    if count == 1:
+        return [await async_generate_text(prompt, cache_slot=cache_slot)]
+    return (await async_generate_text_batch(prompt, count, cache_slot=cache_slot))[:count]
+
+def next_generation_slot(institution, major, criterion):
+    """Cache slot for the next generation round of a cell.
+
+    Round indexes are persisted by the work queue, so a resumed run moves on to fresh
+    slots instead of replaying the cached responses of rounds it already ran. Without
+    a work queue there is no stable slot and sampled requests are not cached.
+    """
+    if work_queue is None:
+        return None
+    cell = cell_key(institution, major, criterion)
+    return "|".join(cell) + f"#{work_queue.start_round(cell)}"
+
+def rejection_reason(text):
+    """Why a candidate fails validation ("empty", "code_keywords" or "length"), or None if it passes."""
+    if not text.strip():
+        print("Invalid question: Empty output.")
+        return "empty"
+    if CODE_KEYWORDS.search(text):
         print("Invalid question: Contains code keywords.")
-        return False
-    if len(text.strip().split()) < 5 or len(text.strip().split()) > 40:
-        print(f"Invalid question: Length is {len(text.strip().split())} words, which is outside the 5-40 word range.")
-        return False
-    return True
+        return "code_keywords"
+    word_count = len(text.split())
+    if word_count < 5 or word_count > 40:
+        print(f"Invalid question: Length is {word_count} words, which is outside the 5-40 word range.")
+        return "length"
+    return None
+
+def is_valid_question(text):
+    return rejection_reason(text) is None
 
 def save_invalid_question(prompt, output, major, criterion, institution):
     invalid_data = {
@@ -172,31 +497,26 @@ def save_invalid_question(prompt, output, major, criterion, institution):
         "criterion": criterion,
         "timestamp": time.time()
     }
-    existing = []
-    if os.path.exists(INVALID_PATH):
-        with open(INVALID_PATH, 'r') as f:
-            existing = json.load(f)
-    existing.append(invalid_data)
-    with open(INVALID_PATH, 'w') as f:
-        json.dump(existing, f, indent=2)
-    print(f"Saved invalid question to {INVALID_PATH}")
-
-def load_checkpoint():
-    print("Checking for existing checkpoint...")
-    if os.path.exists(CHECKPOINT_PATH):
-        with open(CHECKPOINT_PATH, 'r') as f:
-            checkpoint = json.load(f)
-        print(f"Loaded checkpoint with {len(checkpoint['data'])} samples")
-        return checkpoint['data']
-    print("No checkpoint found, starting fresh")
-    return []
+    question_sink(INVALID_JSONL_PATH, INVALID_PATH).append(invalid_data)
+    print(f"Saved invalid question to {INVALID_JSONL_PATH}")
+
+def seed_work_queue():
+    # Older runs saved full {"data": [...]} snapshots to CHECKPOINT_PATH
+    seed_from_legacy_checkpoint(CHECKPOINT_PATH, WORK_QUEUE_PATH)
+    if SCHEDULE_MODE == "deficit":
+        seed_from_question_bank(QUESTION_BANK_DIR, WORK_QUEUE_PATH)
 
-def save_checkpoint(data):
-    print("Saving checkpoint...")
-    checkpoint = {"data": data, "timestamp": time.time()}
-    with open(CHECKPOINT_PATH, 'w') as f:
-        json.dump(checkpoint, f)
-    print(f"Checkpoint saved with {len(data)} samples")
+def load_work_queue():
+    global work_queue
+    print("Checking for existing checkpoint...")
+    if SEED_WORK_QUEUE:
+        seed_work_queue()
+    queue = work_queue = WorkQueue(WORK_QUEUE_PATH, fsync_every=CHECKPOINT_EVERY, rounds_path=WORK_QUEUE_ROUNDS_PATH)
+    if len(queue):
+        print(f"Loaded checkpoint with {len(queue)} samples")
+    else:
+        print("No checkpoint found, starting fresh")
+    return queue
 
 def fix_question_mark(text):
     text = text.strip()
@@ -214,105 +534,316 @@ def save_synthetic_data(data):
         json.dump(data, f, indent=2)
     print(f"Synthetic data saved to {OUTPUT_PATH}")
 
-def generate_quiz_questions():
-    synthetic_data = load_checkpoint()
-    programs = load_majors()
-    required_questions_per_criterion = 100  # Generate 100 questions per criterion
+def build_prompt(major, institution, criterion):
+    theme = f"{major} ({criterion})"
+
+    if criterion == 'Interests':
+        focus = f"a student's interest in the major '{major}' "
+    elif criterion == 'Skills':
+        focus = f"a student's skills relevant to the major '{major}' "
+    else:
+        focus = f"a student's experiences relevant to the major '{major}' "
+
+    return (
+        f"Generate a concise question to assess {focus}"
+        f"({institution}), focusing on {theme}. Ensure it ends with a question mark and is 5-25 words. "
+        "Ensure the question is suitable for pre-university students to answer. "
+        "Return only the question in first-person mode, as though you are actively asking the student."
+        "Ensure there is no mention of the major or institution name."
+        "Ensure the question does not assume any predefined knowledge or experience."
+        "Ensure the question ends with a question mark."
+        "Explore intresting aspects of the major, such as its relevance to the student's future career or personal growth."
+        "Explore intresting ways of framing the question, such as posing hyptothethical scenarios or asking the student to reflect on their own experiences."
+    )
+
+def question_record(major, institution, answer, criterion, score):
+    # Save in the required JSON format
+    return {
+        'major': major,
+        'school': institution,
+        'question': answer,
+        'criterion': criterion,
+        'reward_score': score
+    }
+
+def handle_generated_question(prompt, answer, major, criterion, institution):
+    """Return the fixed-up question, or None after logging it as invalid."""
+    answer = fix_question_mark(answer)
+
+    reason = rejection_reason(answer)
+    if reason is not None:
+        run_metrics.reject(reason)
+        print(f"Invalid or empty question generated: {answer}")
+        save_invalid_question(prompt, answer, major, criterion, institution)
+        return None
+    return answer
+
+def build_near_duplicate_filter(queue):
+    """Create the per-run near-duplicate filter, seeded with questions already in the queue."""
+    global near_duplicates
+    if DEDUPE_THRESHOLD is None:
+        near_duplicates = None
+        return None
+    near_duplicates = NearDuplicateFilter(threshold=DEDUPE_THRESHOLD)
+    for cell, records in queue.cells.items():
+        for record in records:
+            near_duplicates.add(cell, record['question'])
+    return near_duplicates
+
+def is_near_duplicate(answer, major, criterion, institution):
+    if near_duplicates is None:
+        return False
+    if near_duplicates.is_duplicate(cell_key(institution, major, criterion), answer):
+        run_metrics.reject("near_duplicate")
+        print(f"Near-duplicate question skipped: {answer}")
+        return True
+    return False
+
+def remember_question(record):
+    """Add an accepted question to the near-duplicate filter so later candidates are checked against it."""
+    if near_duplicates is not None:
+        near_duplicates.add(record_cell(record), record['question'])
 
-    for program in programs:
+def build_prescorer(queue):
+    """Create the per-run pre-scorer and train it on the scored questions already in the queue."""
+    global prescorer
+    if not USE_PRESCORER:
+        prescorer = None
+        return None
+    prescorer = PreScorer(threshold=PRESCORE_THRESHOLD, drop_quantile=PRESCORE_DROP_QUANTILE,
+                          min_samples=PRESCORE_MIN_SAMPLES, audit_rate=PRESCORE_AUDIT_RATE)
+    prescorer.fit((cell, record) for cell, records in queue.cells.items() for record in records)
+    return prescorer
+
+def prescore(answer, major, criterion, institution):
+    """Return (send to the reward model?, predicted score or None)."""
+    if prescorer is None:
+        return True, None
+    send, predicted = prescorer.should_score(cell_key(institution, major, criterion), answer, major, institution)
+    if not send:
+        run_metrics.reject("prescore")
+        print(f"Question skipped by pre-scorer (predicted {predicted:.2f}): {answer}")
+    return send, predicted
+
+def observe_reward(predicted, score):
+    if prescorer is not None:
+        prescorer.observe(predicted, score)
+
+def generate_questions(program, criterion, count=1):
+    """Run one generation round for a (major, criterion) cell.
+
+    Each candidate is validated and scored on its own; the accepted records (at most
+    count of them) are returned, so callers loop until the cell is filled.
+    """
+    major = program['major']
+    institution = program['institution']
+    prompt = build_prompt(major, institution, criterion)
+
+    print(f"Generating {criterion} question for {major} at {institution}...")
+    records = []
+    slot = next_generation_slot(institution, major, criterion)
+    for candidate in generate_candidates(prompt, count, cache_slot=slot):
+        answer = handle_generated_question(prompt, candidate, major, criterion, institution)
+        if answer is None or is_near_duplicate(answer, major, criterion, institution):
+            continue
+        send, predicted = prescore(answer, major, criterion, institution)
+        if not send:
+            continue
+
+        # Call reward model for scoring
+        try:
+            score = call_nim_reward_model(prompt, answer)
+        except RewardScoreError as e:
+            print(f"Reward scoring failed, question not recorded: {e}")
+            nim.metrics['unscored_questions'] += 1
+            run_metrics.reject("unscored")
+            continue
+        observe_reward(predicted, score)
+        print(f"Generated question for {major}: {answer} (Score: {score:.2f})")
+
+        record = question_record(major, institution, answer, criterion, score)
+        save_valid_question(dict(record))
+        remember_question(record)
+        records.append(record)
+    return records
+
+# Pipeline stages for the asyncio engine. Items are dicts carrying the cell, program,
+# prompt and candidate text; each stage returns the item or None to drop it.
+
+def clean_stage(item):
+    item['question'] = fix_question_mark(item['text'])
+    return item
+
+def validate_stage(item):
+    question = item['question']
+    reason = rejection_reason(question)
+    if reason is not None:
+        run_metrics.reject(reason)
+        program = item['program']
+        print(f"Invalid or empty question generated: {question}")
+        save_invalid_question(item['prompt'], question, program['major'], item['criterion'], program['institution'])
+        return None
+    return item
+
+def dedupe_stage(item):
+    program = item['program']
+    if is_near_duplicate(item['question'], program['major'], item['criterion'], program['institution']):
+        return None
+    return item
+
+def prescore_stage(item):
+    program = item['program']
+    send, item['prescore'] = prescore(item['question'], program['major'], item['criterion'], program['institution'])
+    return item if send else None
+
+async def score_stage(item):
+    # Call reward model for scoring
+    try:
+        item['score'] = await async_call_nim_reward_model(item['prompt'], item['question'])
+    except RewardScoreError as e:
+        print(f"Reward scoring failed, question not recorded: {e}")
+        nim.metrics['unscored_questions'] += 1
+        run_metrics.reject("unscored")
+        return None
+    observe_reward(item['prescore'], item['score'])
+    print(f"Generated question for {item['program']['major']}: {item['question']} (Score: {item['score']:.2f})")
+    return item
+
+def sink_stage(queue):
+    def save(item):
+        program = item['program']
+        # Candidates of one cell are deduplicated concurrently before scoring, so check again
+        # against the questions accepted since; the sink has a single worker
+        if is_near_duplicate(item['question'], program['major'], item['criterion'], program['institution']):
+            return None
+        record = question_record(program['major'], program['institution'], item['question'], item['criterion'], item['score'])
+        save_valid_question(dict(record))
+        queue.record(record)
+        remember_question(record)
+        return record
+    return save
+
+def generate_source(programs_by_cell):
+    async def generate(cell, count):
+        program = programs_by_cell[cell]
+        criterion = cell[2]
         major = program['major']
         institution = program['institution']
-        criteria_descriptions = program['criteria_descriptions']
-
-        for criterion in ['Interests', 'Skills', 'Experiences']:
-            question_count = 0
-            while question_count < required_questions_per_criterion:
-                criterion_description = criteria_descriptions.get(criterion, "No description available")
-                print(f"Generating {criterion} question for {major} at {institution}...")
-
-                theme = f"{major} ({criterion})"
-
-                if criterion == 'Interests':
-                    prompt = (
-                        f"Generate a concise question to assess a student's interest in the major '{major}' "
-                        f"({institution}), focusing on {theme}. Ensure it ends with a question mark and is 5-25 words. "
-                        "Ensure the question is suitable for pre-university students to answer. "
-                        "Return only the question in first-person mode, as though you are actively asking the student."
-                        "Ensure there is no mention of the major or institution name."
-                        "Ensure the question does not assume any predefined knowledge or experience."
-                        "Ensure the question ends with a question mark."
-                        "Explore intresting aspects of the major, such as its relevance to the student's future career or personal growth."
-                        "Explore intresting ways of framing the question, such as posing hyptothethical scenarios or asking the student to reflect on their own experiences."
-                    )
-                elif criterion == 'Skills':
-                    prompt = (
-                        f"Generate a concise question to assess a student's skills relevant to the major '{major}' "
-                        f"({institution}), focusing on {theme}. Ensure it ends with a question mark and is 5-25 words. "
-                        "Ensure the question is suitable for pre-university students to answer. "
-                        "Return only the question in first-person mode, as though you are actively asking the student."
-                        "Ensure there is no mention of the major or institution name."
-                        "Ensure the question does not assume any predefined knowledge or experience." 
-                        "Ensure the question ends with a question mark." 
-                        "Explore intresting aspects of the major, such as its relevance to the student's future career or personal growth."
-                        "Explore intresting ways of framing the question, such as posing hyptothethical scenarios or asking the student to reflect on their own experiences."                      
-                    )
-                else:
-                    prompt = (
-                        f"Generate a concise question to assess a student's experiences relevant to the major '{major}' "
-                        f"({institution}), focusing on {theme}. Ensure it ends with a question mark and is 5-25 words. "
-                        "Ensure the question is suitable for pre-university students to answer. "
-                        "Return only the question in first-person mode, as though you are actively asking the student."
-                        "Ensure there is no mention of the major or institution name."
-                        "Ensure the question does not assume any predefined knowledge or experience."
-                        "Ensure the question ends with a question mark."
-                        "Explore intresting aspects of the major, such as its relevance to the student's future career or personal growth."
-                        "Explore intresting ways of framing the question, such as posing hyptothethical scenarios or asking the student to reflect on their own experiences."   
-                        )
-
-                answer = generate_text(prompt)
-                answer = fix_question_mark(answer)
-
-                if not answer.strip() or not is_valid_question(answer):
-                    print(f"Invalid or empty question generated: {answer}")
-                    save_invalid_question(prompt, answer, major, criterion, institution)
-                    continue
-
-                # Call reward model for scoring
-                score = call_nim_reward_model(prompt, answer)
-                print(f"Generated question for {major}: {answer} (Score: {score:.2f})")
-
-                
-
-                # Save in the required JSON format
-                synthetic_data.append({
-                    'major': major,
-                    'school': institution,
-                    'question': answer,
-                    'criterion': criterion,
-                    'reward_score': score
-                })
-                save_valid_question({
-                    'major': major,
-                    'school': institution,
-                    'question': answer,
-                    'criterion': criterion,
-                    'reward_score': score
-                })
-                question_count += 1
-
-                if len(synthetic_data) % 50 == 0:
-                    save_checkpoint(synthetic_data)
+        prompt = build_prompt(major, institution, criterion)
+        print(f"Generating {criterion} question for {major} at {institution}...")
+        slot = next_generation_slot(institution, major, criterion)
+        return [
+            {"cell": cell, "program": program, "criterion": criterion, "prompt": prompt, "text": text}
+            for text in await async_generate_candidates(prompt, count, cache_slot=slot)
+        ]
+    return generate
+
+def build_question_pipeline(queue, pending, max_concurrency):
+    """Wire generate -> clean -> validate -> dedupe -> score -> sink for the pending cells."""
+    programs_by_cell = {}
+    needed = {}
+    for program, criterion, missing in pending:
+        cell = cell_key(program['institution'], program['major'], criterion)
+        programs_by_cell[cell] = program
+        needed[cell] = missing
+    stages = [
+        Stage("clean", clean_stage),
+        Stage("validate", validate_stage),
+        Stage("dedupe", dedupe_stage),
+        Stage("prescore", prescore_stage),
+        Stage("score", score_stage, workers=max_concurrency),
+        Stage("sink", sink_stage(queue))
+    ]
+    return Pipeline(
+        generate_source(programs_by_cell), stages, DemandTracker(needed, BATCH_SIZE),
+        source_workers=max_concurrency, queue_size=2 * max_concurrency
+    )
+
+def report_throughput(accepted, started):
+    elapsed = time.time() - started
+    rate = accepted / elapsed if elapsed > 0 else 0.0
+    print(f"Accepted {accepted} questions in {elapsed:.1f}s ({rate:.2f} questions/s)")
 
+def schedule_cells(queue, programs, include=None):
+    """Cells that still need questions, in the order the run should fill them."""
+    pending = queue.schedule(programs, CRITERIA, REQUIRED_QUESTIONS_PER_CRITERION, include=include)
+    if SCHEDULE_MODE == "deficit":
+        pending.sort(key=lambda cell: -cell[2])
+        print(f"Deficit top-up: {sum(missing for _, _, missing in pending)} questions missing across {len(pending)} cells")
+        for program, criterion, missing in pending[:10]:
+            print(f"  {program['institution']} / {program['major']} / {criterion}: {missing} missing")
+    print(f"{len(pending)} (major, criterion) cells still need questions")
+    return pending
+
+def finish_run(queue, programs, accepted, started):
+    queue.close()
+    synthetic_data = queue.data(programs, CRITERIA)
     save_synthetic_data(synthetic_data)
+    export_question_logs()
+    if near_duplicates is not None:
+        near_duplicates.report()
+    if prescorer is not None:
+        prescorer.report()
+    if response_cache is not None:
+        response_cache.report()
+    nim.report()
+    report_throughput(accepted, started)
+    run_metrics.export(METRICS_PROM_PATH, METRICS_JSON_PATH, client_metrics=nim.metrics)
     print("Quiz question generation completed!")
     return synthetic_data
 
+def generate_quiz_questions(include=None):
+    queue = load_work_queue()
+    build_near_duplicate_filter(queue)
+    build_prescorer(queue)
+    programs = load_majors()
+    start_run_metrics()
+    started = time.time()
+    accepted = 0
+
+    pending = schedule_cells(queue, programs, include)
+    for program, criterion, missing in pending:
+        while missing > 0:
+            for record in generate_questions(program, criterion, min(BATCH_SIZE, missing)):
+                queue.record(record)
+                missing -= 1
+                accepted += 1
+
+    return finish_run(queue, programs, accepted, started)
+
+async def generate_quiz_questions_async(max_concurrency=MAX_CONCURRENCY, include=None):
+    """Concurrent version of generate_quiz_questions built on the streaming pipeline.
+
+    max_concurrency generation and scoring workers run at once, fed through bounded
+    queues, so generation and reward calls from many cells overlap. Cells are served
+    in the order the serial loop visits them, accepted questions go through the same
+    work queue, and the output is assembled in cell order, so the layout matches the
+    serial path.
+    """
+    queue = load_work_queue()
+    build_near_duplicate_filter(queue)
+    build_prescorer(queue)
+    programs = load_majors()
+    start_run_metrics()
+    started = time.time()
+    nim.limiter.set_maximum(max_concurrency)
+
+    pending = schedule_cells(queue, programs, include)
+    pipeline = build_question_pipeline(queue, pending, max(1, max_concurrency))
+    await pipeline.run()
+    pipeline.report()
+
+    return finish_run(queue, programs, pipeline.stages[-1].passed, started)
+
 if __name__ == "__main__":
     try:
         print("Starting data generation...")
-        synthetic_data = generate_quiz_questions()
+        if USE_ASYNC:
+            synthetic_data = asyncio.run(generate_quiz_questions_async(MAX_CONCURRENCY))
+        else:
+            synthetic_data = generate_quiz_questions()
         print("Process completed!")
     except Exception as e:
         import traceback
         print(f"Error: {e}")
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
@@ -0,0 +1,180 @@
+import asyncio
+import inspect
+import time
+from collections import Counter
+
+class Stage:
+    """One step of the question pipeline.
+
+    fn takes an item and returns the item to pass downstream, or None to drop it. It
+    may be a plain function (cleaning, validation, dedupe) or a coroutine function
+    (remote scoring). `workers` copies of the stage run concurrently.
+    """
+
+    def __init__(self, name, fn, workers=1):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.is_async = inspect.iscoroutinefunction(fn)
+        self.processed = 0
+        self.passed = 0
+        self.busy_seconds = 0.0
+
+    async def run_one(self, item):
+        started = time.perf_counter()
+        result = await self.fn(item) if self.is_async else self.fn(item)
+        self.busy_seconds += time.perf_counter() - started
+        self.processed += 1
+        if result is not None:
+            self.passed += 1
+        return result
+
+class DemandTracker:
+    """Tracks how many questions each cell still needs and how many are in flight.
+
+    Generation workers reserve candidates with next_request(); a candidate dropped by
+    any stage gives its reservation back, and an accepted one fills the cell. Cells
+    are served in the order given, and next_request() returns None once every cell
+    is full, which is also the point where nothing is left in the pipeline.
+    """
+
+    def __init__(self, needed, batch_size=1):
+        self.order = list(needed)
+        self.needed = dict(needed)
+        self.in_flight = Counter()
+        self.batch_size = max(1, batch_size)
+        self.first_open = 0
+        self.changed = None
+
+    def condition(self):
+        if self.changed is None:
+            self.changed = asyncio.Condition()
+        return self.changed
+
+    def reserve(self):
+        while self.first_open < len(self.order) and self.needed[self.order[self.first_open]] == 0:
+            self.first_open += 1
+        for cell in self.order[self.first_open:]:
+            available = self.needed[cell] - self.in_flight[cell]
+            if available > 0:
+                count = min(self.batch_size, available)
+                self.in_flight[cell] += count
+                return cell, count
+        return None
+
+    async def next_request(self):
+        async with self.condition():
+            while True:
+                request = self.reserve()
+                if request is not None:
+                    return request
+                if self.first_open >= len(self.order):
+                    return None
+                await self.changed.wait()
+
+    async def release(self, cell, count=1):
+        if count <= 0:
+            return
+        async with self.condition():
+            self.in_flight[cell] -= count
+            self.changed.notify_all()
+
+    async def accept(self, cell):
+        async with self.condition():
+            self.in_flight[cell] -= 1
+            self.needed[cell] -= 1
+            self.changed.notify_all()
+
+class Pipeline:
+    """Streaming generate -> stages... pipeline connected by bounded asyncio queues.
+
+    `source(cell, count)` is a coroutine returning up to `count` candidate items for a
+    cell; every item must carry its cell under item['cell']. Each stage reads from a
+    queue of at most queue_size items, so a slow stage (usually remote scoring) makes
+    the stages before it wait instead of piling up candidates in memory. Items that
+    come out of the last stage count as accepted.
+    """
+
+    def __init__(self, source, stages, tracker, source_workers=1, queue_size=32):
+        self.source = Stage("generate", source, source_workers)
+        self.stages = stages
+        self.tracker = tracker
+        self.queue_size = queue_size
+        self.queue_peaks = Counter()
+
+    async def source_worker(self, output):
+        while True:
+            request = await self.tracker.next_request()
+            if request is None:
+                return
+            cell, count = request
+            started = time.perf_counter()
+            items = await self.source.fn(cell, count)
+            self.source.busy_seconds += time.perf_counter() - started
+            self.source.processed += 1
+            self.source.passed += len(items)
+            await self.tracker.release(cell, count - len(items))
+            for item in items:
+                await output.put(item)
+                self.queue_peaks[0] = max(self.queue_peaks[0], output.qsize())
+
+    async def stage_worker(self, index, stage, queues):
+        last = index == len(self.stages) - 1
+        while True:
+            item = await queues[index].get()
+            try:
+                result = await stage.run_one(item)
+                if result is None:
+                    await self.tracker.release(item['cell'])
+                elif last:
+                    await self.tracker.accept(item['cell'])
+                else:
+                    await queues[index + 1].put(result)
+                    self.queue_peaks[index + 1] = max(self.queue_peaks[index + 1], queues[index + 1].qsize())
+            finally:
+                queues[index].task_done()
+
+    async def run(self):
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        stage_tasks = [
+            asyncio.create_task(self.stage_worker(index, stage, queues))
+            for index, stage in enumerate(self.stages)
+            for _ in range(stage.workers)
+        ]
+        source_tasks = [asyncio.create_task(self.source_worker(queues[0])) for _ in range(self.source.workers)]
+        pending = set(stage_tasks + source_tasks)
+        try:
+            # Sources finish once every cell is full; stop early if any worker fails
+            while not all(task.done() for task in source_tasks):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        raise task.exception()
+        finally:
+            for task in stage_tasks + source_tasks:
+                task.cancel()
+            await asyncio.gather(*stage_tasks, *source_tasks, return_exceptions=True)
+
+    def report(self):
+        print("Pipeline stages:")
+        for index, stage in enumerate([self.source] + self.stages):
+            rate = stage.processed / stage.busy_seconds if stage.busy_seconds > 0 else 0.0
+            peak = f", queue peak {self.queue_peaks[index - 1]}/{self.queue_size}" if index > 0 else ""
+            print(f"  {stage.name}: {stage.processed} in, {stage.passed} out, "
+                  f"{stage.busy_seconds:.2f}s busy ({rate:.1f} items/s per worker){peak}")
+
+async def benchmark_stage(stage, items):
+    """Run a stage on its own over items and return its throughput in items per second."""
+    started = time.perf_counter()
+    passed = 0
+    for item in items:
+        if await stage.run_one(dict(item)) is not None:
+            passed += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "stage": stage.name,
+        "items": len(items),
+        "passed": passed,
+        "seconds": elapsed,
+        "items_per_second": len(items) / elapsed if elapsed > 0 else 0.0
+    }
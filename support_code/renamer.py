@@ -0,0 +1,120 @@
+import json
+import os
+from codestitleinstitutiondescriptionextractor import iter_json_array
+
+# File paths: catalogues named in the rules file are read from and rewritten in DATA_PATH
+DATA_PATH = r"C:\Users\Josh\Desktop\Josh's webstie\adviseekapp\public\school-data"
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "renaming_rules.json")
+# Report the changes instead of rewriting the catalogue
+DRY_RUN = False
+
+def compile_rules(rules):
+    """Turn a catalogue's rule list into two hash tables.
+
+    Each rule prepends its text to the catalogue number of the courses it lists, either
+    as exact {"catalogue_number", "course_name"} pairs or by title alone
+    ("course_names"). Returns ({(number, title): prepend}, {title: prepend}, the set of
+    (number, title) pairs the pair rules produce); a course listed under two different
+    prepends is an error.
+    """
+    by_pair, by_title = {}, {}
+    for position, rule in enumerate(rules):
+        prepend = rule["prepend"]
+        keys = [(by_pair, (pair["catalogue_number"], pair["course_name"])) for pair in rule.get("course_pairs", [])]
+        keys += [(by_title, title) for title in rule.get("course_names", [])]
+        for table, key in keys:
+            if table.get(key, prepend) != prepend:
+                raise ValueError(f"Rule {position} prepends {prepend!r} to {key!r}, already given {table[key]!r}")
+            table[key] = prepend
+    renamed = {(f"{prepend}{number}", title) for (number, title), prepend in by_pair.items()}
+    return by_pair, by_title, renamed
+
+def renamed_number(number, title, by_pair, by_title, renamed=frozenset()):
+    """The new catalogue number for a course, or None if no rule applies.
+
+    Exact pairs win over title rules. A number that already starts with the prepended
+    text, or that a pair rule produced, is left alone, so running the rules twice
+    changes nothing.
+    """
+    if (number, title) in renamed:
+        return None
+    prepend = by_pair.get((number, title)) or by_title.get(title)
+    if prepend is None or number.startswith(prepend):
+        return None
+    return f"{prepend}{number}"
+
+def write_indented_array(path, texts):
+    """Write already encoded items as a json.dump(..., indent=4) style array, atomically."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("[")
+        count = 0
+        for text in texts:
+            f.write(",\n    " if count else "\n    ")
+            f.write(text)
+            count += 1
+        f.write("\n]" if count else "]")
+    os.replace(tmp_path, path)
+
+def rename_catalogue(path, catalogue_rules, dry_run=DRY_RUN):
+    """Apply one catalogue's rules in a single streaming pass.
+
+    Returns a summary with the (old number, new number, title) of every change and the
+    rule keys that matched nothing. With dry_run the catalogue is not rewritten.
+    Untouched items are copied through as their source text; only renamed items are
+    encoded again, which keeps the pass close to the speed of reading the file.
+    """
+    by_pair, by_title, renamed = compile_rules(catalogue_rules["rules"])
+    code_field, title_field = catalogue_rules["code_field"], catalogue_rules["title_field"]
+    changes = []
+    used_pairs, used_titles = set(), set()
+    summary = {"items": 0}
+
+    def texts():
+        for item, text in iter_json_array(path, with_text=True):
+            summary["items"] += 1
+            number, title = item.get(code_field), item.get(title_field)
+            if number is not None and title is not None:
+                if (number, title) in by_pair:
+                    used_pairs.add((number, title))
+                elif title in by_title:
+                    used_titles.add(title)
+                new_number = renamed_number(number, title, by_pair, by_title, renamed)
+                if new_number is not None:
+                    changes.append((number, new_number, title))
+                    item[code_field] = new_number
+                    text = json.dumps(item, indent=4).replace("\n", "\n    ")
+            yield text
+
+    if dry_run:
+        for _ in texts():
+            pass
+    elif by_pair or by_title:
+        write_indented_array(path, texts())
+    summary["changes"] = changes
+    summary["unused"] = [pair for pair in by_pair if pair not in used_pairs] + \
+                        [title for title in by_title if title not in used_titles]
+    return summary
+
+def print_diff(name, summary):
+    for old, new, title in summary["changes"]:
+        print(f"- {old}\t{title}\n+ {new}\t{title}")
+    for key in summary["unused"]:
+        print(f"  unused rule: {key}")
+    print(f"{name}: {len(summary['changes'])} of {summary['items']} courses renamed")
+
+def rename_all(rules_path=RULES_PATH, data_path=DATA_PATH, dry_run=DRY_RUN):
+    with open(rules_path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    summaries = {}
+    for name, catalogue_rules in rules.items():
+        path = os.path.join(data_path, catalogue_rules["input"])
+        summaries[name] = rename_catalogue(path, catalogue_rules, dry_run)
+        if dry_run:
+            print_diff(name, summaries[name])
+        else:
+            print(f"{name}: renamed {len(summaries[name]['changes'])} of {summaries[name]['items']} courses in {path}")
+    return summaries
+
+if __name__ == "__main__":
+    rename_all()
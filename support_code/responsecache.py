@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a request has no cached response."""
+
+def cache_key(request, slot=None):
+    """Content address for a chat completion request.
+
+    The key covers the model, messages and sampling parameters, plus an optional slot
+    that tells apart repeated samples of the same prompt (e.g. the n-th question of a
+    cell), so a rerun gets back the same sequence of responses.
+    """
+    payload = json.dumps({"request": request, "slot": slot}, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """Persistent LLM response cache in a single SQLite file with LRU eviction.
+
+    mode is "readwrite" (serve hits, store misses) or "replay" (serve hits, raise
+    CacheMiss otherwise, never write). Once the stored responses exceed max_bytes the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024, mode="readwrite"):
+        if mode not in ("readwrite", "replay"):
+            raise ValueError(f"Unknown cache mode '{mode}'")
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self.db.commit()
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key):
+        row = self.db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            if self.mode == "replay":
+                raise CacheMiss(f"No cached response for {key}")
+            return None
+        self.hits += 1
+        if self.mode == "readwrite":
+            self.db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        return json.loads(row[0])
+
+    def put(self, key, response):
+        if self.mode == "replay":
+            return
+        text = json.dumps(response, ensure_ascii=False)
+        size = len(text.encode('utf-8'))
+        previous = self.db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses (key, response, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, text, size, time.time())
+        )
+        self.total_bytes += size - (previous[0] if previous else 0)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+        self.db.commit()
+
+    def evict(self):
+        # Drop least recently used entries until the cache is back under 90% of its budget
+        target = self.max_bytes * 0.9
+        rows = self.db.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def report(self):
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        print(f"Response cache ({self.mode}): {self.hits} hits, {self.misses} misses ({rate:.1%} hit rate), "
+              f"{self.evictions} evictions, {self.total_bytes / (1024 * 1024):.1f} MB stored")
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "bytes": self.total_bytes}
+
+    def close(self):
+        self.db.close()
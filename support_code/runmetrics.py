@@ -0,0 +1,215 @@
+import json
+import math
+import os
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+# Upper bounds in seconds; NIM calls range from sub-second cache-warm replies to minute-long retries
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            running += count
+            yield bound, running
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation inside its bucket, like histogram_quantile()."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        lower = 0.0
+        previous = 0
+        for bound, running in self.cumulative():
+            if running >= rank:
+                if math.isinf(bound):
+                    return self.buckets[-1]
+                in_bucket = running - previous
+                return lower + (bound - lower) * ((rank - previous) / in_bucket if in_bucket else 0.0)
+            lower = bound
+            previous = running
+        return self.buckets[-1]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum_seconds": self.sum,
+            "mean_seconds": self.sum / self.count if self.count else 0.0,
+            "p50_seconds": self.quantile(0.5),
+            "p90_seconds": self.quantile(0.9),
+            "p99_seconds": self.quantile(0.99)
+        }
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def labels(**pairs):
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs.items()) + "}"
+
+def format_bound(bound):
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+def write_atomic(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def histogram_lines(name, description, histograms):
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for model in sorted(histograms):
+        histogram = histograms[model]
+        for bound, running in histogram.cumulative():
+            lines.append(f"{name}_bucket{labels(model=model, le=format_bound(bound))} {running}")
+        lines.append(f"{name}_sum{labels(model=model)} {histogram.sum}")
+        lines.append(f"{name}_count{labels(model=model)} {histogram.count}")
+    return lines
+
+class RunMetrics:
+    """Per-call and per-question metrics for one generation run.
+
+    Request latency is recorded per model for every HTTP attempt, without the time
+    spent waiting for rate limits, the circuit breaker or backoff. The end-to-end time
+    of each call, waits and retries included, is a separate histogram alongside the
+    token counts; cache hits are counted separately. Rejected candidates are counted by reason and accepted questions by
+    institution, bucketed by minute since the run started.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.latency = defaultdict(Histogram)
+        self.call_duration = defaultdict(Histogram)
+        self.calls = Counter()
+        self.tokens = Counter()
+        self.retries = Counter()
+        self.rejections = Counter()
+        self.accepted = Counter()
+        self.accepted_by_minute = defaultdict(Counter)
+
+    def observe_request(self, model, seconds, outcome="ok"):
+        self.latency[model].observe(seconds)
+
+    def observe_call(self, model, seconds, usage=None, outcome="ok"):
+        self.call_duration[model].observe(seconds)
+        self.calls[(model, outcome)] += 1
+        if usage:
+            self.tokens[(model, "prompt")] += usage.get('prompt_tokens', 0)
+            self.tokens[(model, "completion")] += usage.get('completion_tokens', 0)
+
+    def observe_cache_hit(self, model):
+        self.calls[(model, "cache_hit")] += 1
+
+    def observe_retry(self, model):
+        self.retries[model] += 1
+
+    def reject(self, reason):
+        self.rejections[reason] += 1
+
+    def accept(self, institution):
+        self.accepted[institution] += 1
+        self.accepted_by_minute[institution][int((time.time() - self.started) // 60)] += 1
+
+    def elapsed_minutes(self):
+        return max(time.time() - self.started, 1e-9) / 60
+
+    def accepted_per_minute(self):
+        minutes = self.elapsed_minutes()
+        return {institution: count / minutes for institution, count in self.accepted.items()}
+
+    def summary(self, client_metrics=None):
+        models = sorted({model for model, _ in self.calls} | set(self.latency) | set(self.call_duration))
+        return {
+            "started": self.started,
+            "elapsed_seconds": self.elapsed_minutes() * 60,
+            "models": {
+                model: {
+                    "latency": self.latency[model].summary() if model in self.latency else Histogram().summary(),
+                    "end_to_end_latency": (self.call_duration[model].summary() if model in self.call_duration
+                                           else Histogram().summary()),
+                    "calls": {outcome: count for (m, outcome), count in self.calls.items() if m == model},
+                    "prompt_tokens": self.tokens[(model, "prompt")],
+                    "completion_tokens": self.tokens[(model, "completion")],
+                    "retries": self.retries[model]
+                }
+                for model in models
+            },
+            "rejections": dict(self.rejections),
+            "accepted": dict(self.accepted),
+            "accepted_per_minute": self.accepted_per_minute(),
+            "accepted_by_minute": {
+                institution: {str(minute): count for minute, count in sorted(minutes.items())}
+                for institution, minutes in self.accepted_by_minute.items()
+            },
+            "client": dict(client_metrics or {})
+        }
+
+    def prometheus_text(self, client_metrics=None):
+        lines = histogram_lines("quiz_nim_request_duration_seconds",
+                                "NIM HTTP request latency per attempt, excluding rate-limit, breaker and backoff waits.",
+                                self.latency)
+        lines += histogram_lines("quiz_nim_call_duration_seconds",
+                                 "End-to-end NIM call time including waits and retries.", self.call_duration)
+
+        lines += ["# HELP quiz_nim_calls_total NIM calls by outcome.", "# TYPE quiz_nim_calls_total counter"]
+        for (model, outcome), count in sorted(self.calls.items()):
+            lines.append(f"quiz_nim_calls_total{labels(model=model, outcome=outcome)} {count}")
+
+        lines += ["# HELP quiz_nim_tokens_total Tokens reported by the endpoint.", "# TYPE quiz_nim_tokens_total counter"]
+        for (model, kind), count in sorted(self.tokens.items()):
+            lines.append(f"quiz_nim_tokens_total{labels(model=model, kind=kind)} {count}")
+
+        lines += ["# HELP quiz_nim_retries_total Retried NIM attempts.", "# TYPE quiz_nim_retries_total counter"]
+        for model, count in sorted(self.retries.items()):
+            lines.append(f"quiz_nim_retries_total{labels(model=model)} {count}")
+
+        lines += ["# HELP quiz_nim_client_events_total Rate limiting and failure events.",
+                  "# TYPE quiz_nim_client_events_total counter"]
+        for event, value in sorted((client_metrics or {}).items()):
+            lines.append(f"quiz_nim_client_events_total{labels(event=event)} {value}")
+
+        lines += ["# HELP quiz_rejected_questions_total Candidates dropped, by reason.",
+                  "# TYPE quiz_rejected_questions_total counter"]
+        for reason, count in sorted(self.rejections.items()):
+            lines.append(f"quiz_rejected_questions_total{labels(reason=reason)} {count}")
+
+        lines += ["# HELP quiz_accepted_questions_total Questions accepted, by institution.",
+                  "# TYPE quiz_accepted_questions_total counter"]
+        for institution, count in sorted(self.accepted.items()):
+            lines.append(f"quiz_accepted_questions_total{labels(institution=institution)} {count}")
+
+        lines += ["# HELP quiz_accepted_questions_per_minute Accepted questions per minute over the run.",
+                  "# TYPE quiz_accepted_questions_per_minute gauge"]
+        for institution, rate in sorted(self.accepted_per_minute().items()):
+            lines.append(f"quiz_accepted_questions_per_minute{labels(institution=institution)} {rate}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, prometheus_path, json_path, client_metrics=None):
+        write_atomic(prometheus_path, self.prometheus_text(client_metrics))
+        write_atomic(json_path, json.dumps(self.summary(client_metrics), indent=2))
+        print(f"Run metrics saved to {prometheus_path} and {json_path}")
@@ -0,0 +1,138 @@
+import asyncio
+import multiprocessing
+import os
+import zlib
+from collections import defaultdict
+import quizgenerator
+from jsonlsink import JsonlSink, read_jsonl, write_jsonl
+from workqueue import ordered_records, record_cell
+
+# Shard settings: cells are spread over NUM_SHARDS processes. Set RUN_SHARDS to a list
+# of shard indexes (e.g. [2]) to re-run only those shards after a crash.
+NUM_SHARDS = 4
+RUN_SHARDS = None
+SHARD_ROOT = os.path.join(quizgenerator.DATA_PATH, "quiz_shards")
+# Per-run outputs that each shard writes into its own directory; the response cache stays shared
+SHARD_PATHS = {
+    "OUTPUT_PATH": "quiz_questions.json",
+    "CHECKPOINT_PATH": "quiz_checkpoint.json",
+    "WORK_QUEUE_PATH": "quiz_checkpoint.jsonl",
+    "WORK_QUEUE_ROUNDS_PATH": "quiz_checkpoint.rounds.jsonl",
+    "INVALID_PATH": "invalid_questions.json",
+    "VALID_PATH": "valid_questions.json",
+    "INVALID_JSONL_PATH": "invalid_questions.jsonl",
+    "VALID_JSONL_PATH": "valid_questions.jsonl",
+    "METRICS_PROM_PATH": "quiz_metrics.prom",
+    "METRICS_JSON_PATH": "quiz_metrics.json"
+}
+
+def shard_for_cell(cell, num_shards):
+    """Shard index of an (institution, major, criterion) cell.
+
+    CRC32 of the cell key rather than hash(), which is salted per process, so every
+    process and every rerun agrees on the assignment.
+    """
+    return zlib.crc32("|".join(cell).encode('utf-8')) % num_shards
+
+def shard_directory(index, num_shards):
+    return os.path.join(SHARD_ROOT, f"shard-{index:02d}-of-{num_shards:02d}")
+
+def shard_journal(index, num_shards, name="WORK_QUEUE_PATH"):
+    return os.path.join(shard_directory(index, num_shards), SHARD_PATHS[name])
+
+def seed_shard_journal(index, num_shards, name="WORK_QUEUE_PATH"):
+    """Start a new shard journal from the shard's cells in the main journal of the same
+    name, which run_shards has already seeded."""
+    path = shard_journal(index, num_shards, name)
+    if os.path.exists(path):
+        return 0
+    main_path = getattr(quizgenerator, name)
+    records = [r for r in read_jsonl(main_path) if shard_for_cell(record_cell(r), num_shards) == index]
+    with JsonlSink(path, fsync_every=len(records) or 1) as sink:
+        for record in records:
+            sink.append(record)
+    print(f"Seeded shard {index} journal with {len(records)} entries from {main_path}")
+    return len(records)
+
+def owned_records(num_shards, name="WORK_QUEUE_PATH"):
+    """{cell: [entries]} of a journal, each cell taken only from the shard that owns it."""
+    cells = defaultdict(list)
+    for index in range(num_shards):
+        for record in read_jsonl(shard_journal(index, num_shards, name)):
+            cell = record_cell(record)
+            if shard_for_cell(cell, num_shards) == index:
+                cells[cell].append(record)
+    return cells
+
+def run_shard(index, num_shards):
+    """Generate the questions for one shard's cells; safe to call again after a crash."""
+    directory = shard_directory(index, num_shards)
+    os.makedirs(directory, exist_ok=True)
+    seed_shard_journal(index, num_shards)
+    seed_shard_journal(index, num_shards, "WORK_QUEUE_ROUNDS_PATH")
+    for name, filename in SHARD_PATHS.items():
+        setattr(quizgenerator, name, os.path.join(directory, filename))
+    quizgenerator.SEED_WORK_QUEUE = False
+
+    # Shards share the endpoint, so each gets its slice of the rate limit and concurrency
+    quizgenerator.RATE_LIMIT_PER_MINUTE = quizgenerator.RATE_LIMIT_PER_MINUTE / num_shards
+    quizgenerator.MAX_CONCURRENCY = max(1, quizgenerator.MAX_CONCURRENCY // num_shards)
+    quizgenerator.configure_client()
+
+    def in_shard(cell):
+        return shard_for_cell(cell, num_shards) == index
+
+    print(f"Shard {index}/{num_shards}: writing to {directory}")
+    if quizgenerator.USE_ASYNC:
+        asyncio.run(quizgenerator.generate_quiz_questions_async(quizgenerator.MAX_CONCURRENCY, include=in_shard))
+    else:
+        quizgenerator.generate_quiz_questions(include=in_shard)
+
+def run_shards(num_shards=NUM_SHARDS, indexes=None):
+    """Run shards in separate processes and return the indexes of shards that failed.
+
+    The main journal and the catalogue snapshot are shared by every shard, so they are
+    seeded and built here, once, before any process starts; the shards only read them.
+    """
+    indexes = list(range(num_shards)) if indexes is None else list(indexes)
+    quizgenerator.seed_work_queue()
+    quizgenerator.load_majors()
+    context = multiprocessing.get_context("spawn")
+    processes = {index: context.Process(target=run_shard, args=(index, num_shards)) for index in indexes}
+    for process in processes.values():
+        process.start()
+    failed = []
+    for index, process in processes.items():
+        process.join()
+        if process.exitcode != 0:
+            failed.append(index)
+            print(f"Shard {index} exited with code {process.exitcode}; re-run it with run_shards({num_shards}, [{index}])")
+    return failed
+
+def merge_shards(num_shards=NUM_SHARDS):
+    """Combine shard journals into quiz_questions.json and the main work queue journal.
+
+    Each cell is taken only from the shard that owns it, so rerunning the merge or a
+    shard never duplicates questions. The result has the same cell order as an
+    unsharded run, which is the layout splittingfiles.py splits per major.
+    """
+    missing = [index for index in range(num_shards) if not os.path.exists(shard_journal(index, num_shards))]
+    if missing:
+        raise FileNotFoundError(f"Shards {missing} have no journal yet; run them before merging")
+
+    programs = quizgenerator.load_majors()
+    merged = ordered_records(owned_records(num_shards), programs, quizgenerator.CRITERIA)
+    write_jsonl(quizgenerator.WORK_QUEUE_PATH, merged)
+    # Keep the round numbering too, so a later unsharded run does not reuse cache slots
+    rounds = ordered_records(owned_records(num_shards, "WORK_QUEUE_ROUNDS_PATH"), programs, quizgenerator.CRITERIA)
+    write_jsonl(quizgenerator.WORK_QUEUE_ROUNDS_PATH, rounds)
+    quizgenerator.save_synthetic_data(merged)
+    print(f"Merged {len(merged)} questions from {num_shards} shards")
+    return merged
+
+if __name__ == "__main__":
+    failed = run_shards(NUM_SHARDS, RUN_SHARDS)
+    if failed:
+        print(f"Not merging: shards {failed} did not finish")
+    else:
+        merge_shards(NUM_SHARDS)
@@ -0,0 +1,68 @@
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import tempfile
+import quizgenerator
+from neardedupe import NearDuplicateFilter
+from quizpipeline import Stage, benchmark_stage
+
+# Benchmark settings: the local stages are timed over questions already in the shipped banks
+QUESTION_BANK_GLOB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "quiz_refer",
+                                  "Open_ended_quiz_questions", "*.json")
+MAX_ITEMS = 20000
+
+def load_bank_items(limit=MAX_ITEMS):
+    """Turn stored questions into pipeline items, as if the LLM had just produced them."""
+    items = []
+    for path in sorted(glob.glob(QUESTION_BANK_GLOB)):
+        with open(path, 'r', encoding='utf-8') as f:
+            bank = json.load(f)
+        if not isinstance(bank, list):
+            continue
+        for entry in bank:
+            if 'major' not in entry:
+                continue
+            program = {"major": entry['major'], "institution": entry['school']}
+            cell = quizgenerator.cell_key(entry['school'], entry['major'], entry['criterion'])
+            items.append({"cell": cell, "program": program, "criterion": entry['criterion'],
+                          "prompt": "", "text": entry['question']})
+            if len(items) >= limit:
+                return items
+    return items
+
+def accepting_dedupe_stage(item):
+    """dedupe_stage, treating every question that passes as accepted by the sink."""
+    item = quizgenerator.dedupe_stage(item)
+    if item is not None:
+        quizgenerator.near_duplicates.add(item['cell'], item['question'])
+    return item
+
+async def run_stages(items):
+    results = [await benchmark_stage(Stage("clean", quizgenerator.clean_stage), items)]
+    # Later stages see cleaned items, as they do in the pipeline
+    cleaned = [quizgenerator.clean_stage(dict(item)) for item in items]
+    results.append(await benchmark_stage(Stage("validate", quizgenerator.validate_stage), cleaned))
+    quizgenerator.near_duplicates = NearDuplicateFilter(threshold=quizgenerator.DEDUPE_THRESHOLD)
+    results.append(await benchmark_stage(Stage("dedupe", accepting_dedupe_stage), cleaned))
+    return results
+
+def run_benchmark():
+    items = load_bank_items()
+    # Rejected questions are logged by the validate stage; keep them out of the real log
+    scratch = tempfile.mkdtemp()
+    quizgenerator.INVALID_PATH = os.path.join(scratch, "invalid_questions.json")
+    quizgenerator.INVALID_JSONL_PATH = os.path.join(scratch, "invalid_questions.jsonl")
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        results = asyncio.run(run_stages(items))
+        quizgenerator.export_question_logs()
+
+    print(f"\nStage benchmark over {len(items)} stored questions")
+    print(f"{'stage':>10} {'items':>7} {'passed':>7} {'seconds':>8} {'items/s':>10}")
+    for r in results:
+        print(f"{r['stage']:>10} {r['items']:>7} {r['passed']:>7} {r['seconds']:>8.2f} {r['items_per_second']:>10.0f}")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from catalogue import parse_programs
+from eligibility import requirements_entry, save_requirement_entries
+
+# File paths
+DATA_PATH = r"C:\Users\Josh\Downloads"
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standardization_rules.json")
+# Per-program content hashes from the last run, used to skip unchanged programs
+STATE_PATH = os.path.join(DATA_PATH, "standardizer_state.json")
+# Eligibility text parsed into score thresholds and subject requirements (see eligibility.py)
+REQUIREMENTS_PATH = os.path.join(DATA_PATH, "eligibility_requirements.json")
+INSTITUTIONS = ["NUS", "NTU", "SMU"]
+PARALLEL = False
+
+def content_hash(value):
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def program_keys(programs):
+    """Stable identity for each program; repeated (college, major, degree) triples get an occurrence suffix."""
+    seen = Counter()
+    keys = []
+    for program in programs:
+        key = "|".join([program.get("college", ""), program.get("major", ""), program.get("degree", "")])
+        seen[key] += 1
+        keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+    return keys
+
+def program_rule(rules, program):
+    """The part of an institution's rules that applies to one program.
+
+    Hashing this alongside the program means editing one major's rule only
+    re-transforms that major.
+    """
+    major = program["major"]
+    if rules["transform"] == "prerequisites":
+        shared = {name: value for name, value in rules.items()
+                  if name not in ("prerequisites", "default_prerequisites", "input", "output")}
+        shared["prerequisites"] = rules["prerequisites"].get(major, rules["default_prerequisites"])
+        return shared
+    return {
+        "transform": rules["transform"],
+        "assessment": rules["assessments"].get(major, rules["default_assessment"])
+    }
+
+def prerequisite_eligibility(eligibility, rule):
+    """Build GCE A-Level / IB / Polytechnic GPA entries from the per-major prerequisites (NUS)."""
+    grades = rule["grades"]
+    a_level_grades = next(
+        (entry["description"].replace(grades["remove"], "") for entry in eligibility if entry.get("criterion") == grades["criterion"]),
+        grades["default"]
+    )
+    assessments = rule["assessments"]
+    additional_assessments = next(
+        (entry["description"] for entry in eligibility if entry.get("criterion") == assessments["criterion"]),
+        assessments["default"]
+    )
+
+    standardized = []
+    for qual_type, requirements in rule["prerequisites"].items():
+        if qual_type in rule["skip_qualifications"]:
+            continue
+        description = ", ".join(requirements)
+        if qual_type == grades["prefix"]:
+            description = f"{a_level_grades}, {description}"
+        standardized.append({
+            "qualificationType": rule["qualification_types"].get(qual_type, qual_type),
+            "description": description
+        })
+    standardized.append({"qualificationType": "Additional Assessments", "description": additional_assessments})
+    return standardized
+
+def assessment_eligibility(eligibility, rule):
+    """Set the program's Additional Assessments entry (NTU, SMU), replacing one left by an earlier run."""
+    standardized = [entry for entry in eligibility if entry.get("qualificationType") != "Additional Assessments"]
+    standardized.append({"qualificationType": "Additional Assessments", "description": rule["assessment"]})
+    return standardized
+
+TRANSFORMS = {
+    "prerequisites": prerequisite_eligibility,
+    "additional_assessments": assessment_eligibility
+}
+
+def transform_program(program, rule):
+    criteria = program.get("criteria", {})
+    return {
+        "college": program["college"],
+        "major": program["major"],
+        "degree": program["degree"],
+        "criteria": {
+            "eligibility": TRANSFORMS[rule["transform"]](criteria.get("eligibility", []), rule),
+            "suitability": criteria.get("suitability", [])
+        }
+    }
+
+def write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def standardize_institution(institution, rules, previous_state, data_path=DATA_PATH):
+    """Standardize one institution's majors file, reusing unchanged programs from previous_state.
+
+    previous_state maps program key -> {"input", "output", "program"} hashes and the
+    standardized program. A program is re-transformed only when its input or its rule
+    changed; the output file is rewritten only when some program changed. Returns the
+    new state and a summary.
+    """
+    input_path = os.path.join(data_path, rules["input"])
+    output_path = os.path.join(data_path, rules["output"])
+    with open(input_path, 'r') as f:
+        data = json.load(f)
+    if "programs" not in data:
+        raise ValueError(f"{input_path} must contain a 'programs' key")
+
+    state = {}
+    programs = []
+    transformed = 0
+    skipped = []
+    for key, program in zip(program_keys(data["programs"]), data["programs"]):
+        if rules.get("skip_without_criteria") and "criteria" not in program:
+            skipped.append(program["major"])
+            continue
+        rule_hash = content_hash(program_rule(rules, program))
+        input_hash = content_hash(program)
+        cached = previous_state.get(key)
+        # When a file is standardized in place, the input is last run's output
+        if cached and cached["rule"] == rule_hash and input_hash in (cached["input"], cached["output"]):
+            standardized = cached["program"]
+        else:
+            standardized = transform_program(program, program_rule(rules, program))
+            transformed += 1
+        state[key] = {
+            "input": input_hash,
+            "rule": rule_hash,
+            "output": content_hash(standardized),
+            "program": standardized
+        }
+        programs.append(standardized)
+
+    removed = len(set(previous_state) - set(state))
+    rewrite = transformed or removed or list(previous_state) != list(state) or not os.path.exists(output_path)
+    if rewrite:
+        # Check the result against the catalogue schema the pipeline loads it with
+        parse_programs({"programs": programs}, institution, output_path)
+        write_json_atomic(output_path, {"programs": programs})
+    return state, {
+        "institution": institution,
+        "programs": len(programs),
+        "transformed": transformed,
+        "removed": removed,
+        "skipped": skipped,
+        "written": output_path if rewrite else None
+    }
+
+def load_rules(path=RULES_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def update_requirements(institutions, previous_state, state, requirements_path=REQUIREMENTS_PATH):
+    """Save the parsed eligibility requirements of every standardized program.
+
+    Each program's entry is kept in its state next to the standardized program, and only
+    programs whose output changed are parsed again; the file is rewritten only when some
+    entry changed. Returns (programs, parsed, written).
+    """
+    entries = []
+    previous_entries = []
+    parsed = 0
+    for name in institutions:
+        previous = previous_state.get(name, {})
+        previous_entries.extend(entry.get("requirements") for entry in previous.values())
+        for key, entry in state[name].items():
+            cached = previous.get(key)
+            if cached and cached["output"] == entry["output"] and "requirements" in cached:
+                entry["requirements"] = cached["requirements"]
+            else:
+                program, = parse_programs({"programs": [entry["program"]]}, name)
+                entry["requirements"] = requirements_entry(program)
+                parsed += 1
+            entries.append(entry["requirements"])
+    written = parsed or entries != previous_entries or not os.path.exists(requirements_path)
+    if written:
+        save_requirement_entries(entries, requirements_path)
+    return len(entries), parsed, written
+
+def standardize_all(institutions=INSTITUTIONS, parallel=PARALLEL, data_path=DATA_PATH, state_path=STATE_PATH,
+                    requirements_path=REQUIREMENTS_PATH):
+    """Standardize every institution in one pass (or one process each).
+
+    Also saves the hash state and the parsed eligibility requirements of the results.
+    """
+    rules = load_rules()
+    previous_state = load_state(state_path)
+    state = dict(previous_state)
+    jobs = [(name, rules[name], previous_state.get(name, {}), data_path) for name in institutions]
+    if parallel:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            results = list(pool.map(standardize_institution, *zip(*jobs)))
+    else:
+        results = [standardize_institution(*job) for job in jobs]
+
+    for (name, _, _, _), (institution_state, summary) in zip(jobs, results):
+        state[name] = institution_state
+        for major in summary["skipped"]:
+            print(f"Warning: Program {major} is missing 'criteria' field. Skipping.")
+        written = f"saved to {summary['written']}" if summary["written"] else "unchanged"
+        print(f"{name}: {summary['transformed']} of {summary['programs']} programs re-transformed, "
+              f"{summary['removed']} removed; {written}")
+
+    count, parsed, written = update_requirements(institutions, previous_state, state, requirements_path)
+    if written:
+        print(f"Parsed eligibility requirements for {parsed} of {count} programs into {requirements_path}")
+    else:
+        print(f"Eligibility requirements for {count} programs unchanged")
+    write_json_atomic(state_path, state)
+    return [summary for _, summary in results]
+
+if __name__ == "__main__":
+    standardize_all()
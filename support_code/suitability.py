@@ -0,0 +1,118 @@
+import os
+import numpy as np
+from catalogue import load_catalogue
+
+# File paths
+DATA_PATH = r"C:\Users\Josh\Downloads"
+MAJORS_FILES = {name: os.path.join(DATA_PATH, f"standardized_{name.lower()}_majors.json") for name in ("NUS", "NTU", "SMU")}
+CATALOGUE_SNAPSHOT_PATH = os.path.join(DATA_PATH, "majors_catalogue.pickle")
+MATRIX_PATH = os.path.join(DATA_PATH, "suitability_matrix.npz")
+# Scale each program's weights to sum to 1; a few programs sum to 1.004 or 1.16, which
+# would otherwise rank them above equally suited programs
+NORMALIZE_WEIGHTS = True
+
+def criteria_order(programs):
+    """Every suitability criterion in first-seen order, so all institutions share one column layout."""
+    names = {}
+    for program in programs:
+        for criterion in program.suitability:
+            names.setdefault(criterion.name, len(names))
+    return tuple(names)
+
+class SuitabilityMatrix:
+    """Programs x criteria suitability weights for scoring student profiles in bulk.
+
+    A profile maps criterion name -> the student's score on it (missing criteria count
+    as 0). Scoring is one matrix product: profiles (N x C) @ weights.T (C x P).
+
+    Programs with identical weight rows always score the same (the shipped files have
+    only a handful of distinct rows), so ranking scores the distinct rows and expands
+    each student's order of them into programs. Equal-weight programs keep catalogue order.
+    """
+
+    def __init__(self, weights, criteria, labels):
+        self.weights = weights
+        self.criteria = tuple(criteria)
+        self.column = {name: index for index, name in enumerate(self.criteria)}
+        # (institution, college, major, degree) per row
+        self.labels = [tuple(label) for label in labels]
+        self.distinct, profile_of = np.unique(weights, axis=0, return_inverse=True)
+        self.distinct_of = profile_of.reshape(-1)
+        self.members = [np.flatnonzero(self.distinct_of == index) for index in range(len(self.distinct))]
+
+    @classmethod
+    def from_programs(cls, programs, criteria=None, normalize=NORMALIZE_WEIGHTS):
+        criteria = criteria or criteria_order(programs)
+        column = {name: index for index, name in enumerate(criteria)}
+        weights = np.zeros((len(programs), len(criteria)))
+        for row, program in enumerate(programs):
+            for criterion in program.suitability:
+                if criterion.name in column:
+                    weights[row, column[criterion.name]] += criterion.weight
+        if normalize:
+            totals = weights.sum(axis=1, keepdims=True)
+            np.divide(weights, totals, out=weights, where=totals > 0)
+        labels = [(p.institution, p.college, p.major, p.degree) for p in programs]
+        return cls(weights, criteria, labels)
+
+    def save(self, path):
+        """Write the matrix as .npz (atomically), so scoring does not need the JSON files."""
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, weights=self.weights, criteria=np.array(self.criteria),
+                 labels=np.array(self.labels, dtype=str).reshape(len(self.labels), 4))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["weights"], data["criteria"].tolist(), data["labels"].tolist())
+
+    def profile_vector(self, profile):
+        vector = np.zeros(len(self.criteria))
+        for name, value in profile.items():
+            if name in self.column:
+                vector[self.column[name]] = value
+        return vector
+
+    def profile_matrix(self, profiles):
+        """Stack dict profiles into an N x C array; pass an array in criteria order to skip this."""
+        return np.array([self.profile_vector(profile) for profile in profiles]).reshape(len(profiles), len(self.criteria))
+
+    def score(self, profiles):
+        """Suitability of every program for every profile, as an N x P array."""
+        profiles = np.asarray(profiles, dtype=self.weights.dtype)
+        return profiles @ self.weights.T
+
+    def rank_cohort(self, profiles, k=10):
+        """Top-k program rows and their scores per profile, best first (two N x k arrays).
+
+        profiles is an N x C array in criteria order, or a list of dict profiles.
+        """
+        if not isinstance(profiles, np.ndarray):
+            profiles = self.profile_matrix(profiles)
+        profiles = np.atleast_2d(np.asarray(profiles, dtype=self.weights.dtype))
+        k = min(k, len(self.labels))
+        distinct_scores = profiles @ self.distinct.T
+        order = np.argsort(-distinct_scores, axis=1, kind="stable")
+        # Students who order the distinct rows the same way share one top-k list
+        orderings, which = np.unique(order, axis=0, return_inverse=True)
+        table = np.array([np.concatenate([self.members[index] for index in ordering])[:k] for ordering in orderings],
+                         dtype=np.intp).reshape(len(orderings), k)
+        best = table[which.reshape(-1)]
+        return best, np.take_along_axis(distinct_scores, self.distinct_of[best], axis=1)
+
+    def rank(self, profile, k=10):
+        """The k best programs for one profile as (score, institution, college, major, degree)."""
+        best, scores = self.rank_cohort(self.profile_vector(profile)[None, :], k)
+        return [(float(score),) + self.labels[row] for row, score in zip(best[0], scores[0])]
+
+def build_matrix(paths=MAJORS_FILES, snapshot_path=CATALOGUE_SNAPSHOT_PATH, matrix_path=MATRIX_PATH):
+    """Precompute the suitability matrix from the standardized majors files and save it."""
+    matrix = SuitabilityMatrix.from_programs(load_catalogue(paths, snapshot_path))
+    matrix.save(matrix_path)
+    print(f"Saved {matrix.weights.shape[0]} x {matrix.weights.shape[1]} suitability matrix "
+          f"({', '.join(matrix.criteria)}) to {matrix_path}")
+    return matrix
+
+if __name__ == "__main__":
+    build_matrix()
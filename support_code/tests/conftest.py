@@ -0,0 +1,17 @@
+import ntpath
+import pytest
+import quizgenerator
+
+# quizgenerator globals that name files under DATA_PATH
+GENERATOR_PATHS = ["CATALOGUE_SNAPSHOT_PATH", "OUTPUT_PATH", "CHECKPOINT_PATH", "WORK_QUEUE_PATH",
+                   "WORK_QUEUE_ROUNDS_PATH", "INVALID_PATH", "VALID_PATH", "INVALID_JSONL_PATH", "VALID_JSONL_PATH",
+                   "CACHE_PATH", "METRICS_PROM_PATH", "METRICS_JSON_PATH"]
+
+@pytest.fixture
+def generator_dir(tmp_path, monkeypatch):
+    """Point every quizgenerator output path at a fresh directory."""
+    for name in GENERATOR_PATHS:
+        # DATA_PATH is a Windows path; ntpath splits both separators
+        monkeypatch.setattr(quizgenerator, name, str(tmp_path / ntpath.basename(getattr(quizgenerator, name))))
+    monkeypatch.setattr(quizgenerator, "QUESTION_BANK_DIR", str(tmp_path / "bank"))
+    return tmp_path
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import pytest
+import quizgenerator
+from mocknim import MockNimConfig, start_mock_server
+from workqueue import record_cell
+
+PROGRAMS = [{"institution": "NUS", "major": "Law"}, {"institution": "SMU", "major": "Economics"}]
+REQUIRED = 3
+CONFIG = MockNimConfig(llm_latency={"distribution": "uniform", "low": 0.0, "high": 0.01},
+                       reward_latency={"distribution": "fixed", "seconds": 0.0},
+                       error_rates={429: 0.1, 500: 0.05}, retry_after=0.01, invalid_rate=0.2, seed=7)
+
+@pytest.fixture
+def endpoint(generator_dir, monkeypatch):
+    """quizgenerator pointed at a local mock NIM server, with fast retries and no response cache."""
+    server = start_mock_server(CONFIG)
+    # Globals that a run replaces, restored after the test
+    for name in ("nim", "client", "async_client", "run_metrics", "work_queue", "near_duplicates", "prescorer",
+                 "response_cache"):
+        monkeypatch.setattr(quizgenerator, name, getattr(quizgenerator, name))
+    settings = {"REQUIRED_QUESTIONS_PER_CRITERION": REQUIRED, "CACHE_MODE": "off", "RATE_LIMIT_PER_MINUTE": 600000,
+                "BACKOFF_BASE_SECONDS": 0.01, "BACKOFF_MAX_SECONDS": 0.05, "CIRCUIT_FAILURE_THRESHOLD": 1000}
+    for name, value in settings.items():
+        monkeypatch.setattr(quizgenerator, name, value)
+    monkeypatch.setattr(quizgenerator, "load_majors", lambda: PROGRAMS)
+    quizgenerator.configure_client(server.base_url, "mock")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def cells(records):
+    return [record_cell(r) for r in records]
+
+def expected_cells():
+    return [(p["institution"], p["major"], c) for p in PROGRAMS for c in quizgenerator.CRITERIA for _ in range(REQUIRED)]
+
+def test_async_run_fills_every_cell_against_the_mock_endpoint(endpoint):
+    data = asyncio.run(quizgenerator.generate_quiz_questions_async(max_concurrency=4))
+    # Same cell-ordered layout as the serial loop, each cell filled exactly once
+    assert cells(data) == expected_cells()
+    # Near-duplicates are filtered per cell
+    assert len({(record_cell(r), r["question"]) for r in data}) == len(data)
+    assert all(r["question"].endswith("?") for r in data)
+    with open(quizgenerator.OUTPUT_PATH, 'r') as f:
+        assert json.load(f) == data
+
+    metrics = quizgenerator.run_metrics.summary(quizgenerator.nim.metrics)
+    assert sum(metrics["accepted"].values()) == len(data)
+    assert metrics["client"]["requests"] == endpoint.requests
+    llm = metrics["models"][quizgenerator.LLM_MODEL]
+    assert llm["latency"]["count"] >= llm["end_to_end_latency"]["count"] > 0
+
+def test_async_run_resumes_without_redoing_finished_cells(endpoint):
+    first = asyncio.run(quizgenerator.generate_quiz_questions_async(max_concurrency=4))
+    requests = endpoint.requests
+    assert asyncio.run(quizgenerator.generate_quiz_questions_async(max_concurrency=4)) == first
+    assert endpoint.requests == requests
+
+def test_serial_and_async_runs_share_the_layout(endpoint):
+    serial = quizgenerator.generate_quiz_questions()
+    assert cells(serial) == expected_cells()
@@ -0,0 +1,87 @@
+import json
+import os
+import pytest
+import catalogue
+from catalogue import CatalogueError, institution_from_filename, load_catalogue, load_programs, parse_programs
+
+STANDARDIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "public", "school-data",
+                                "Standardized-weights")
+
+def program(major, weight=1):
+    return {"college": "School", "major": major, "degree": "Bachelor",
+            "criteria": {"eligibility": [{"qualificationType": None, "description": "H2 Mathematics"}],
+                         "suitability": [{"criterion": "Interests", "description": f"Likes {major}", "weight": weight}]}}
+
+def write_majors(path, programs):
+    path.write_text(json.dumps({"programs": programs}), encoding='utf-8')
+    return str(path)
+
+@pytest.mark.parametrize("entry, message", [
+    ({"major": "Law"}, "'criteria' must be dict"),
+    (program("Law", weight=True), "suitability[0] 'weight' must be"),
+    (dict(program("Law"), degree=None), "'degree' must be str"),
+    ({**program("Law"), "criteria": {"eligibility": [{"qualificationType": 3, "description": "x"}],
+                                     "suitability": []}}, "eligibility[0] 'qualificationType' must be str or null")
+])
+def test_invalid_programs_are_reported_with_their_location(entry, message):
+    with pytest.raises(CatalogueError) as error:
+        parse_programs({"programs": [program("Music"), entry]}, "NUS", "nus.json")
+    assert "nus.json programs[1]" in str(error.value)
+    assert message in str(error.value)
+
+def test_skip_invalid_keeps_the_valid_programs(capsys):
+    programs = parse_programs({"programs": [program("Music"), {"major": "Law"}, program("Physics")]}, "NUS",
+                              skip_invalid=True)
+    assert [p.major for p in programs] == ["Music", "Physics"]
+    assert "Skipping invalid program entry 1" in capsys.readouterr().out
+
+@pytest.mark.parametrize("data", [[], {"programs": {}}, {"majors": []}])
+def test_a_file_without_a_programs_array_always_raises(data):
+    with pytest.raises(CatalogueError):
+        parse_programs(data, "NUS", skip_invalid=True)
+
+def test_programs_round_trip_through_to_dict(tmp_path):
+    path = write_majors(tmp_path / "standardized_nus_majors.json", [program("Law", 0.5)])
+    [law] = load_programs(path)
+    assert law.institution == "NUS"
+    assert law.to_dict() == program("Law", 0.5)
+    assert law.criteria_descriptions() == {"Interests": "Likes Law"}
+
+def test_institution_from_filename():
+    assert institution_from_filename("data/standardized_smu_majors.json") == "SMU"
+    assert institution_from_filename("majors.json") == "Unknown"
+
+@pytest.fixture
+def sources(tmp_path):
+    return {"NUS": write_majors(tmp_path / "nus.json", [program("Law")]),
+            "NTU": write_majors(tmp_path / "ntu.json", [program("Music"), program("Physics")])}
+
+def test_snapshot_is_reused_until_a_source_changes(sources, tmp_path, monkeypatch):
+    snapshot = str(tmp_path / "catalogue.pickle")
+    programs = load_catalogue(sources, snapshot)
+    assert [(p.institution, p.major) for p in programs] == [("NUS", "Law"), ("NTU", "Music"), ("NTU", "Physics")]
+
+    load_programs = catalogue.load_programs
+    parsed = []
+    monkeypatch.setattr(catalogue, "load_programs", lambda path, institution: parsed.append(path) or
+                        load_programs(path, institution))
+    assert load_catalogue(sources, snapshot) == programs
+    assert parsed == []
+
+    write_majors(tmp_path / "ntu.json", [program("Music")])
+    assert [p.major for p in load_catalogue(sources, snapshot)] == ["Law", "Music"]
+    assert parsed == [sources["NUS"], sources["NTU"]]
+
+def test_unreadable_snapshot_is_rebuilt(sources, tmp_path):
+    snapshot = tmp_path / "catalogue.pickle"
+    snapshot.write_bytes(b"not a pickle")
+    assert len(load_catalogue(sources, str(snapshot))) == 3
+    assert len(load_catalogue(sources, str(snapshot))) == 3
+    assert not list(tmp_path.glob("*.tmp"))
+
+@pytest.mark.skipif(not os.path.isdir(STANDARDIZED_DIR), reason="standardized majors not shipped")
+def test_shipped_majors_files_are_valid():
+    paths = {name: os.path.join(STANDARDIZED_DIR, f"standardized_{name.lower()}_majors.json")
+             for name in ("NUS", "NTU", "SMU")}
+    programs = load_catalogue(paths)
+    assert {p.institution for p in programs} == set(paths)
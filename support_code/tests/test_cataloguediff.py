@@ -0,0 +1,119 @@
+import json
+import os
+import pytest
+from cataloguediff import diff_catalogues, read_catalogue, rollover, update_mappings
+from codestitleinstitutiondescriptionextractor import ADAPTERS, extract_school, module_key
+from modulesearch import SHARD_NAME, build_shard, read_shard, write_shard
+
+def detailed(code, title, text):
+    return {"Field": code, "Field2": title, "Text": text}
+
+OLD_YEAR = [
+    detailed("ACCT 101", "Financial Accounting", "Debits and credits."),
+    detailed("COMM 330", "Persuasion", "The business of influence."),
+    detailed("ECON 101", "Microeconomics", "Markets and prices."),
+    detailed("ECON 101", "Microeconomics", "Markets and prices.")
+]
+NEW_YEAR = [
+    detailed("QF 205", "Computing Technology for Finance", "Programming for finance."),
+    detailed("ACCT 101", "Financial Accounting", "Debits, credits and ledgers."),
+    detailed("ECON 101", "Microeconomics", "Markets and prices."),
+    detailed("ECON 101", "Microeconomics", "Markets and prices.")
+]
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+    return str(path)
+
+@pytest.fixture
+def school(tmp_path):
+    """A previous-year SMU module file, mappings and search shard, plus the new catalogue."""
+    extract_school("SMU", write_json(tmp_path / "old.json", OLD_YEAR), str(tmp_path))
+    modules_path = str(tmp_path / "Module_code_and_description_SMU.json")
+    mappings_path = write_json(tmp_path / "mappings.json", {"smu_prefix_to_major": {"ACCT": "Accountancy"}})
+    index_dir = str(tmp_path / "index")
+    os.makedirs(index_dir)
+    write_shard(os.path.join(index_dir, SHARD_NAME.format(school="SMU")),
+                *build_shard(module for _, module in read_catalogue(modules_path)))
+    catalogue_path = write_json(tmp_path / "new.json", NEW_YEAR)
+    return {"catalogue_path": catalogue_path, "modules_path": modules_path, "index_dir": index_dir,
+            "mappings_path": mappings_path, "dir": tmp_path}
+
+def run(school):
+    return rollover("SMU", school["catalogue_path"], school["modules_path"], school["index_dir"], school["mappings_path"])
+
+def snapshot(school):
+    files = {}
+    for root, _, names in os.walk(school["dir"]):
+        for name in names:
+            if name not in ("old.json", "new.json"):
+                with open(os.path.join(root, name), 'rb') as f:
+                    files[name] = f.read()
+    return files
+
+def records(catalogue):
+    modules = [ADAPTERS["SMU"](record) for record in catalogue]
+    return [(module_key(module), module) for module in modules]
+
+def test_diff_reports_added_removed_and_changed_codes():
+    diff = diff_catalogues(records(OLD_YEAR), records(NEW_YEAR))
+    assert diff.added == ["QF 205"]
+    assert diff.removed == ["COMM 330"]
+    assert diff.changed == ["ACCT 101"]
+    assert len(diff.new_records) == 2 and len(diff.gone_records) == 2
+
+def test_rollover_matches_a_fresh_extraction(school):
+    run(school)
+    fresh_dir = school["dir"] / "fresh"
+    os.makedirs(fresh_dir)
+    _, _, fresh_path = extract_school("SMU", school["catalogue_path"], str(fresh_dir))
+    with open(fresh_path, 'rb') as f, open(school["modules_path"], 'rb') as g:
+        assert f.read() == g.read()
+    with open(school["mappings_path"], 'r', encoding='utf-8') as f:
+        assert json.load(f)["smu_prefix_to_major"] == {"ACCT": "Accountancy", "QF": "Unknown"}
+
+def test_updated_shard_holds_the_new_catalogue(school):
+    run(school)
+    header, _ = read_shard(os.path.join(school["index_dir"], SHARD_NAME.format(school="SMU")))
+    live = sorted(key for key in header["keys"] if key is not None)
+    rebuilt, _ = build_shard(module for _, module in read_catalogue(school["catalogue_path"], ADAPTERS["SMU"]))
+    assert live == sorted(rebuilt["keys"])
+
+def test_second_rollover_is_a_no_op(school):
+    assert run(school)
+    after_first = snapshot(school)
+    diff = run(school)
+    assert not diff
+    assert (diff.added, diff.removed, diff.changed) == ([], [], [])
+    assert snapshot(school) == after_first
+
+# Hand-edited layout with a duplicated key, like the shipped mappings.json
+MAPPINGS_TEXT = """{
+    "nus_prefix_to_major": {
+        "NM": "Communications and New Media",
+        "NM": "Communications and New Media"
+    },
+    "smu_prefix_to_major": {
+        "ACCT": "Accountancy"
+    }
+}
+"""
+
+def test_update_mappings_only_adds_the_new_entries(tmp_path):
+    path = tmp_path / "mappings.json"
+    path.write_text(MAPPINGS_TEXT, encoding='utf-8')
+    new = update_mappings("SMU", [{"modulecode": "QF 205"}, {"modulecode": "ACCT 101"}], str(path),
+                          str(tmp_path / "tries.json"))
+    assert new == ["QF"]
+    assert path.read_text(encoding='utf-8') == MAPPINGS_TEXT.replace(
+        '"ACCT": "Accountancy"\n', '"ACCT": "Accountancy",\n        "QF": "Unknown"\n')
+
+def test_update_mappings_adds_a_missing_table(tmp_path):
+    path = tmp_path / "mappings.json"
+    path.write_text(MAPPINGS_TEXT, encoding='utf-8')
+    assert update_mappings("NTU", [{"modulecode": "SC1003"}], str(path), str(tmp_path / "tries.json")) == ["SC"]
+    text = path.read_text(encoding='utf-8')
+    assert text.startswith(MAPPINGS_TEXT[:MAPPINGS_TEXT.rindex("}")].rstrip())
+    assert text.count('"NM"') == 2
+    assert json.loads(text)["ntu_prefix_to_major"] == {"SC": "Unknown"}
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from catalogue import Eligibility, Program
+from eligibility import (ALEVEL, IB, POLYTECHNIC, ROUTES, EligibilityIndex, Route, alevel_points, parse_requirements,
+                         parse_route, parse_subject, parse_subject_groups, read_requirements, satisfies,
+                         write_requirements)
+
+def make_program(major, *entries, institution="NUS"):
+    return Program(institution, "College", major, "Bachelor",
+                   tuple(Eligibility(kind, text) for kind, text in entries), ())
+
+PROGRAMS = [
+    make_program("Physics", ("GCE A-Level", "ABB/B to AAA/A, H2 Mathematics and H2 Physics"),
+                 ("International Baccalaureate", "32-36 points, Mathematics HL"),
+                 ("Polytechnic GPA", "3.4/4.0 in any diploma")),
+    make_program("Chemistry", (None, "H2 Level pass in Physics/Chemistry; BBB/C"),
+                 (None, "Diploma in Chemistry with 3.0/4.0"), institution="NTU"),
+    make_program("History", ("GCE A-Level", "BBC/C, H2 History preferred"), ("Additional Assessments", "Interview")),
+    make_program("Drama", ("Additional Assessments", "Audition")),
+    make_program("Economics", ("GCE A-Level", "AAA/A, H2 Mathematics or Further Mathematics"),
+                 ("International Baccalaureate", "36-38 points, Mathematics or Economics HL"))
+]
+
+@pytest.mark.parametrize("grades, points", [("AAA/A", 70.0), ("aab/b ", 66.25), ("CCC/U", 45.0)])
+def test_alevel_points(grades, points):
+    assert alevel_points(grades) == points
+
+def test_alevel_points_rejects_other_text():
+    with pytest.raises(ValueError):
+        alevel_points("AAAA")
+
+@pytest.mark.parametrize("text, groups", [
+    ("H2 Mathematics and H2 Physics", ((("mathematics", "H2"),), (("physics", "H2"),))),
+    ("H2 Physics or Chemistry", ((("physics", "H2"), ("chemistry", "H2")),)),
+    ("Physics or Biology HL", ((("physics", "HL"), ("biology", "HL")),)),
+    ("H2 Level pass in Physics/Chemistry", ((("physics", "H2"), ("chemistry", "H2")),)),
+    ("H1/O-Level Chinese", ((("chinese", "O-Level"),),)),
+    ("Excellent grades in H2 Mathematics (or equivalent)", ((("mathematics", "H2"),),)),
+    ("H2 Chemistry preferred, no specific subjects", ())
+])
+def test_subject_groups(text, groups):
+    assert parse_subject_groups(text) == groups
+
+@pytest.mark.parametrize("route, text, expected", [
+    (ALEVEL, "ABB/B to AAA/A", (63.75, 70.0)),
+    (ALEVEL, "AAA/A to ABB/B", (63.75, 70.0)),
+    (IB, "minimum score of 30", (30.0, 30.0)),
+    (IB, "32-36 points", (32.0, 36.0)),
+    (POLYTECHNIC, "3.2/4.0", (3.2, 3.2)),
+    (POLYTECHNIC, "any diploma", (None, None))
+])
+def test_score_ranges(route, text, expected):
+    assert parse_route(route, text)[:2] == expected
+
+def test_routes_are_inferred_for_untyped_entries():
+    chemistry = parse_requirements(PROGRAMS[1])
+    assert set(chemistry.routes) == {ALEVEL, POLYTECHNIC}
+    assert chemistry.routes[ALEVEL] == Route(60.0, 60.0, ((("physics", "H2"), ("chemistry", "H2")),))
+    assert chemistry.routes[POLYTECHNIC].minimum == 3.0
+    drama = parse_requirements(PROGRAMS[3])
+    assert not drama.parsed
+
+def test_satisfies_compares_levels_within_a_family():
+    assert satisfies({("mathematics", "H2")}, ("mathematics", "H1"))
+    assert not satisfies({("mathematics", "H1")}, ("mathematics", "H2"))
+    assert satisfies({("economics", "HL")}, ("economics", None))
+    assert not satisfies({("economics", "SL")}, ("economics", "HL"))
+
+def scan(requirements, route, score, subjects):
+    """Programs the applicant meets, checked one requirement at a time."""
+    held = {parse_subject(subject) for subject in subjects}
+    eligible = []
+    for requirement in requirements:
+        spec = requirement.routes.get(route)
+        if spec is None or (spec.minimum is not None and score < spec.minimum):
+            continue
+        if all(any(satisfies(held, alternative) for alternative in group) for group in spec.subjects):
+            eligible.append(requirement.major)
+    return eligible
+
+SUBJECTS = {ALEVEL: ["H2 Mathematics", "H2 Physics", "H1 Physics", "H2 Chemistry", "H2 History",
+                     "H2 Further Mathematics"],
+            IB: ["Mathematics HL", "Mathematics SL", "Economics HL"],
+            POLYTECHNIC: []}
+SCORES = {ALEVEL: [45.0, 60.0, 63.75, 66.0, 70.0], IB: [30, 32, 36, 38], POLYTECHNIC: [2.9, 3.0, 3.4, 4.0]}
+
+def test_bitset_and_matrix_index_match_a_scan():
+    index = EligibilityIndex.from_programs(PROGRAMS)
+    assert [r.major for r in index.unparsed] == ["Drama"]
+    rng = np.random.default_rng(0)
+    for route in ROUTES:
+        applicants = []
+        for score in SCORES[route]:
+            for _ in range(6):
+                subjects = [s for s in SUBJECTS[route] if rng.random() < 0.5]
+                applicants.append((score, subjects))
+                expected = scan(index.requirements, route, score, subjects)
+                assert [r.major for r in index.eligible(route, score, subjects)] == expected
+        matrix = index.eligible_cohort(route, [score for score, _ in applicants], [s for _, s in applicants])
+        for row, (score, subjects) in enumerate(applicants):
+            majors = [index.requirements[column].major for column in np.flatnonzero(matrix[row])]
+            assert majors == scan(index.requirements, route, score, subjects)
+
+def test_alevel_grades_are_accepted_as_scores():
+    index = EligibilityIndex.from_programs(PROGRAMS)
+    majors = [r.major for r in index.eligible(ALEVEL, "AAA/A", ["H2 Mathematics", "H2 Physics"])]
+    assert majors == ["Physics", "Chemistry", "History", "Economics"]
+
+def test_requirements_round_trip_through_json(tmp_path):
+    path = str(tmp_path / "requirements.json")
+    assert write_requirements(PROGRAMS, path) == len(PROGRAMS)
+    assert read_requirements(path) == [parse_requirements(program) for program in PROGRAMS]
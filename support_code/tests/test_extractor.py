@@ -0,0 +1,49 @@
+import json
+import pytest
+from codestitleinstitutiondescriptionextractor import iter_json_array, module_key, write_modules
+
+ITEMS = [
+    {"modulecode": "CS 101", "title": "Intro, \"quoted\" [brackets]", "description": "a\nb ünïcode"},
+    {"modulecode": "ACCT 202", "title": "Accounting", "description": None},
+    12345.678,
+    -7,
+    True,
+    None,
+    "a plain string with , and ] inside",
+    [1, [2, [3.25]], {"nested": "}"}],
+    {}
+]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_iter_json_array_matches_json_load_across_chunk_boundaries(tmp_path, chunk_size, indent):
+    path = tmp_path / "items.json"
+    path.write_text(json.dumps(ITEMS, indent=indent, ensure_ascii=False), encoding='utf-8')
+    assert list(iter_json_array(str(path), chunk_size=chunk_size)) == ITEMS
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_iter_json_array_with_text_yields_source_text(tmp_path, chunk_size):
+    path = tmp_path / "items.json"
+    path.write_text(json.dumps(ITEMS, indent=4, ensure_ascii=False), encoding='utf-8')
+    for element, text in iter_json_array(str(path), chunk_size=chunk_size, with_text=True):
+        assert json.loads(text) == element
+
+def test_iter_json_array_handles_empty_array_and_bom(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text("\ufeff  [ \n ]", encoding='utf-8')
+    assert list(iter_json_array(str(path), chunk_size=2)) == []
+
+@pytest.mark.parametrize("text", ['{"a": 1}', '[1, 2', '[{"a": 1}, {"b": '])
+def test_iter_json_array_rejects_non_arrays_and_truncated_files(tmp_path, text):
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path), chunk_size=4))
+
+def test_write_modules_round_trips_one_module_per_line(tmp_path):
+    modules = [item for item in ITEMS if isinstance(item, dict) and "modulecode" in item]
+    path = tmp_path / "modules.json"
+    assert write_modules(str(path), modules) == len(modules)
+    assert json.loads(path.read_text(encoding='utf-8')) == modules
+    assert len(path.read_text(encoding='utf-8').splitlines()) == len(modules) + 2
+    assert [module_key(m) for m in iter_json_array(str(path))] == [module_key(m) for m in modules]
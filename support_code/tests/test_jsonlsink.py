@@ -0,0 +1,59 @@
+import json
+from jsonlsink import JsonlSink, ends_mid_line, export_json, read_jsonl, seed_jsonl_from_json, write_jsonl
+
+RECORDS = [{"question": "Why law?", "score": 0.5}, {"question": "Pourquoi l'économie ?", "score": 1.0}]
+
+def test_appends_survive_reopening(tmp_path):
+    path = str(tmp_path / "valid.jsonl")
+    with JsonlSink(path) as sink:
+        sink.append(RECORDS[0])
+    with JsonlSink(path) as sink:
+        sink.append(RECORDS[1])
+    assert list(read_jsonl(path)) == RECORDS
+    with open(path, 'r', encoding='utf-8') as f:
+        assert f.read().count("\n") == 2
+
+def test_records_are_flushed_every_fsync_every(tmp_path):
+    path = str(tmp_path / "valid.jsonl")
+    sink = JsonlSink(path, fsync_every=2)
+    sink.append(RECORDS[0])
+    assert sink.pending == 1
+    sink.append(RECORDS[1])
+    assert sink.pending == 0
+    assert list(read_jsonl(path)) == RECORDS
+    sink.close()
+
+def test_a_torn_final_line_is_skipped_and_appends_start_on_a_new_line(tmp_path):
+    path = tmp_path / "valid.jsonl"
+    path.write_text(json.dumps(RECORDS[0]) + "\n" + '{"question": "Torn', encoding='utf-8')
+    assert ends_mid_line(str(path))
+    assert list(read_jsonl(str(path))) == RECORDS[:1]
+    with JsonlSink(str(path)) as sink:
+        sink.append(RECORDS[1])
+    assert not ends_mid_line(str(path))
+    assert list(read_jsonl(str(path))) == RECORDS
+
+def test_missing_and_empty_files(tmp_path):
+    assert list(read_jsonl(str(tmp_path / "missing.jsonl"))) == []
+    (tmp_path / "empty.jsonl").write_text("", encoding='utf-8')
+    assert not ends_mid_line(str(tmp_path / "empty.jsonl"))
+
+def test_seed_and_export_round_trip(tmp_path):
+    legacy = tmp_path / "valid.json"
+    legacy.write_text(json.dumps(RECORDS), encoding='utf-8')
+    jsonl_path = str(tmp_path / "valid.jsonl")
+    assert seed_jsonl_from_json(str(legacy), jsonl_path) == 2
+    # Only an absent JSON Lines file is seeded
+    assert seed_jsonl_from_json(str(legacy), jsonl_path) == 0
+    with JsonlSink(jsonl_path) as sink:
+        sink.append({"question": "New?"})
+    assert export_json(jsonl_path, str(legacy)) == 3
+    with open(legacy, 'r', encoding='utf-8') as f:
+        assert json.load(f) == RECORDS + [{"question": "New?"}]
+
+def test_write_jsonl_replaces_the_file(tmp_path):
+    path = str(tmp_path / "queue.jsonl")
+    write_jsonl(path, RECORDS)
+    write_jsonl(path, RECORDS[1:])
+    assert list(read_jsonl(path)) == RECORDS[1:]
+    assert not (tmp_path / "queue.jsonl.tmp").exists()
@@ -0,0 +1,100 @@
+import itertools
+import json
+import os
+import numpy as np
+import pytest
+from moduleattributes import INSTITUTIONS, SOURCES, ModuleAttributes, module_level, scan_modules, split_credits
+from prefixclassifier import load_index
+from prefixindex import ModuleIndex
+
+RAW = {
+    "NUS": [
+        {"moduleCode": "CS1010", "title": "Programming Methodology", "semesters": [1, 2]},
+        {"moduleCode": "CS2040", "title": "Data Structures", "semesters": [2]},
+        {"moduleCode": "CS2040", "title": "Data Structures", "semesters": [2]},
+        {"moduleCode": "MA1521", "title": "Calculus", "semesters": [1, 3]},
+        {"moduleCode": "GEA1000", "title": "Quantitative Reasoning", "semesters": []}
+    ],
+    "NTU": [
+        {"scrollm20": "SC1003", "Title": "Introduction to Computational Thinking (3 AU)"},
+        {"scrollm20": "sc2001 ", "Title": "Algorithm Design (4 AU)"},
+        {"scrollm20": "AAA18C", "Title": "General Elective (2 AU)"},
+        {"scrollm20": "HE9091", "Title": "Principles of Economics"}
+    ],
+    "SMU": [
+        {"modulecode": "ECON 101", "title": "Microeconomics"},
+        {"modulecode": "ECON 201", "title": "Macroeconomics"},
+        {"modulecode": "ACCT 101", "title": "Financial Accounting"}
+    ]
+}
+TABLES = {
+    "nus_prefix_to_major": {"CS": "Computer Science", "MA": "Mathematics", "GEA": "Unknown"},
+    "ntu_prefix_to_major": {"SC": "Computer Science", "HE": "Economics"},
+    "smu_prefix_to_major": {"ECON": "Economics", "ACCT": "Accountancy"}
+}
+QUERY_VALUES = {
+    "institution": [None, "NUS", "NTU", "SMU"],
+    "level": [None, 0, 100, 1000, 2000, 9000],
+    "semester": [None, 1, 2, 3],
+    "credits": [None, 3, 4.0],
+    "major": [None, "Computer Science", "Economics", "Unknown"]
+}
+
+@pytest.fixture
+def catalogue(tmp_path):
+    sources = {}
+    for name, records in RAW.items():
+        sources[name] = str(tmp_path / f"{name}.json")
+        with open(sources[name], 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+    index = ModuleIndex.from_tables(TABLES)
+    return ModuleAttributes.from_sources(sources, index), index
+
+def selected_codes(attributes, query):
+    return sorted(attributes.codes[row] for row in attributes.select(**query))
+
+def test_select_matches_scan_for_every_attribute_combination(catalogue):
+    attributes, index = catalogue
+    names = list(QUERY_VALUES)
+    for values in itertools.product(*QUERY_VALUES.values()):
+        query = dict(zip(names, values))
+        assert selected_codes(attributes, query) == sorted(scan_modules(RAW, index, **query)), query
+
+def test_select_examples(catalogue):
+    attributes, _ = catalogue
+    assert selected_codes(attributes, {"institution": "NUS", "semester": 2}) == ["CS1010", "CS2040"]
+    assert selected_codes(attributes, {"major": "Economics"}) == ["ECON 101", "ECON 201", "HE9091"]
+    assert selected_codes(attributes, {"credits": 4}) == ["SC2001"]
+    assert selected_codes(attributes, {"level": 0}) == ["AAA18C"]
+
+def test_save_and_load_round_trip(catalogue, tmp_path):
+    attributes, _ = catalogue
+    path = str(tmp_path / "attributes.npz")
+    attributes.save(path)
+    loaded = ModuleAttributes.load(path)
+    assert loaded.codes == attributes.codes
+    for query in ({"institution": "NTU"}, {"level": 1000, "semester": 1}, {"major": "Computer Science"}):
+        assert np.array_equal(loaded.select(**query), attributes.select(**query))
+
+@pytest.mark.parametrize("code, level", [("ABM5001", 5000), ("ACCT 101", 100), ("CS1010E", 1000), ("AAA18C", 0),
+                                         ("GEA0001", 0), ("NOCODE", 0)])
+def test_module_level(code, level):
+    assert module_level(code) == level
+
+def test_split_credits():
+    assert split_credits("Algorithm Design (4 AU)") == ("Algorithm Design", 4.0)
+    assert split_credits("Project (1.5 au) ") == ("Project", 1.5)
+    assert split_credits("Principles of Economics") == ("Principles of Economics", None)
+
+@pytest.mark.skipif(not all(os.path.exists(SOURCES[name]) for name in INSTITUTIONS), reason="module sources not shipped")
+def test_select_matches_scan_on_shipped_sources():
+    index = load_index()
+    attributes = ModuleAttributes.from_sources(SOURCES, index)
+    raw = {}
+    for name in INSTITUTIONS:
+        with open(SOURCES[name], 'r', encoding='utf-8') as f:
+            raw[name] = json.load(f)
+    for query in ({"institution": "NUS", "level": 1000, "semester": 2, "major": "Computer Science"},
+                  {"institution": "NTU", "credits": 4}, {"level": 3000, "semester": 1},
+                  {"institution": "SMU", "major": "Economics", "level": 100}):
+        assert selected_codes(attributes, query) == sorted(scan_modules(raw, index, **query))
@@ -0,0 +1,93 @@
+import json
+import numpy as np
+import pytest
+from catalogue import Criterion, Program
+from modulerelevance import CsrMatrix, apply_tfidf, build_relevance, count_matrix, idf_weights, write_relevance
+from modulesearch import tokenize
+
+ROWS = [{0: 1.0, 3: 2.0}, {}, {2: 5.0}, {0: 1.5, 1: 1.0, 2: 1.0, 3: 1.0}, {1: 4.0}]
+
+def dense(rows, columns):
+    matrix = np.zeros((len(rows), columns), dtype=np.float32)
+    for row, values in enumerate(rows):
+        for column, value in values.items():
+            matrix[row, column] = value
+    return matrix
+
+def test_csr_matches_the_dense_matrix():
+    matrix = CsrMatrix.from_rows(ROWS, 4)
+    assert matrix.shape == (5, 4)
+    assert np.array_equal(matrix.to_dense(), dense(ROWS, 4))
+    assert np.array_equal(matrix.dense_rows(1, 4), dense(ROWS, 4)[1:4])
+
+@pytest.mark.parametrize("block_rows", [1, 2, 1024])
+def test_blocked_product_matches_the_dense_product(block_rows):
+    other = np.random.default_rng(0).random((4, 3)).astype(np.float32)
+    product = CsrMatrix.from_rows(ROWS, 4).dot_dense(other, block_rows=block_rows)
+    assert np.allclose(product, dense(ROWS, 4) @ other)
+
+def test_tfidf_rows_are_unit_length_sublinear_weights():
+    documents = [["data", "data", "systems"], ["systems", "law"], []]
+    vocabulary, idf = idf_weights(documents)
+    assert list(vocabulary) == ["data", "law", "systems"]
+    matrix = apply_tfidf(count_matrix(documents, vocabulary), idf).to_dense()
+    expected = np.array([[(1 + np.log(2)) * idf[0], 0, idf[2]], [0, idf[1], idf[2]], [0, 0, 0]])
+    norms = np.linalg.norm(expected, axis=1, keepdims=True)
+    assert np.allclose(matrix, expected / np.where(norms > 0, norms, 1))
+
+MODULES = [
+    {"institution": "NUS", "modulecode": "CS1010", "title": "Programming Methodology",
+     "description": "Problem solving with programs and algorithms."},
+    {"institution": "NUS", "modulecode": "LL4001", "title": "Contract Law", "description": "Contracts and courts."},
+    {"institution": "NTU", "modulecode": "SC1003", "title": "Computational Thinking",
+     "description": "Programs, algorithms and problem solving."},
+    {"institution": "NUS", "modulecode": "MU1001", "title": "Music Theory", "description": None}
+]
+
+def make_program(institution, major, description):
+    return Program(institution, "College", major, "Bachelor", (), (Criterion("Interests", description, 1.0),))
+
+PROGRAMS = [make_program("NUS", "Computer Science", "Enjoys programs and algorithms"),
+            make_program("NTU", "Computer Science", "Enjoys programs and algorithms"),
+            make_program("NUS", "Law", "Interested in courts and contracts")]
+
+def reference_similarity(modules, programs):
+    """Cosine similarity of dense TF-IDF vectors, built without the sparse code."""
+    module_tokens = [tokenize(f"{m['title']} {m['description'] or ''}") for m in modules]
+    major_tokens = [tokenize(" ".join([p.major] + [c.description for c in p.suitability])) for p in programs]
+    vocabulary, idf = idf_weights(module_tokens + major_tokens)
+
+    def vectors(documents):
+        matrix = np.zeros((len(documents), len(vocabulary)))
+        for row, tokens in enumerate(documents):
+            for token in set(tokens):
+                matrix[row, vocabulary[token]] = (1 + np.log(tokens.count(token))) * idf[vocabulary[token]]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms > 0, norms, 1)
+    return vectors(major_tokens) @ vectors(module_tokens).T
+
+def test_relevance_matches_dense_cosine_similarity():
+    best, scores = build_relevance(MODULES, PROGRAMS, top_k=4, same_institution=False)
+    similarity = reference_similarity(MODULES, PROGRAMS)
+    for row in range(len(PROGRAMS)):
+        assert scores[row] == pytest.approx(similarity[row, best[row]], abs=1e-5)
+        assert scores[row].tolist() == sorted(scores[row].tolist(), reverse=True)
+        assert sorted(best[row].tolist()) == [0, 1, 2, 3]
+    assert best[2][0] == 1
+
+def test_same_institution_masks_other_schools_modules():
+    best, scores = build_relevance(MODULES, PROGRAMS, top_k=2)
+    assert best[0][0] == 0 and 2 not in best[0].tolist()
+    assert best[1][0] == 2
+    assert scores[1][1] == -1
+
+def test_written_relevance_leaves_out_unrelated_modules(tmp_path):
+    best, scores = build_relevance(MODULES, PROGRAMS, top_k=10)
+    path = str(tmp_path / "module_relevance.json")
+    write_relevance(path, MODULES, PROGRAMS, best, scores)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    assert data["top_k"] == len(MODULES)
+    assert [entry["major"] for entry in data["majors"]] == ["Computer Science", "Computer Science", "Law"]
+    assert [code for code, _ in data["majors"][1]["modules"]] == ["SC1003"]
+    assert all(score > 0 for entry in data["majors"] for _, score in entry["modules"])
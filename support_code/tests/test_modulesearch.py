@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from modulesearch import (ModuleSearch, Shard, build_shard, decode_varints, encode_varint_array, encode_varints,
+                          read_shard, update_shard, varint_lengths, write_shard)
+from codestitleinstitutiondescriptionextractor import module_key
+
+EDGES = [0, 1, 127, 128, 255, 16383, 16384, 2 ** 21 - 1, 2 ** 21, 2 ** 35, 2 ** 53 + 1, 2 ** 62 + 12345, 2 ** 63 - 1]
+
+def python_varints(values):
+    out = bytearray()
+    encode_varints(values, out)
+    return bytes(out)
+
+@pytest.mark.parametrize("values", [[], [0], EDGES, list(range(300)),
+                                    np.random.default_rng(1).integers(0, 2 ** 40, 1000).tolist()])
+def test_varint_round_trip(values):
+    encoded = python_varints(values)
+    assert encode_varint_array(values) == encoded
+    assert decode_varints(encoded).tolist() == values
+    assert varint_lengths(np.asarray(values, dtype=np.int64)).sum() == len(encoded)
+
+def test_varint_lengths_at_byte_boundaries():
+    values = np.array([0, 127, 128, 16383, 16384, 2 ** 63 - 1], dtype=np.int64)
+    assert varint_lengths(values).tolist() == [1, 1, 2, 2, 3, 9]
+
+MODULES = [
+    {"modulecode": "CS1010", "title": "Programming Methodology", "description": "Problem solving with programs."},
+    {"modulecode": "CS2040", "title": "Data Structures and Algorithms", "description": "Lists, trees and graphs."},
+    {"modulecode": "MA1521", "title": "Calculus for Computing", "description": None},
+    {"modulecode": "EC1101", "title": "Introduction to Economics", "description": "Markets and programs of policy."}
+]
+
+def shard_results(header, blob, query):
+    """{modulecode: score} of a query, so ties may come back in any order."""
+    return {code: score for score, _, code, _ in ModuleSearch({"NUS": Shard("NUS", header, blob)}).search(query, 10)}
+
+def test_shard_round_trips_through_the_file_format(tmp_path):
+    header, blob = build_shard(MODULES)
+    path = tmp_path / "NUS.bm25"
+    write_shard(str(path), header, blob)
+    assert read_shard(str(path)) == (header, blob)
+
+def test_updated_shard_scores_like_a_rebuilt_one():
+    changed = dict(MODULES[1], description="Lists, trees, graphs and hashing.")
+    added = {"modulecode": "CS3230", "title": "Design and Analysis of Algorithms", "description": "Proofs."}
+    removed = [MODULES[1], MODULES[3]]
+    header, blob = update_shard(*build_shard(MODULES), [(module_key(m), m) for m in removed], [changed, added])
+    rebuilt = build_shard([MODULES[0], MODULES[2], changed, added])
+    for query in ("algorithms", "programs", "trees hashing", "calculus computing"):
+        expected = shard_results(*rebuilt, query)
+        assert expected
+        assert shard_results(header, blob, query) == pytest.approx(expected)
+    assert shard_results(header, blob, "economics") == {}
@@ -0,0 +1,76 @@
+import pytest
+import quizgenerator
+from neardedupe import MinHasher, NearDuplicateFilter, estimated_jaccard, shingles
+from runmetrics import RunMetrics
+
+CELL = ("NUS", "Law", "Skills")
+QUESTION = "How would you explain a difficult idea to someone who has never heard of it before?"
+REWORDED = "How would you explain a difficult idea to someone who has never heard of it?"
+UNRELATED = "Which part of designing useful things do you think will matter most to your future?"
+
+def jaccard(a, b):
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b)
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingles("Why LAW, and why now?") == {"why law", "law and", "and why", "why now"}
+    assert shingles("Why?") == {"why"}
+    assert shingles("?!") == set()
+
+def test_signatures_are_stable_across_instances():
+    assert MinHasher().signature(QUESTION) == MinHasher().signature(QUESTION)
+    assert MinHasher(seed=2).signature(QUESTION) != MinHasher().signature(QUESTION)
+
+def test_estimated_similarity_tracks_jaccard():
+    hasher = MinHasher(num_perm=256)
+    for a, b in [(QUESTION, REWORDED), (QUESTION, UNRELATED)]:
+        assert estimated_jaccard(hasher.signature(a), hasher.signature(b)) == pytest.approx(jaccard(a, b), abs=0.1)
+
+@pytest.mark.parametrize("threshold, duplicate", [(0.5, True), (0.99, False)])
+def test_threshold_decides_near_duplicates(threshold, duplicate):
+    assert 0.5 < jaccard(QUESTION, REWORDED) < 0.99
+    dedupe = NearDuplicateFilter(threshold=threshold)
+    dedupe.add(CELL, QUESTION)
+    assert dedupe.is_duplicate(CELL, REWORDED) is duplicate
+    assert dedupe.is_duplicate(CELL, QUESTION.upper())
+    assert not dedupe.is_duplicate(CELL, UNRELATED)
+
+def test_cells_are_independent():
+    dedupe = NearDuplicateFilter()
+    dedupe.add(CELL, QUESTION)
+    assert not dedupe.is_duplicate(("NTU", "Law", "Skills"), QUESTION)
+
+def test_checking_does_not_index_the_candidate():
+    dedupe = NearDuplicateFilter()
+    assert not dedupe.is_duplicate(CELL, QUESTION)
+    assert not dedupe.is_duplicate(CELL, QUESTION)
+    dedupe.add(CELL, QUESTION)
+    assert dedupe.is_duplicate(CELL, QUESTION)
+    assert (dedupe.checked[CELL], dedupe.rejected[CELL]) == (3, 1)
+
+def test_bands_must_divide_the_signature():
+    with pytest.raises(ValueError):
+        NearDuplicateFilter(num_perm=64, bands=10)
+
+def test_a_candidate_that_fails_scoring_does_not_block_a_later_one(generator_dir, monkeypatch):
+    monkeypatch.setattr(quizgenerator, "run_metrics", RunMetrics())
+    monkeypatch.setattr(quizgenerator, "near_duplicates", NearDuplicateFilter())
+    monkeypatch.setattr(quizgenerator, "prescorer", None)
+    monkeypatch.setattr(quizgenerator, "work_queue", None)
+    monkeypatch.setattr(quizgenerator, "generate_candidates", lambda prompt, count, cache_slot=None: [QUESTION])
+    scores = iter([quizgenerator.RewardScoreError("no score"), 0.9])
+
+    def call_nim_reward_model(prompt, answer):
+        score = next(scores)
+        if isinstance(score, Exception):
+            raise score
+        return score
+    monkeypatch.setattr(quizgenerator, "call_nim_reward_model", call_nim_reward_model)
+    program = {"institution": "NUS", "major": "Law"}
+    assert quizgenerator.generate_questions(program, "Skills") == []
+    [record] = quizgenerator.generate_questions(program, "Skills")
+    assert record["question"] == QUESTION
+    # Now that it is accepted, the same question is a duplicate
+    assert quizgenerator.generate_questions(program, "Skills") == []
+    assert quizgenerator.run_metrics.rejections == {"unscored": 1, "near_duplicate": 1}
+    quizgenerator.export_question_logs()
@@ -0,0 +1,195 @@
+import asyncio
+from types import SimpleNamespace
+import openai
+import pytest
+import nimclient
+from nimclient import AIMDLimiter, CircuitBreaker, NimRequestError, ResilientClient, TokenBucket
+from runmetrics import RunMetrics
+
+class Clock:
+    """Stands in for time.monotonic and time.sleep, so waits cost no real time."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(nimclient.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(nimclient.time, "sleep", clock.sleep)
+    return clock
+
+def fake_client(create):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+def test_latency_observer_times_only_the_http_call(clock):
+    outcomes = iter([StatusError(503), None, None])
+
+    def create(**request):
+        clock.sleep(0.25)
+        error = next(outcomes)
+        if error is not None:
+            raise error
+        return "completion"
+
+    nim = ResilientClient(fake_client(create), None, rate_per_second=0.5, burst=1, base_delay=4.0, max_delay=4.0,
+                          breaker=CircuitBreaker(failure_threshold=10))
+    observed = []
+    nim.latency_observer = lambda model, seconds, outcome: observed.append((model, seconds, outcome))
+    started = clock.now
+    assert nim.create(model="llm") == "completion"
+    assert nim.create(model="llm") == "completion"
+    assert observed == [("llm", 0.25, "error"), ("llm", 0.25, "ok"), ("llm", 0.25, "ok")]
+    # The calls themselves also waited for backoff and token-bucket slots
+    assert clock.now - started > 3 * 0.25 + nim.metrics['backoff_seconds']
+
+def test_request_and_end_to_end_latency_are_exported_separately():
+    metrics = RunMetrics()
+    metrics.observe_request("llm", 0.3)
+    metrics.observe_request("llm", 0.2, outcome="error")
+    metrics.observe_call("llm", 4.5, {"prompt_tokens": 10, "completion_tokens": 5})
+    summary = metrics.summary()["models"]["llm"]
+    assert summary["latency"]["count"] == 2
+    assert summary["end_to_end_latency"]["count"] == 1
+    assert summary["end_to_end_latency"]["sum_seconds"] == 4.5
+    text = metrics.prometheus_text()
+    assert 'quiz_nim_request_duration_seconds_count{model="llm"} 2' in text
+    assert 'quiz_nim_call_duration_seconds_count{model="llm"} 1' in text
+    assert 'quiz_nim_call_duration_seconds_sum{model="llm"} 4.5' in text
+
+def test_token_bucket_waits_grow_with_the_deficit(clock):
+    bucket = TokenBucket(rate_per_second=2.0, capacity=2)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.sleep(1.5)
+    # 1.5s refilled three tokens, paying back the two borrowed ones
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+
+def test_token_bucket_never_stores_more_than_its_capacity(clock):
+    bucket = TokenBucket(rate_per_second=1.0, capacity=1)
+    clock.sleep(60)
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 1.0]
+
+def test_circuit_breaker_cycle_with_a_failed_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+    assert not breaker.record_failure()
+    assert breaker.state == "closed" and breaker.wait_time() == 0.0
+    assert breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.wait_time() == 10.0
+
+    clock.sleep(10)
+    assert breaker.state == "half-open"
+    assert breaker.wait_time() == 0.0
+    # Only one probe at a time
+    assert breaker.wait_time() == 1.0
+    assert breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.wait_time() == 10.0
+
+    clock.sleep(10)
+    assert breaker.wait_time() == 0.0
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+    assert not breaker.record_failure()
+
+def test_aimd_increases_additively_and_halves_once_per_cooldown(clock):
+    limiter = AIMDLimiter(4, maximum=8, latency_target=1.0, cooldown=5.0)
+    limiter.on_success(0.5)
+    assert limiter.limit == 4.25
+    limiter.on_success(2.0)
+    assert limiter.limit == 2.125
+    limiter.on_congestion()
+    assert limiter.limit == 2.125
+    clock.sleep(5)
+    limiter.on_congestion()
+    assert limiter.limit == 1.0625
+    clock.sleep(5)
+    limiter.on_congestion()
+    assert limiter.limit == 1
+    for _ in range(100):
+        limiter.on_success(0.1)
+    assert limiter.limit == 8
+    limiter.set_maximum(3)
+    assert limiter.limit == 3
+
+def failing_client(errors, clock=None):
+    """Client raising the given errors in turn, then answering; requests are recorded."""
+    errors = iter(errors)
+    requests = []
+
+    def create(**request):
+        requests.append(request)
+        error = next(errors, None)
+        if error is not None:
+            raise error
+        return "completion"
+    return fake_client(create), requests
+
+def test_throttles_are_retried_honouring_retry_after(clock):
+    client, requests = failing_client([StatusError(429, {"retry-after": "7"}), StatusError(500)])
+    nim = ResilientClient(client, None, rate_per_second=1000, base_delay=0.5, max_delay=30.0)
+    started = clock.now
+    assert nim.create(model="llm") == "completion"
+    assert len(requests) == 3
+    assert (nim.metrics['throttled'], nim.metrics['server_errors'], nim.metrics['retries']) == (1, 1, 2)
+    # The first backoff is at least the 7s the endpoint asked for, the second at most 1s
+    assert 7.0 <= clock.now - started <= 8.0 + 0.01
+
+def test_retry_after_is_capped_by_max_delay(clock):
+    nim = ResilientClient(None, None, base_delay=0.1, max_delay=2.0)
+    assert nim.backoff_delay(0, StatusError(429, {"retry-after": "600"})) == 2.0
+    assert nim.backoff_delay(0, StatusError(429, {"retry-after": "soon"})) <= 0.1
+
+def test_client_errors_are_raised_without_retrying(clock):
+    client, requests = failing_client([StatusError(400)])
+    nim = ResilientClient(client, None, breaker=CircuitBreaker(failure_threshold=1))
+    with pytest.raises(StatusError):
+        nim.create(model="llm")
+    assert len(requests) == 1
+    assert nim.metrics['retries'] == 0
+    assert nim.breaker.state == "closed"
+
+def test_connection_errors_are_retried_until_the_attempts_run_out(clock):
+    error = openai.APIConnectionError(request=None)
+    client, requests = failing_client([error] * 10)
+    nim = ResilientClient(client, None, max_retries=2, breaker=CircuitBreaker(failure_threshold=100))
+    with pytest.raises(NimRequestError):
+        nim.create(model="llm")
+    assert len(requests) == 3
+    assert nim.metrics['connection_errors'] == 3
+
+def test_async_requests_retry_and_release_their_concurrency_slot():
+    async def scenario():
+        errors = iter([StatusError(503)])
+
+        async def create(**request):
+            await asyncio.sleep(0)
+            error = next(errors, None)
+            if error is not None:
+                raise error
+            return "completion"
+
+        limiter = AIMDLimiter(2, latency_target=60.0, cooldown=0.0)
+        nim = ResilientClient(None, fake_client(create), rate_per_second=1000, base_delay=0.001, max_delay=0.001,
+                              limiter=limiter)
+        results = await asyncio.gather(*(nim.acreate(model="llm") for _ in range(3)))
+        return results, nim, limiter
+    results, nim, limiter = asyncio.run(scenario())
+    assert results == ["completion"] * 3
+    assert nim.metrics['retries'] == 1 and nim.metrics['requests'] == 4
+    assert limiter.in_flight == 0
+    # The 503 counted as congestion
+    assert limiter.last_decrease > 0
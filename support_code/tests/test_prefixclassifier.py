@@ -0,0 +1,107 @@
+import json
+import numpy as np
+import pytest
+from prefixclassifier import (OVERLAY_VERSION, PrefixClassifier, apply_overlay, classify_groups, load_index,
+                              prefix_groups, write_overlay)
+from prefixindex import ModuleIndex
+
+PROGRAMMING = "programming algorithms software compilers"
+CALCULUS = "calculus integrals derivatives matrices"
+LAW = "contract torts courts litigation"
+
+def module(institution, code, text):
+    return {"institution": institution, "modulecode": code, "title": text}
+
+MODULES = [
+    module("NUS", "CS1010", PROGRAMMING),
+    module("NUS", "CS2040", f"{PROGRAMMING} graphs"),
+    module("NUS", "IT1244", f"{PROGRAMMING} databases"),
+    module("NUS", "MA1521", CALCULUS),
+    module("NUS", "GEA1000", f"{CALCULUS} statistics"),
+    module("NUS", "DSA1101", f"{PROGRAMMING} pipelines"),
+    module("NUS", "DSA2102", f"{PROGRAMMING} debugging"),
+    module("NTU", "LW1001", LAW),
+    # Programming text at an institution whose only major is Law
+    module("NTU", "XY1001", PROGRAMMING),
+    # SMU has no mapped majors at all
+    module("SMU", "COR 1001", PROGRAMMING)
+]
+TABLES = {
+    "nus_prefix_to_major": {"CS": "Computer Science", "IT": "Computer Science", "MA": "Mathematics",
+                            "GEA": "Unknown"},
+    "ntu_prefix_to_major": {"LW": "Law"},
+    "smu_prefix_to_major": {}
+}
+
+@pytest.fixture
+def classifier():
+    return PrefixClassifier(MODULES, prefix_groups(MODULES, ModuleIndex.from_tables(TABLES)))
+
+def test_prefix_groups():
+    groups = prefix_groups(MODULES, ModuleIndex.from_tables(TABLES))
+    assert groups == [(("NUS", "CS"), "Computer Science"), (("NUS", "CS"), "Computer Science"),
+                      (("NUS", "IT"), "Computer Science"), (("NUS", "MA"), "Mathematics"), (("NUS", "GEA"), None),
+                      (("NUS", "DSA"), None), (("NUS", "DSA"), None), (("NTU", "LW"), "Law"),
+                      (("NTU", "XY"), None), (("SMU", "COR"), None)]
+
+def test_classify_groups_votes_and_mean_similarity():
+    similarity = np.array([[0.9, 0.1], [0.2, 0.4], [0.8, 0.3], [0.1, 0.7]])
+    chosen, confidence, mean = classify_groups(similarity, np.array([0, 0, 0, 1]), 2)
+    assert chosen.tolist() == [0, 1]
+    assert np.allclose(confidence, [2 / 3, 1.0])
+    assert np.allclose(mean, [1.9 / 3, 0.7])
+
+def test_suggestions_for_unmapped_and_unknown_prefixes(classifier):
+    suggestions = classifier.suggest()
+    assert set(suggestions["NUS"]) == {"DSA", "GEA"}
+    assert suggestions["NUS"]["DSA"]["major"] == "Computer Science"
+    assert suggestions["NUS"]["DSA"]["confidence"] == 1.0
+    assert suggestions["NUS"]["DSA"]["modules"] == 2
+    assert suggestions["NUS"]["GEA"]["major"] == "Mathematics"
+
+def test_majors_of_other_institutions_are_never_suggested(classifier):
+    similarity = classifier.similarity(classifier.labels)
+    xy = classifier.modules.index(MODULES[8])
+    nus_cs = classifier.classes.index(("NUS", "Computer Science"))
+    assert similarity[xy, nus_cs] == -1
+    # The only candidate at NTU is Law, however poorly the text matches it
+    assert classifier.suggest()["NTU"] == {"XY": {"major": "Law", "confidence": 1.0, "similarity": 0.0, "modules": 1}}
+
+def test_institution_without_mapped_majors_gets_no_suggestions(classifier):
+    assert classifier.institutions_with_classes == {"NUS", "NTU"}
+    assert "SMU" not in classifier.suggest()
+
+def test_held_out_accuracy(classifier):
+    counts = classifier.held_out_accuracy(folds=4)
+    # CS and IT can stand in for each other; MA and LW are the only prefixes of their major
+    assert counts["held_out_prefixes"] == 4
+    assert counts["held_out_modules"] == 5
+    assert counts["answerable_prefixes"] == counts["correct_prefixes"] == 2
+    assert counts["answerable_modules"] == counts["correct_modules"] == 3
+
+def test_overlay_only_fills_unmapped_or_unknown_prefixes(tmp_path):
+    suggestions = {"NUS": {"DSA": {"major": "Computer Science", "confidence": 1.0, "similarity": 0.5, "modules": 2},
+                           "GEA": {"major": "Mathematics", "confidence": 0.7, "similarity": 0.3, "modules": 1},
+                           "CS": {"major": "Mathematics", "confidence": 1.0, "similarity": 0.1, "modules": 2},
+                           "ST": {"major": "Mathematics", "confidence": 0.5, "similarity": 0.2, "modules": 1}}}
+    path = str(tmp_path / "overlay.json")
+    write_overlay(path, suggestions, min_confidence=0.6)
+    with open(path, 'r', encoding='utf-8') as f:
+        overlay = json.load(f)
+    assert list(overlay["nus_prefix_to_major"]) == ["CS", "DSA", "GEA", "ST"]
+    merged = apply_overlay(TABLES, overlay)
+    assert merged["nus_prefix_to_major"] == dict(TABLES["nus_prefix_to_major"], DSA="Computer Science",
+                                                 GEA="Mathematics")
+    assert TABLES["nus_prefix_to_major"]["GEA"] == "Unknown"
+    assert apply_overlay(TABLES, overlay, min_confidence=0.4)["nus_prefix_to_major"]["ST"] == "Mathematics"
+
+    mappings_path = tmp_path / "mappings.json"
+    mappings_path.write_text(json.dumps(TABLES), encoding='utf-8')
+    index = load_index(str(mappings_path), path)
+    assert index.tries["NUS"].longest_match("DSA1101") == ("DSA", "Computer Science")
+    assert load_index(str(mappings_path), str(tmp_path / "missing.json")).tries["NUS"].longest_match("DSA1101") \
+        == (None, None)
+
+def test_overlay_version_is_checked():
+    with pytest.raises(ValueError):
+        apply_overlay(TABLES, {"version": OVERLAY_VERSION + 1, "min_confidence": 0.6})
@@ -0,0 +1,46 @@
+import json
+import pytest
+from prefixindex import MAPPINGS_PATH, ModuleIndex, PrefixTrie, scan_prefixes
+
+MAPPING = {"UT": "University Town", "UTOA": "Ridge View", "CS": "Computer Science", "C": "Chemistry",
+           "acct": "Accountancy"}
+
+@pytest.fixture
+def trie():
+    return PrefixTrie.from_mapping(MAPPING)
+
+@pytest.mark.parametrize("code, expected", [
+    ("UTOA1001", ("UTOA", "Ridge View")),
+    ("UTO1001", ("UT", "University Town")),
+    ("UT2101", ("UT", "University Town")),
+    ("CS1010", ("CS", "Computer Science")),
+    ("CM1102", ("C", "Chemistry")),
+    (" acct 101 ", ("ACCT", "Accountancy")),
+    ("MA1521", (None, None)),
+    ("", (None, None))
+])
+def test_longest_match_prefers_the_longest_mapped_prefix(trie, code, expected):
+    assert trie.longest_match(code) == expected
+    assert trie.resolve(code) == expected[1]
+
+def test_lookup_is_exact(trie):
+    assert trie.lookup("UTOA") == "Ridge View"
+    assert trie.lookup("UTO") is None
+    assert trie.lookup("UTOAX") is None
+    assert len(trie) == len(MAPPING)
+
+def test_serialize_round_trip(trie):
+    restored = PrefixTrie.deserialize(json.loads(json.dumps(trie.serialize())))
+    for code in ("UTOA1001", "UTO1001", "CS1010", "CM1102", "ACCT101", "MA1521"):
+        assert restored.longest_match(code) == trie.longest_match(code)
+
+def test_trie_agrees_with_prefix_scan_on_shipped_mappings():
+    with open(MAPPINGS_PATH, 'r', encoding='utf-8') as f:
+        mappings = json.load(f)
+    index = ModuleIndex.from_tables(mappings)
+    for institution, trie in index.tries.items():
+        table = mappings[f"{institution.lower()}_prefix_to_major"]
+        prefix_to_major = {prefix.strip().upper(): major for prefix, major in table.items()}
+        for prefix in prefix_to_major:
+            for code in (prefix, prefix + "1001", prefix[:-1] + "9"):
+                assert trie.resolve(code) == scan_prefixes(prefix_to_major, code)
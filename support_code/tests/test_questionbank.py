@@ -0,0 +1,55 @@
+import json
+import pytest
+import quizgenerator
+from jsonlsink import read_jsonl, write_jsonl
+from questionbank import bank_files, seed_from_question_bank
+
+def record(school, major, criterion, question):
+    return {"major": major, "school": school, "question": question, "criterion": criterion}
+
+LAW = [record("NUS", "Law", "Skills", f"Law skills {i}?") for i in range(3)] + [
+    record("NUS", "Law", "Interests", "Why law?")]
+MUSIC = [record("NTU", "Music", "Skills", "Which instrument?")]
+
+def write_bank(bank_dir, files, manifest=True):
+    bank_dir.mkdir(exist_ok=True)
+    for name, records in files.items():
+        (bank_dir / name).write_text(json.dumps(records), encoding='utf-8')
+    if manifest:
+        # splittingfiles.py records absolute paths from the machine that split the bank
+        entries = [{"name": name, "path": rf"C:\Users\someone\{name}"} for name in files]
+        (bank_dir / "manifest.json").write_text(json.dumps({"files": entries}), encoding='utf-8')
+
+def test_manifest_names_are_resolved_in_the_bank_directory(tmp_path):
+    write_bank(tmp_path, {"NUS_Law.json": LAW, "NTU_Music.json": MUSIC})
+    (tmp_path / "unlisted.json").write_text("[]", encoding='utf-8')
+    assert bank_files(str(tmp_path)) == [str(tmp_path / "NUS_Law.json"), str(tmp_path / "NTU_Music.json")]
+    (tmp_path / "manifest.json").unlink()
+    assert len(bank_files(str(tmp_path))) == 3
+
+def test_bank_is_merged_into_an_existing_journal_once(tmp_path):
+    bank = tmp_path / "bank"
+    # The same question listed in two files is only merged once
+    write_bank(bank, {"NUS_Law.json": LAW, "NTU_Music.json": MUSIC + LAW[:1]})
+    journal = str(tmp_path / "queue.jsonl")
+    generated = [dict(LAW[0], reward_score=0.9), record("SMU", "Law", "Skills", "Generated?")]
+    write_jsonl(journal, generated)
+    assert seed_from_question_bank(str(bank), journal) == 4
+    assert list(read_jsonl(journal)) == generated + LAW[1:] + MUSIC
+    assert seed_from_question_bank(str(bank), journal) == 0
+    assert seed_from_question_bank(str(tmp_path / "missing"), journal) == 0
+
+def test_deficit_schedule_counts_bank_and_generated_questions(generator_dir, monkeypatch):
+    programs = [{"institution": "NUS", "major": "Law"}, {"institution": "NTU", "major": "Music"}]
+    monkeypatch.setattr(quizgenerator, "SCHEDULE_MODE", "deficit")
+    monkeypatch.setattr(quizgenerator, "CRITERIA", ["Interests", "Skills"])
+    monkeypatch.setattr(quizgenerator, "REQUIRED_QUESTIONS_PER_CRITERION", 4)
+    write_bank(generator_dir / "bank", {"NUS_Law.json": LAW, "NTU_Music.json": MUSIC})
+    # A journal left by an earlier run that did not use the bank
+    write_jsonl(quizgenerator.WORK_QUEUE_PATH, [record("NUS", "Law", "Skills", "Generated?")])
+
+    queue = quizgenerator.load_work_queue()
+    pending = quizgenerator.schedule_cells(queue, programs)
+    queue.close()
+    assert [(p["major"], criterion, missing) for p, criterion, missing in pending] == [
+        ("Music", "Interests", 4), ("Law", "Interests", 3), ("Music", "Skills", 3)]
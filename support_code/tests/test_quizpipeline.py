@@ -0,0 +1,104 @@
+import asyncio
+from collections import Counter
+import pytest
+import quizgenerator
+from neardedupe import NearDuplicateFilter
+from quizpipeline import DemandTracker, Pipeline, Stage
+from runmetrics import RunMetrics
+from workqueue import WorkQueue, cell_key
+
+def run(coroutine):
+    # A pipeline that stops accounting for its items hangs instead of failing
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+def test_tracker_reserves_in_cell_order_up_to_the_batch_size():
+    tracker = DemandTracker({"a": 3, "b": 1}, batch_size=2)
+    assert tracker.reserve() == ("a", 2)
+    assert tracker.reserve() == ("a", 1)
+    assert tracker.reserve() == ("b", 1)
+    assert tracker.reserve() is None
+
+def test_tracker_release_and_accept():
+    async def scenario():
+        tracker = DemandTracker({"a": 2}, batch_size=2)
+        assert await tracker.next_request() == ("a", 2)
+        await tracker.release("a")
+        await tracker.accept("a")
+        # One question is still needed and nothing is in flight
+        assert await tracker.next_request() == ("a", 1)
+        await tracker.accept("a")
+        assert await tracker.next_request() is None
+    run(scenario())
+
+def test_waiting_request_wakes_when_a_candidate_is_dropped():
+    async def scenario():
+        tracker = DemandTracker({"a": 1})
+        assert await tracker.next_request() == ("a", 1)
+        waiting = asyncio.create_task(tracker.next_request())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        await tracker.release("a")
+        return await waiting
+    assert run(scenario()) == ("a", 1)
+
+def source_of(counter):
+    async def source(cell, count):
+        items = []
+        for _ in range(count):
+            counter[cell] += 1
+            items.append({"cell": cell, "n": counter[cell]})
+        await asyncio.sleep(0)
+        return items
+    return source
+
+def test_pipeline_fills_every_cell_despite_dropped_candidates():
+    generated = Counter()
+    accepted = []
+
+    async def score(item):
+        await asyncio.sleep(0)
+        return item
+
+    stages = [
+        Stage("drop odd", lambda item: item if item["n"] % 2 == 0 else None),
+        Stage("score", score, workers=4),
+        Stage("sink", lambda item: accepted.append(item) or item)
+    ]
+    pipeline = Pipeline(source_of(generated), stages, DemandTracker({"a": 5, "b": 3}, batch_size=2),
+                        source_workers=3, queue_size=2)
+    run(pipeline.run())
+    assert Counter(item["cell"] for item in accepted) == {"a": 5, "b": 3}
+    assert stages[-1].passed == 8
+    # Every generated candidate was either accepted or dropped, none left behind
+    assert sum(generated.values()) == stages[0].processed
+    assert pipeline.source.passed == stages[0].processed
+
+def test_a_failing_stage_stops_the_pipeline():
+    async def broken(item):
+        raise RuntimeError("reward endpoint down")
+
+    pipeline = Pipeline(source_of(Counter()), [Stage("score", broken, workers=2)], DemandTracker({"a": 3}))
+    with pytest.raises(RuntimeError):
+        run(pipeline.run())
+
+def test_pipeline_with_nothing_to_do_returns():
+    pipeline = Pipeline(source_of(Counter()), [Stage("sink", lambda item: item)], DemandTracker({}))
+    run(pipeline.run())
+    assert pipeline.source.processed == 0
+
+def test_sink_drops_a_near_duplicate_accepted_since_the_dedupe_stage(generator_dir, monkeypatch):
+    monkeypatch.setattr(quizgenerator, "run_metrics", RunMetrics())
+    monkeypatch.setattr(quizgenerator, "near_duplicates", NearDuplicateFilter(threshold=0.8))
+    queue = WorkQueue(quizgenerator.WORK_QUEUE_PATH)
+    program = {"institution": "NUS", "major": "Law"}
+    item = {"cell": cell_key("NUS", "Law", "Skills"), "program": program, "criterion": "Skills",
+            "question": "How would you explain a hard idea to a younger student?", "score": 1.0}
+    # Both copies passed the dedupe stage while neither had been accepted yet
+    assert quizgenerator.dedupe_stage(dict(item)) and quizgenerator.dedupe_stage(dict(item))
+    save = quizgenerator.sink_stage(queue)
+    assert save(dict(item)) is not None
+    assert save(dict(item)) is None
+    assert queue.completed(item["cell"]) == 1
+    assert quizgenerator.run_metrics.rejections["near_duplicate"] == 1
+    queue.close()
+    quizgenerator.export_question_logs()
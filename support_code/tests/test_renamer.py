@@ -0,0 +1,70 @@
+import json
+import pytest
+from renamer import RULES_PATH, compile_rules, rename_catalogue, renamed_number
+
+RULES = {
+    "code_field": "Field",
+    "title_field": "Field2",
+    "rules": [
+        {"prepend": "ACCT ", "course_names": ["Financial Accounting", "Taxation"]},
+        {"prepend": "XPAC ", "course_pairs": [{"catalogue_number": "900", "course_name": "PAC Elective"}]},
+        {"prepend": "ELEC ", "course_names": ["PAC Elective"]}
+    ]
+}
+COURSES = [
+    {"Field": "101", "Field2": "Financial Accounting", "Text": "Débits and crédits."},
+    {"Field": "ACCT 202", "Field2": "Taxation", "Text": "Already renamed."},
+    {"Field": "900", "Field2": "PAC Elective", "Text": "Exact pair wins."},
+    {"Field": "901", "Field2": "PAC Elective", "Text": "Title rule."},
+    {"Field": "330", "Field2": "Persuasion", "Text": "No rule."}
+]
+
+@pytest.fixture
+def catalogue(tmp_path):
+    path = tmp_path / "catalogue.json"
+    path.write_text(json.dumps(COURSES, indent=4), encoding='utf-8')
+    return str(path)
+
+def test_rename_applies_pairs_before_titles(catalogue):
+    summary = rename_catalogue(catalogue, RULES)
+    with open(catalogue, 'r', encoding='utf-8') as f:
+        numbers = [course["Field"] for course in json.load(f)]
+    assert numbers == ["ACCT 101", "ACCT 202", "XPAC 900", "ELEC 901", "330"]
+    assert [(old, new) for old, new, _ in summary["changes"]] == [("101", "ACCT 101"), ("900", "XPAC 900"),
+                                                                   ("901", "ELEC 901")]
+    assert summary["items"] == len(COURSES)
+
+def test_rename_is_idempotent(catalogue):
+    rename_catalogue(catalogue, RULES)
+    with open(catalogue, 'rb') as f:
+        once = f.read()
+    summary = rename_catalogue(catalogue, RULES)
+    with open(catalogue, 'rb') as f:
+        assert f.read() == once
+    assert summary["changes"] == []
+
+def test_renamed_catalogue_keeps_json_dump_layout(catalogue):
+    rename_catalogue(catalogue, RULES)
+    with open(catalogue, 'r', encoding='utf-8') as f:
+        text = f.read()
+    assert text == json.dumps(json.loads(text), indent=4)
+
+def test_dry_run_leaves_the_catalogue_alone(catalogue):
+    with open(catalogue, 'rb') as f:
+        before = f.read()
+    summary = rename_catalogue(catalogue, RULES, dry_run=True)
+    with open(catalogue, 'rb') as f:
+        assert f.read() == before
+    assert len(summary["changes"]) == 3
+
+def test_conflicting_rules_are_rejected():
+    with pytest.raises(ValueError):
+        compile_rules([{"prepend": "A ", "course_names": ["X"]}, {"prepend": "B ", "course_names": ["X"]}])
+
+def test_shipped_rules_compile():
+    with open(RULES_PATH, 'r', encoding='utf-8') as f:
+        for catalogue_rules in json.load(f).values():
+            by_pair, by_title, renamed = compile_rules(catalogue_rules["rules"])
+            for number, title in by_pair:
+                new_number = renamed_number(number, title, by_pair, by_title, renamed)
+                assert renamed_number(new_number, title, by_pair, by_title, renamed) is None
@@ -0,0 +1,104 @@
+import itertools
+import json
+import pytest
+import quizgenerator
+import responsecache
+from responsecache import CacheMiss, ResponseCache, cache_key
+from runmetrics import RunMetrics
+
+REQUEST = {"model": "llm", "messages": [{"role": "user", "content": "Ask me something"}], "temperature": 0.7}
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    # Distinct, increasing access times so the LRU order does not depend on the clock resolution
+    ticks = itertools.count(1)
+    monkeypatch.setattr(responsecache.time, "time", lambda: float(next(ticks)))
+
+def response(text):
+    return {"content": text, "usage": {"prompt_tokens": 1, "completion_tokens": 1}}
+
+def size(text):
+    return len(json.dumps(response(text)).encode('utf-8'))
+
+def test_cache_key_covers_the_request_and_the_slot():
+    reordered = dict(reversed(list(REQUEST.items())))
+    assert cache_key(REQUEST, "cell#0") == cache_key(reordered, "cell#0")
+    assert cache_key(REQUEST, "cell#0") != cache_key(REQUEST, "cell#1")
+    assert cache_key(REQUEST) != cache_key(dict(REQUEST, temperature=0.0))
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    # The fourth response goes over budget, and eviction stops once three fit in 90% of it
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=int(3.5 * size("a")))
+    for key in "abc":
+        cache.put(key, response(key))
+    assert cache.get("a") == response("a")
+    cache.put("d", response("d"))
+    assert cache.evictions == 1
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in "acd"] == [True, True, True]
+    assert cache.total_bytes == 3 * size("a")
+    cache.close()
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(path)
+    cache.put("a", response("a"))
+    cache.put("a", response("a"))
+    cache.close()
+    reopened = ResponseCache(path)
+    assert reopened.total_bytes == size("a")
+    assert reopened.get("a") == response("a")
+    reopened.close()
+
+def test_replay_serves_hits_and_raises_on_misses(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    writer = ResponseCache(path)
+    writer.put("a", response("a"))
+    writer.close()
+    replay = ResponseCache(path, mode="replay")
+    assert replay.get("a") == response("a")
+    with pytest.raises(CacheMiss):
+        replay.get("b")
+    replay.put("b", response("b"))
+    assert (replay.hits, replay.misses) == (1, 1)
+    with pytest.raises(CacheMiss):
+        replay.get("b")
+    replay.close()
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ResponseCache(str(tmp_path / "cache.sqlite"), mode="off")
+
+@pytest.fixture
+def generator(generator_dir, monkeypatch):
+    """quizgenerator with a fresh response cache and a fake endpoint counting its calls."""
+    for name in ("response_cache", "llm_usage"):
+        monkeypatch.setattr(quizgenerator, name, type(getattr(quizgenerator, name))())
+    monkeypatch.setattr(quizgenerator, "run_metrics", RunMetrics())
+    calls = []
+
+    def timed_create(request):
+        calls.append(request["model"])
+        return response(f"Question {len(calls)}?")
+    monkeypatch.setattr(quizgenerator, "timed_create", timed_create)
+    yield calls
+    if quizgenerator.response_cache is not None:
+        quizgenerator.response_cache.close()
+
+def switch_mode(monkeypatch, mode):
+    if quizgenerator.response_cache is not None:
+        quizgenerator.response_cache.close()
+    monkeypatch.setattr(quizgenerator, "response_cache", None)
+    monkeypatch.setattr(quizgenerator, "CACHE_MODE", mode)
+
+def test_replay_run_repeats_the_recorded_responses(generator, monkeypatch):
+    recorded = [quizgenerator.call_nim_llm("Ask", cache_slot=f"cell#{i}") for i in range(2)]
+    # Without a slot a sampled request is never cached
+    quizgenerator.call_nim_llm("Ask")
+    assert len(generator) == 3
+
+    switch_mode(monkeypatch, "replay")
+    assert [quizgenerator.call_nim_llm("Ask", cache_slot=f"cell#{i}") for i in range(2)] == recorded
+    assert len(generator) == 3
+    with pytest.raises(CacheMiss):
+        quizgenerator.call_nim_llm("Ask", cache_slot="cell#2")
@@ -0,0 +1,98 @@
+import json
+import os
+from types import SimpleNamespace
+import pytest
+import quizgenerator
+import shardrun
+from jsonlsink import read_jsonl, write_jsonl
+from workqueue import record_cell
+
+NUM_SHARDS = 3
+PROGRAMS = [{"institution": school, "major": major} for school in ("NUS", "NTU") for major in ("Law", "Music", "Physics")]
+
+def record(program, criterion, question):
+    return {"major": program["major"], "school": program["institution"], "question": question,
+            "criterion": criterion, "reward_score": 1.0}
+
+def all_records():
+    return [record(p, c, f"{p['major']} {c} {i}?") for p in PROGRAMS for c in quizgenerator.CRITERIA for i in range(2)]
+
+@pytest.fixture
+def shards(generator_dir, monkeypatch):
+    monkeypatch.setattr(shardrun, "SHARD_ROOT", str(generator_dir / "shards"))
+    monkeypatch.setattr(quizgenerator, "load_majors", lambda: PROGRAMS)
+    return generator_dir
+
+def owner(r):
+    return shardrun.shard_for_cell(record_cell(r), NUM_SHARDS)
+
+def test_shard_assignment_is_stable_and_covers_every_shard():
+    cells = {record_cell(r) for r in all_records()}
+    assert {shardrun.shard_for_cell(cell, NUM_SHARDS) for cell in cells} == set(range(NUM_SHARDS))
+    assert shardrun.shard_for_cell(("NUS", "Law", "Skills"), 4) == shardrun.shard_for_cell(("NUS", "Law", "Skills"), 4)
+
+def test_shard_journal_is_seeded_from_its_own_cells_without_touching_the_main_journal(shards, monkeypatch):
+    write_jsonl(quizgenerator.WORK_QUEUE_PATH, all_records())
+    with open(quizgenerator.WORK_QUEUE_PATH, 'rb') as f:
+        main = f.read()
+
+    def fail():
+        raise AssertionError("shards must not seed the shared journal")
+    monkeypatch.setattr(quizgenerator, "seed_work_queue", fail)
+    for index in range(NUM_SHARDS):
+        os.makedirs(shardrun.shard_directory(index, NUM_SHARDS))
+        shardrun.seed_shard_journal(index, NUM_SHARDS)
+        seeded = list(read_jsonl(shardrun.shard_journal(index, NUM_SHARDS)))
+        assert seeded == [r for r in all_records() if owner(r) == index]
+    with open(quizgenerator.WORK_QUEUE_PATH, 'rb') as f:
+        assert f.read() == main
+
+def test_run_shards_seeds_shared_state_before_starting_processes(shards, monkeypatch):
+    events = []
+    monkeypatch.setattr(quizgenerator, "seed_work_queue", lambda: events.append("seed"))
+    monkeypatch.setattr(quizgenerator, "load_majors", lambda: events.append("catalogue"))
+
+    class Process:
+        def __init__(self, target, args):
+            self.index = args[0]
+            self.exitcode = 1 if self.index == 1 else 0
+
+        def start(self):
+            events.append(f"start {self.index}")
+
+        def join(self):
+            pass
+
+    context = SimpleNamespace(Process=Process)
+    monkeypatch.setattr(shardrun.multiprocessing, "get_context", lambda method: context)
+    assert shardrun.run_shards(NUM_SHARDS) == [1]
+    assert events == ["seed", "catalogue", "start 0", "start 1", "start 2"]
+
+def test_merge_takes_each_cell_only_from_its_owner(shards):
+    records = all_records()
+    for index in range(NUM_SHARDS):
+        path = shardrun.shard_journal(index, NUM_SHARDS)
+        os.makedirs(shardrun.shard_directory(index, NUM_SHARDS))
+        # Every shard journal also holds stale copies of other shards' cells
+        write_jsonl(path, [dict(r, question=r["question"] if owner(r) == index else "stale?") for r in records])
+        write_jsonl(shardrun.shard_journal(index, NUM_SHARDS, "WORK_QUEUE_ROUNDS_PATH"),
+                    [dict(r, round=0 if owner(r) == index else 99) for r in records[::2]])
+    merged = shardrun.merge_shards(NUM_SHARDS)
+    assert merged == records
+    assert [r["round"] for r in read_jsonl(quizgenerator.WORK_QUEUE_ROUNDS_PATH)] == [0] * len(records[::2])
+    assert list(read_jsonl(quizgenerator.WORK_QUEUE_PATH)) == records
+    with open(quizgenerator.OUTPUT_PATH, 'r') as f:
+        assert json.load(f) == records
+    assert shardrun.merge_shards(NUM_SHARDS) == records
+
+def test_merge_refuses_missing_shards(shards):
+    with pytest.raises(FileNotFoundError):
+        shardrun.merge_shards(NUM_SHARDS)
+
+def test_load_work_queue_leaves_seeding_to_the_parent(shards, monkeypatch):
+    write_jsonl(quizgenerator.WORK_QUEUE_PATH, all_records()[:2])
+    monkeypatch.setattr(quizgenerator, "SEED_WORK_QUEUE", False)
+    monkeypatch.setattr(quizgenerator, "seed_work_queue", lambda: pytest.fail("shard seeded the journal"))
+    queue = quizgenerator.load_work_queue()
+    assert len(queue) == 2
+    queue.close()
@@ -0,0 +1,102 @@
+import json
+import pytest
+import standardizer
+from catalogue import load_programs
+from eligibility import write_requirements
+
+RULES = {
+    "SMU": {"input": "smu.json", "output": "standardized_smu_majors.json", "transform": "additional_assessments",
+            "skip_without_criteria": True, "default_assessment": "Interview required",
+            "assessments": {"Law": "Interview and writing test required"}},
+    "NTU": {"input": "ntu.json", "output": "standardized_ntu_majors.json", "transform": "additional_assessments",
+            "default_assessment": "No interview", "assessments": {}}
+}
+
+def program(major, eligibility):
+    return {"college": "School", "major": major, "degree": "Bachelor",
+            "criteria": {"eligibility": [{"qualificationType": None, "description": eligibility}],
+                         "suitability": [{"criterion": "Interests", "description": f"Likes {major}", "weight": 1}]}}
+
+INPUTS = {
+    "smu.json": [program("Law", "H2 pass in General Paper"), program("Economics", "H2 Mathematics"),
+                 {"college": "School", "major": "Draft", "degree": "Bachelor"}],
+    "ntu.json": [program("Physics", "H2 Physics and H2 Mathematics"), program("Biology", "Diploma in any discipline")]
+}
+
+def write_inputs(directory, inputs):
+    for name, programs in inputs.items():
+        (directory / name).write_text(json.dumps({"programs": programs}), encoding='utf-8')
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    monkeypatch.setattr(standardizer, "load_rules", lambda: RULES)
+    parsed = []
+    requirements_entry = standardizer.requirements_entry
+
+    def counting_entry(p):
+        parsed.append(p.major)
+        return requirements_entry(p)
+    monkeypatch.setattr(standardizer, "requirements_entry", counting_entry)
+    write_inputs(tmp_path, INPUTS)
+
+    def standardize():
+        parsed.clear()
+        summaries = standardizer.standardize_all(["SMU", "NTU"], data_path=str(tmp_path),
+                                                 state_path=str(tmp_path / "state.json"),
+                                                 requirements_path=str(tmp_path / "requirements.json"))
+        return {s["institution"]: s for s in summaries}, list(parsed)
+    return standardize
+
+def read_bytes(directory, *names):
+    return {name: (directory / name).read_bytes() for name in names}
+
+OUTPUTS = ("standardized_smu_majors.json", "standardized_ntu_majors.json", "requirements.json")
+
+def full_rebuild(directory):
+    programs = []
+    for name in ("SMU", "NTU"):
+        programs.extend(load_programs(str(directory / RULES[name]["output"]), name))
+    path = str(directory / "full.json")
+    write_requirements(programs, path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def test_second_run_skips_unchanged_programs(run, tmp_path, monkeypatch):
+    summaries, parsed = run()
+    assert summaries["SMU"]["transformed"] == 2 and summaries["SMU"]["skipped"] == ["Draft"]
+    assert parsed == ["Law", "Economics", "Physics", "Biology"]
+    before = read_bytes(tmp_path, *OUTPUTS)
+
+    monkeypatch.setattr(standardizer, "save_requirement_entries", lambda *args: pytest.fail("requirements rewritten"))
+    summaries, parsed = run()
+    assert [s["transformed"] for s in summaries.values()] == [0, 0]
+    assert [s["written"] for s in summaries.values()] == [None, None]
+    assert parsed == []
+    assert read_bytes(tmp_path, *OUTPUTS) == before
+
+def test_changed_programs_are_rewritten_and_reparsed(run, tmp_path):
+    run()
+    changed = dict(INPUTS, **{"ntu.json": [INPUTS["ntu.json"][0], program("Biology", "H2 Biology")]})
+    write_inputs(tmp_path, changed)
+    summaries, parsed = run()
+    assert summaries["NTU"]["transformed"] == 1 and summaries["SMU"]["transformed"] == 0
+    assert summaries["SMU"]["written"] is None
+    assert parsed == ["Biology"]
+    with open(tmp_path / "requirements.json", 'r', encoding='utf-8') as f:
+        assert json.load(f) == full_rebuild(tmp_path)
+
+def test_removed_programs_leave_the_requirements(run, tmp_path):
+    run()
+    write_inputs(tmp_path, dict(INPUTS, **{"ntu.json": INPUTS["ntu.json"][:1]}))
+    summaries, parsed = run()
+    assert summaries["NTU"]["removed"] == 1 and parsed == []
+    with open(tmp_path / "requirements.json", 'r', encoding='utf-8') as f:
+        assert [entry["major"] for entry in json.load(f)] == ["Law", "Economics", "Physics"]
+
+def test_editing_one_rule_only_retransforms_that_major(run, monkeypatch):
+    run()
+    rules = dict(RULES, SMU=dict(RULES["SMU"], assessments={"Law": "Interview only"}))
+    monkeypatch.setattr(standardizer, "load_rules", lambda: rules)
+    summaries, parsed = run()
+    assert summaries["SMU"]["transformed"] == 1
+    assert parsed == ["Law"]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from catalogue import Criterion, Program
+from cohortbenchmark import loop_rank
+from suitability import SuitabilityMatrix, criteria_order
+
+CRITERIA = ["Interests", "Skills", "Experiences", "Values"]
+
+def make_program(major, weights, institution="NUS"):
+    suitability = tuple(Criterion(name, f"{major} {name}", weight) for name, weight in weights.items())
+    return Program(institution, "College", major, "Bachelor", (), suitability)
+
+def random_programs(rng, count):
+    programs = []
+    shared = dict(zip(CRITERIA, rng.random(len(CRITERIA))))
+    for index in range(count):
+        # Every third program shares one weight row, like the shipped files
+        names = rng.permutation(CRITERIA)[:rng.integers(2, len(CRITERIA) + 1)]
+        weights = shared if index % 3 == 0 else {name: float(rng.random()) for name in names}
+        programs.append(make_program(f"Major {index}", weights, ("NUS", "NTU", "SMU")[index % 3]))
+    return programs
+
+@pytest.fixture
+def programs():
+    return random_programs(np.random.default_rng(3), 40)
+
+def test_ranking_matches_the_scalar_scorer(programs):
+    matrix = SuitabilityMatrix.from_programs(programs)
+    rng = np.random.default_rng(4)
+    cohort = rng.random((25, len(matrix.criteria)))
+    best, scores = matrix.rank_cohort(cohort, k=12)
+    for row, vector in enumerate(cohort):
+        expected = loop_rank(programs, dict(zip(matrix.criteria, vector)), k=12)
+        assert best[row].tolist() == [index for _, index in expected]
+        assert scores[row] == pytest.approx([score for score, _ in expected])
+
+def test_equal_weight_programs_keep_catalogue_order(programs):
+    matrix = SuitabilityMatrix.from_programs(programs)
+    ranked = matrix.rank({"Interests": 1.0, "Skills": 0.5}, k=len(programs))
+    shared = [label for _, _, _, label, _ in ranked if int(label.split()[1]) % 3 == 0]
+    assert shared == [f"Major {index}" for index in range(0, len(programs), 3)]
+
+def test_dict_profiles_ignore_unknown_criteria(programs):
+    matrix = SuitabilityMatrix.from_programs(programs)
+    profile = {"Interests": 0.3, "Skills": 0.9, "Handwriting": 5.0}
+    best, scores = matrix.rank_cohort([profile], k=5)
+    vector = matrix.profile_vector(profile)
+    assert np.allclose(scores[0], np.sort(matrix.score(vector[None, :])[0])[::-1][:5])
+    assert [score for score, *_ in matrix.rank(profile, k=5)] == pytest.approx(scores[0])
+
+def test_weights_are_normalized_per_program():
+    programs = [make_program("Law", {"Interests": 2, "Skills": 2}), make_program("Music", {"Interests": 1.16})]
+    matrix = SuitabilityMatrix.from_programs(programs)
+    assert matrix.weights.sum(axis=1).tolist() == [1.0, 1.0]
+    raw = SuitabilityMatrix.from_programs(programs, normalize=False)
+    assert raw.weights.sum(axis=1).tolist() == [4.0, 1.16]
+
+def test_criteria_are_ordered_by_first_appearance():
+    programs = [make_program("Law", {"Skills": 1}), make_program("Music", {"Values": 1, "Skills": 1, "Interests": 1})]
+    assert criteria_order(programs) == ("Skills", "Values", "Interests")
+
+def test_save_and_load_round_trip(programs, tmp_path):
+    matrix = SuitabilityMatrix.from_programs(programs)
+    path = str(tmp_path / "suitability.npz")
+    matrix.save(path)
+    loaded = SuitabilityMatrix.load(path)
+    assert loaded.criteria == matrix.criteria and loaded.labels == matrix.labels
+    cohort = np.random.default_rng(5).random((10, len(matrix.criteria)))
+    assert all(np.array_equal(a, b) for a, b in zip(loaded.rank_cohort(cohort), matrix.rank_cohort(cohort)))
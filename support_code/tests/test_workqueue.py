@@ -0,0 +1,113 @@
+import json
+import pytest
+import quizgenerator
+from jsonlsink import read_jsonl
+from workqueue import WorkQueue, cell_key, ordered_records, seed_from_legacy_checkpoint
+
+CELL = cell_key("NUS", "Law", "Skills")
+PROGRAMS = [{"institution": "NUS", "major": "Law"}, {"institution": "NTU", "major": "Music"}]
+CRITERIA = ["Interests", "Skills"]
+
+def record(question, cell=CELL):
+    institution, major, criterion = cell
+    return {"major": major, "school": institution, "question": question, "criterion": criterion, "reward_score": 1.0}
+
+def test_round_numbers_carry_over_a_resume(tmp_path):
+    path, rounds_path = str(tmp_path / "queue.jsonl"), str(tmp_path / "queue.rounds.jsonl")
+    queue = WorkQueue(path, rounds_path=rounds_path)
+    # Rounds that accepted nothing still use up their index
+    assert [queue.start_round(CELL) for _ in range(3)] == [0, 1, 2]
+    queue.record(record("Why law?"))
+    queue.close()
+
+    resumed = WorkQueue(path, rounds_path=rounds_path)
+    assert resumed.start_round(CELL) == 3
+    assert resumed.start_round(cell_key("NTU", "Law", "Skills")) == 0
+    resumed.close()
+
+def test_rounds_start_at_the_completed_count_without_a_rounds_journal(tmp_path):
+    path = str(tmp_path / "queue.jsonl")
+    queue = WorkQueue(path)
+    for i in range(4):
+        queue.record(record(f"Question {i}?"))
+    queue.close()
+    resumed = WorkQueue(path, rounds_path=str(tmp_path / "queue.rounds.jsonl"))
+    assert resumed.start_round(CELL) == 4
+    resumed.close()
+
+def test_generation_slots_move_on_after_a_resume(generator_dir):
+    first = quizgenerator.load_work_queue()
+    slots = [quizgenerator.next_generation_slot("NUS", "Law", "Skills") for _ in range(2)]
+    first.close()
+    resumed = quizgenerator.load_work_queue()
+    assert quizgenerator.next_generation_slot("NUS", "Law", "Skills") not in slots
+    assert slots == ["NUS|Law|Skills#0", "NUS|Law|Skills#1"]
+    resumed.close()
+
+def test_schedule_only_hands_out_missing_questions(tmp_path):
+    path = str(tmp_path / "queue.jsonl")
+    queue = WorkQueue(path)
+    for i in range(3):
+        queue.record(record(f"Question {i}?"))
+    queue.record(record("Other?", cell_key("NTU", "Music", "Interests")))
+    queue.close()
+
+    resumed = WorkQueue(path)
+    assert len(resumed) == 4
+    pending = resumed.schedule(PROGRAMS, CRITERIA, 3)
+    assert [(p["institution"], p["major"], c, missing) for p, c, missing in pending] == [
+        ("NUS", "Law", "Interests", 3), ("NTU", "Music", "Interests", 2), ("NTU", "Music", "Skills", 3)]
+    assert resumed.schedule(PROGRAMS, CRITERIA, 3, include=lambda cell: cell[0] == "NUS") == [
+        (PROGRAMS[0], "Interests", 3)]
+    resumed.close()
+
+def test_data_is_grouped_by_cell_with_unknown_cells_last():
+    cells = {cell_key("NTU", "Music", "Skills"): [record("B?", cell_key("NTU", "Music", "Skills"))],
+             cell_key("SMU", "Law", "Skills"): [record("C?", cell_key("SMU", "Law", "Skills"))],
+             CELL: [record("A?")]}
+    assert [r["question"] for r in ordered_records(cells, PROGRAMS, CRITERIA)] == ["A?", "B?", "C?"]
+
+def test_legacy_checkpoint_seeds_the_journal_once(tmp_path):
+    checkpoint = tmp_path / "quiz_checkpoint.json"
+    checkpoint.write_text(json.dumps({"data": [record("A?"), record("B?")]}), encoding='utf-8')
+    journal = str(tmp_path / "quiz_checkpoint.jsonl")
+    assert seed_from_legacy_checkpoint(str(checkpoint), journal) == 2
+    assert seed_from_legacy_checkpoint(str(checkpoint), journal) == 0
+    assert WorkQueue(journal).completed(CELL) == 2
+
+@pytest.fixture
+def generator(generator_dir, monkeypatch):
+    """quizgenerator on two programs, with generate_questions returning one numbered question per call.
+
+    Set crash_at to the call number that should raise KeyboardInterrupt, like a killed run.
+    """
+    for name in ("run_metrics", "work_queue", "near_duplicates", "prescorer"):
+        monkeypatch.setattr(quizgenerator, name, getattr(quizgenerator, name))
+    monkeypatch.setattr(quizgenerator, "load_majors", lambda: PROGRAMS)
+    monkeypatch.setattr(quizgenerator, "CRITERIA", CRITERIA)
+    monkeypatch.setattr(quizgenerator, "REQUIRED_QUESTIONS_PER_CRITERION", 2)
+    state = {"calls": 0, "crash_at": None}
+
+    def generate_questions(program, criterion, count=1):
+        state["calls"] += 1
+        if state["calls"] == state["crash_at"]:
+            raise KeyboardInterrupt
+        return [quizgenerator.question_record(program["major"], program["institution"],
+                                              f"Question {state['calls']}?", criterion, 1.0)]
+    monkeypatch.setattr(quizgenerator, "generate_questions", generate_questions)
+    return state
+
+def test_resume_after_a_crash_only_generates_the_missing_questions(generator):
+    generator["crash_at"] = 5
+    with pytest.raises(KeyboardInterrupt):
+        quizgenerator.generate_quiz_questions()
+    quizgenerator.work_queue.close()
+    done = list(read_jsonl(quizgenerator.WORK_QUEUE_PATH))
+    assert len(done) == 4
+
+    data = quizgenerator.generate_quiz_questions()
+    assert len(data) == len(PROGRAMS) * len(CRITERIA) * 2
+    assert data[:4] == done
+    # The interrupted call plus the four questions still missing
+    assert generator["calls"] == 5 + 4
+    assert len({r["question"] for r in data}) == len(data)
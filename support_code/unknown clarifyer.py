@@ -14,6 +14,8 @@ unknown_prefixes = [
     "VCU", "WR", "XD", "XFE", "YCI", "YCT", "YHU", "YIL", "YIR", "YLE", "YLG", "YLL",
     "YLN", "YLS", "YSP", "ZB", "GEH", "GESS", "GES", "GEQ", "GET"
 ]
+# Set membership keeps the exact-prefix test O(1) per module
+unknown_prefix_set = set(unknown_prefixes)
 
 # Input file path
 input_file_path = r"codesandfacultyanddescription nus.json"
@@ -30,7 +32,7 @@ def get_prefix(module_code):
 # Filter modules with "Unknown" prefixes
 unknown_modules = [
     module for module in data
-    if get_prefix(module["moduleCode"]) in unknown_prefixes
+    if get_prefix(module["moduleCode"]) in unknown_prefix_set
 ]
 
 # Save to a new JSON file named 'unknown_module_codes.json' with UTF-8 encoding
@@ -0,0 +1,122 @@
+import json
+import os
+from collections import Counter, defaultdict
+from jsonlsink import JsonlSink, read_jsonl
+
+def cell_key(institution, major, criterion):
+    return (institution, major, criterion)
+
+def record_cell(record):
+    return cell_key(record['school'], record['major'], record['criterion'])
+
+class WorkQueue:
+    """Persistent quiz generation progress keyed by (institution, major, criterion).
+
+    Every accepted question is appended to a JSON Lines journal as soon as it is
+    recorded, so a checkpoint never rewrites earlier work. Reloading the journal gives
+    the completed count per cell, and schedule() only hands out the missing questions.
+    Generation rounds started per cell go to a second journal at rounds_path, so a
+    resumed run carries on numbering rounds where the last one stopped.
+    """
+
+    def __init__(self, path, fsync_every=50, rounds_path=None):
+        self.path = path
+        self.cells = defaultdict(list)
+        for record in read_jsonl(path):
+            self.cells[record_cell(record)].append(record)
+        self.sink = JsonlSink(path, fsync_every=fsync_every)
+        self.rounds = Counter()
+        self.rounds_sink = None
+        if rounds_path is not None:
+            for entry in read_jsonl(rounds_path):
+                cell = record_cell(entry)
+                self.rounds[cell] = max(self.rounds[cell], entry['round'] + 1)
+            self.rounds_sink = JsonlSink(rounds_path, fsync_every=fsync_every)
+
+    def __len__(self):
+        return sum(len(records) for records in self.cells.values())
+
+    def completed(self, cell):
+        return len(self.cells.get(cell, []))
+
+    def remaining(self, cell, required):
+        return max(0, required - self.completed(cell))
+
+    def record(self, record):
+        self.cells[record_cell(record)].append(record)
+        self.sink.append(record)
+
+    def start_round(self, cell):
+        """Index of the next generation round of a cell, never reused by a later run.
+
+        Journals from before rounds were recorded start counting at the completed count.
+        """
+        index = max(self.rounds[cell], self.completed(cell))
+        self.rounds[cell] = index + 1
+        if self.rounds_sink is not None:
+            self.rounds_sink.append(round_entry(cell, index))
+        return index
+
+    def schedule(self, programs, criteria, required, include=None):
+        """Return (program, criterion, missing) for every cell that still needs questions.
+
+        include, if given, is a predicate on the cell key that limits the schedule to
+        a subset of cells (e.g. one shard).
+        """
+        pending = []
+        for program in programs:
+            for criterion in criteria:
+                cell = cell_key(program['institution'], program['major'], criterion)
+                if include is not None and not include(cell):
+                    continue
+                missing = self.remaining(cell, required)
+                if missing:
+                    pending.append((program, criterion, missing))
+        return pending
+
+    def data(self, programs, criteria):
+        """All recorded questions, grouped by cell in program/criterion order."""
+        return ordered_records(self.cells, programs, criteria)
+
+    def flush(self):
+        self.sink.flush()
+        if self.rounds_sink is not None:
+            self.rounds_sink.flush()
+
+    def close(self):
+        self.sink.close()
+        if self.rounds_sink is not None:
+            self.rounds_sink.close()
+
+def round_entry(cell, index):
+    institution, major, criterion = cell
+    return {"school": institution, "major": major, "criterion": criterion, "round": index}
+
+def ordered_records(cells, programs, criteria):
+    """Flatten {cell: [records]} in program/criterion order, the layout of quiz_questions.json."""
+    ordered = []
+    seen = set()
+    for program in programs:
+        for criterion in criteria:
+            cell = cell_key(program['institution'], program['major'], criterion)
+            if cell in seen:
+                continue
+            seen.add(cell)
+            ordered.extend(cells.get(cell, []))
+    # Keep questions for cells that are no longer in the program list
+    for cell, records in cells.items():
+        if cell not in seen:
+            ordered.extend(records)
+    return ordered
+
+def seed_from_legacy_checkpoint(checkpoint_path, journal_path):
+    """Convert a {"data": [...]} snapshot checkpoint into a work queue journal."""
+    if os.path.exists(journal_path) or not os.path.exists(checkpoint_path):
+        return 0
+    with open(checkpoint_path, 'r') as f:
+        records = json.load(f).get('data', [])
+    with JsonlSink(journal_path, fsync_every=len(records) or 1) as sink:
+        for record in records:
+            sink.append(record)
+    print(f"Seeded work queue {journal_path} with {len(records)} samples from {checkpoint_path}")
+    return len(records)